@@ -0,0 +1,261 @@
+"""
+Agregados de uptime (SLA) por hora y por día para cada servidor
+Se actualizan en O(1) con cada verificación y se exportan como reporte CSV
+"""
+
+import csv
+import io
+import os
+import struct
+import sys
+import time
+
+from core.historial_servidores import BufferCircular, acotar
+
+
+MAGIA = b"MSTU"
+VERSION_ARCHIVO = 1
+
+# inicio, segundos arriba, segundos abajo, verificaciones, suma de latencias (ms), verificaciones con latencia,
+# latencia máxima, pico de jugadores
+TIPOS_AGREGADO = "IIIIIIHH"
+
+# Un hueco mayor entre verificaciones (p. ej. la aplicación cerrada) no cuenta como arriba ni abajo.
+# El motor pasa el hueco esperado de cada servidor según su planificador; este es el valor sin planificador.
+HUECO_MAXIMO = 400
+
+PERIODOS = ("hora", "dia")
+
+
+def inicio_dia(timestamp):
+    """Retorna (inicio, fin) del día local que contiene a `timestamp`."""
+    local = time.localtime(timestamp)
+    inicio = int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday, 0, 0, 0, 0, 0, -1)))
+    fin = int(time.mktime((local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1)))
+    return inicio, fin
+
+
+class Periodo:
+    """Agregado en construcción de una hora o un día."""
+
+    __slots__ = ("inicio", "fin", "arriba", "abajo", "muestras", "lat_suma", "lat_n", "lat_max", "pico")
+
+    def __init__(self, inicio, fin):
+        self.inicio = inicio
+        self.fin = fin
+        self.arriba = self.abajo = self.muestras = 0
+        self.lat_suma = self.lat_n = self.lat_max = self.pico = 0
+
+    def agregar(self, segundos, online, latencia, jugadores):
+        """Suma una verificación y el tiempo transcurrido desde la anterior."""
+        self.muestras += 1
+        if online:
+            self.arriba += segundos
+        else:
+            self.abajo += segundos
+        if latencia is not None:
+            self.lat_suma += int(round(latencia))
+            self.lat_n += 1
+            self.lat_max = max(self.lat_max, int(round(latencia)))
+        if jugadores is not None:
+            self.pico = max(self.pico, jugadores)
+
+    def fila(self):
+        """Retorna el agregado como fila de TIPOS_AGREGADO."""
+        return (self.inicio, int(self.arriba), int(self.abajo), self.muestras, self.lat_suma, self.lat_n,
+                acotar(self.lat_max), acotar(self.pico))
+
+    @classmethod
+    def desde_fila(cls, fila, fin):
+        periodo = cls(fila[0], fin)
+        (_, periodo.arriba, periodo.abajo, periodo.muestras, periodo.lat_suma, periodo.lat_n,
+         periodo.lat_max, periodo.pico) = fila
+        return periodo
+
+
+class AgregadosServidor:
+    """Agregados por hora (31 días) y por día (400 días) de un servidor."""
+
+    def __init__(self, capacidad_horas=744, capacidad_dias=400):
+        self.horas = BufferCircular(capacidad_horas, TIPOS_AGREGADO)
+        self.dias = BufferCircular(capacidad_dias, TIPOS_AGREGADO)
+        self.hora = None
+        self.dia = None
+        self.anterior = None
+
+    def agregar(self, timestamp, online, latencia, jugadores, hueco_maximo=HUECO_MAXIMO):
+        """Registra una verificación en O(1)."""
+        timestamp = int(timestamp)
+        segundos = 0
+        if self.anterior is not None and 0 < timestamp - self.anterior <= hueco_maximo:
+            segundos = timestamp - self.anterior
+        self.anterior = timestamp
+
+        if self.hora is not None and not self.hora.inicio <= timestamp < self.hora.fin:
+            self.horas.agregar(self.hora.fila())
+            self.hora = None
+        if self.hora is None:
+            inicio = timestamp - timestamp % 3600
+            self.hora = Periodo(inicio, inicio + 3600)
+
+        if self.dia is not None and not self.dia.inicio <= timestamp < self.dia.fin:
+            self.dias.agregar(self.dia.fila())
+            self.dia = None
+        if self.dia is None:
+            self.dia = Periodo(*inicio_dia(timestamp))
+
+        self.hora.agregar(segundos, online, latencia, jugadores)
+        self.dia.agregar(segundos, online, latencia, jugadores)
+
+    def filas(self, periodo):
+        """Retorna las filas cerradas más la del período en curso."""
+        buffer, actual = (self.horas, self.hora) if periodo == "hora" else (self.dias, self.dia)
+        filas = list(buffer)
+        if actual is not None:
+            filas.append(actual.fila())
+        return filas
+
+    def serializar(self):
+        """Retorna los agregados (incluidos los períodos en curso) como bytes."""
+        en_curso = []
+        for actual in (self.hora, self.dia):
+            if actual is None:
+                en_curso.append(struct.pack('<B', 0))
+            else:
+                en_curso.append(struct.pack('<BI', 1, actual.fin) + struct.pack('<' + TIPOS_AGREGADO, *actual.fila()))
+        return (self.horas.serializar() + self.dias.serializar() + b"".join(en_curso)
+                + struct.pack('<I', self.anterior or 0))
+
+    def deserializar(self, datos, posicion):
+        """Carga los agregados desde bytes. Retorna la nueva posición."""
+        posicion = self.horas.deserializar(datos, posicion)
+        posicion = self.dias.deserializar(datos, posicion)
+        formato = '<' + TIPOS_AGREGADO
+        en_curso = []
+        for _ in range(2):
+            (presente,) = struct.unpack_from('<B', datos, posicion)
+            posicion += 1
+            if not presente:
+                en_curso.append(None)
+                continue
+            (fin,) = struct.unpack_from('<I', datos, posicion)
+            fila = struct.unpack_from(formato, datos, posicion + 4)
+            posicion += 4 + struct.calcsize(formato)
+            en_curso.append(Periodo.desde_fila(fila, fin))
+        self.hora, self.dia = en_curso
+        (anterior,) = struct.unpack_from('<I', datos, posicion)
+        self.anterior = anterior or None
+        return posicion + 4
+
+
+class AgregadosMonitor:
+    """Agregados de uptime de todos los servidores, guardados junto al historial."""
+
+    def __init__(self, archivo=None):
+        if archivo is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            archivo = os.path.join(app_dir, "core", "uptime_monitor.bin")
+
+        self.archivo = archivo
+        self.servidores = {}
+
+    def podar(self, nombres):
+        """Descarta los agregados de los servidores que ya no se monitorean."""
+        for nombre in list(self.servidores):
+            if nombre not in nombres:
+                del self.servidores[nombre]
+
+    def registrar(self, nombre, timestamp, online, latencia, jugadores, hueco_maximo=HUECO_MAXIMO):
+        """Suma una verificación a los agregados del servidor.
+
+        `hueco_maximo` es la mayor separación entre verificaciones que todavía se cuenta como tiempo medido.
+        """
+        agregados = self.servidores.get(nombre)
+        if agregados is None:
+            agregados = self.servidores[nombre] = AgregadosServidor()
+        agregados.agregar(timestamp, online, latencia, jugadores, hueco_maximo)
+
+    def serializar(self):
+        """Retorna todos los agregados como bytes."""
+        partes = [MAGIA, struct.pack('<BH', VERSION_ARCHIVO, len(self.servidores))]
+        for nombre, agregados in list(self.servidores.items()):
+            nombre_bytes = nombre.encode('utf-8')
+            partes.append(struct.pack('<H', len(nombre_bytes)))
+            partes.append(nombre_bytes)
+            partes.append(agregados.serializar())
+        return b"".join(partes)
+
+    def escribir(self, datos):
+        """Escribe bytes ya serializados al archivo de forma atómica."""
+        if not self.archivo:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
+            temporal = self.archivo + ".tmp"
+            with open(temporal, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, self.archivo)
+        except Exception as e:
+            print(f"Error al guardar agregados de uptime: {e}")
+
+    def guardar(self):
+        """Guarda los agregados en disco."""
+        self.escribir(self.serializar())
+
+    def cargar(self):
+        """Carga los agregados desde disco (si el archivo existe y es válido)."""
+        if not self.archivo or not os.path.exists(self.archivo):
+            return
+        try:
+            with open(self.archivo, 'rb') as f:
+                datos = f.read()
+            if datos[:4] != MAGIA:
+                return
+            version, cantidad = struct.unpack_from('<BH', datos, 4)
+            if version != VERSION_ARCHIVO:
+                return
+            posicion = 7
+            for _ in range(cantidad):
+                (largo,) = struct.unpack_from('<H', datos, posicion)
+                posicion += 2
+                nombre = datos[posicion:posicion + largo].decode('utf-8')
+                posicion += largo
+                agregados = self.servidores[nombre] = AgregadosServidor()
+                posicion = agregados.deserializar(datos, posicion)
+        except Exception as e:
+            print(f"Error al cargar agregados de uptime: {e}")
+
+    def reporte_csv(self, periodo="dia", servidores=None, desde=None):
+        """Genera el reporte CSV de uptime por hora o por día."""
+        if periodo not in PERIODOS:
+            raise ValueError(f"Período desconocido: {periodo}")
+        salida = io.StringIO()
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerow([
+            "servidor", "inicio", "uptime_%", "minutos_arriba", "minutos_abajo",
+            "latencia_promedio_ms", "latencia_max_ms", "pico_jugadores", "verificaciones"
+        ])
+        formato_fecha = "%Y-%m-%d %H:00" if periodo == "hora" else "%Y-%m-%d"
+        for nombre in servidores or list(self.servidores):
+            agregados = self.servidores.get(nombre)
+            if agregados is None:
+                continue
+            for inicio, arriba, abajo, muestras, lat_suma, lat_n, lat_max, pico in agregados.filas(periodo):
+                if desde is not None and inicio < desde:
+                    continue
+                medido = arriba + abajo
+                escritor.writerow([
+                    nombre,
+                    time.strftime(formato_fecha, time.localtime(inicio)),
+                    f"{100 * arriba / medido:.2f}" if medido else "",
+                    f"{arriba / 60:.1f}",
+                    f"{abajo / 60:.1f}",
+                    f"{lat_suma / lat_n:.1f}" if lat_n else "",
+                    lat_max if lat_n else "",
+                    pico,
+                    muestras,
+                ])
+        return salida.getvalue()
@@ -0,0 +1,55 @@
+"""
+Contador de elementos más frecuentes con memoria acotada
+Implementa el algoritmo Space-Saving (Metwally et al.)
+"""
+
+import heapq
+
+
+class ContadorTopN:
+    """Cuenta los elementos más frecuentes de un flujo usando como máximo `capacidad` entradas."""
+
+    def __init__(self, capacidad=1000):
+        self.capacidad = capacidad
+        self.conteos = {}
+        self.errores = {}
+        self.heap = []
+        self.total = 0
+
+    def agregar(self, elemento, cantidad=1):
+        """Registra una aparición del elemento."""
+        self.total += cantidad
+        conteos = self.conteos
+
+        if elemento in conteos:
+            conteos[elemento] += cantidad
+        elif len(conteos) < self.capacidad:
+            conteos[elemento] = cantidad
+            self.errores[elemento] = 0
+        else:
+            # Reemplaza al elemento con menor conteo y hereda su conteo como error
+            minimo, desplazado = self._extraer_minimo()
+            del conteos[desplazado]
+            del self.errores[desplazado]
+            conteos[elemento] = minimo + cantidad
+            self.errores[elemento] = minimo
+
+        heapq.heappush(self.heap, (conteos[elemento], elemento))
+        if len(self.heap) > self.capacidad * 4:
+            self.heap = [(conteo, clave) for clave, conteo in conteos.items()]
+            heapq.heapify(self.heap)
+
+    def _extraer_minimo(self):
+        """Saca del heap el elemento con menor conteo vigente."""
+        while True:
+            conteo, elemento = heapq.heappop(self.heap)
+            if self.conteos.get(elemento) == conteo:
+                return conteo, elemento
+
+    def top(self, n=10):
+        """Retorna [(elemento, conteo, error_maximo)] de los n más frecuentes."""
+        mayores = heapq.nlargest(n, self.conteos.items(), key=lambda item: item[1])
+        return [(elemento, conteo, self.errores[elemento]) for elemento, conteo in mayores]
+
+    def __len__(self):
+        return len(self.conteos)
@@ -0,0 +1,166 @@
+"""
+Módulo de detección de flood y spam en logs de Minecraft
+Analiza las líneas [CHAT] con ventanas deslizantes por jugador
+"""
+
+import os
+import re
+import unicodedata
+from collections import deque
+
+from core.filtro_logs import abrir_log, extraer_mensaje_chat, RelojLogs
+
+
+PATRON_LETRAS_REPETIDAS = re.compile(r'(.)\1+')
+
+
+def normalizar_mensaje(mensaje):
+    """Reduce un mensaje a su esqueleto para detectar repeticiones casi idénticas."""
+    texto = unicodedata.normalize('NFKD', mensaje.lower())
+    texto = ''.join(c for c in texto if c.isalpha())
+    return PATRON_LETRAS_REPETIDAS.sub(r'\1', texto)
+
+
+class EstadoJugador:
+    """Contadores de ventana deslizante de un jugador."""
+
+    __slots__ = ("mensajes", "recientes", "conteo_claves", "en_flood",
+                 "total", "incidentes_flood", "rafaga_maxima", "repeticiones", "eventos")
+
+    def __init__(self):
+        self.mensajes = deque()
+        self.recientes = deque()
+        self.conteo_claves = {}
+        self.en_flood = False
+        self.total = 0
+        self.incidentes_flood = 0
+        self.rafaga_maxima = 0
+        self.repeticiones = 0
+        self.eventos = []
+
+
+class DetectorFlood:
+    """Detecta flood (ráfagas de mensajes) y spam (mensajes repetidos) por jugador."""
+
+    def __init__(self, ventana_flood=10, max_mensajes=5,
+                 ventana_repeticion=60, max_repeticiones=3, max_eventos=50):
+        self.ventana_flood = ventana_flood
+        self.max_mensajes = max_mensajes
+        self.ventana_repeticion = ventana_repeticion
+        self.max_repeticiones = max_repeticiones
+        self.max_eventos = max_eventos
+        self.jugadores = {}
+        self.reloj = RelojLogs()
+        self.archivo_actual = ""
+        self.lineas_chat = 0
+
+    def registrar_evento(self, estado, timestamp, tipo, detalle):
+        """Guarda un evento del jugador respetando el límite de memoria."""
+        if len(estado.eventos) < self.max_eventos:
+            estado.eventos.append((self.archivo_actual, timestamp, tipo, detalle))
+
+    def procesar_linea(self, linea):
+        """Procesa una línea del log. Retorna True si era un mensaje de chat."""
+        datos = extraer_mensaje_chat(linea)
+        if not datos:
+            return False
+
+        timestamp, jugador, mensaje = datos
+        segundo = self.reloj.segundos(timestamp)
+        self.lineas_chat += 1
+
+        estado = self.jugadores.get(jugador)
+        if estado is None:
+            estado = self.jugadores[jugador] = EstadoJugador()
+        estado.total += 1
+
+        # Flood: mensajes dentro de la ventana
+        mensajes = estado.mensajes
+        mensajes.append(segundo)
+        limite = segundo - self.ventana_flood
+        while mensajes[0] <= limite:
+            mensajes.popleft()
+
+        rafaga = len(mensajes)
+        if rafaga > estado.rafaga_maxima:
+            estado.rafaga_maxima = rafaga
+        if rafaga > self.max_mensajes:
+            if not estado.en_flood:
+                estado.en_flood = True
+                estado.incidentes_flood += 1
+                self.registrar_evento(
+                    estado, timestamp, "Flood",
+                    f"{rafaga} mensajes en {self.ventana_flood}s"
+                )
+        else:
+            estado.en_flood = False
+
+        # Spam: mensajes idénticos o casi idénticos dentro de la ventana
+        clave = hash(normalizar_mensaje(mensaje) or mensaje)
+        recientes = estado.recientes
+        conteo = estado.conteo_claves
+        recientes.append((segundo, clave))
+        conteo[clave] = conteo.get(clave, 0) + 1
+        limite = segundo - self.ventana_repeticion
+        while recientes[0][0] <= limite:
+            _, vieja = recientes.popleft()
+            restantes = conteo[vieja] - 1
+            if restantes:
+                conteo[vieja] = restantes
+            else:
+                del conteo[vieja]
+
+        repetidos = conteo[clave]
+        if repetidos >= self.max_repeticiones:
+            estado.repeticiones += 1
+            if repetidos == self.max_repeticiones:
+                self.registrar_evento(estado, timestamp, "Spam", mensaje[:80])
+
+        return True
+
+    def analizar_archivos(self, archivos):
+        """Analiza uno o varios archivos de log en una sola pasada."""
+        for archivo in archivos:
+            self.archivo_actual = os.path.basename(archivo)
+            with abrir_log(archivo) as f:
+                for linea in f:
+                    self.procesar_linea(linea)
+        return self.ranking()
+
+    def puntaje(self, estado):
+        """Calcula el puntaje de gravedad de un jugador."""
+        return estado.incidentes_flood * 3 + estado.repeticiones
+
+    def ranking(self, top=None):
+        """Retorna los infractores ordenados por gravedad."""
+        infractores = [
+            (jugador, estado) for jugador, estado in self.jugadores.items()
+            if estado.incidentes_flood or estado.repeticiones
+        ]
+        infractores.sort(key=lambda item: self.puntaje(item[1]), reverse=True)
+        return infractores[:top] if top else infractores
+
+    def guardar_reporte(self, archivo_salida, top=50):
+        """Guarda el ranking de infractores en un archivo de texto."""
+        infractores = self.ranking(top)
+        with open(archivo_salida, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("REPORTE DE FLOOD / SPAM\n")
+            f.write("="*80 + "\n\n")
+            f.write(f"Mensajes de chat analizados: {self.lineas_chat}\n")
+            f.write(f"Jugadores con mensajes: {len(self.jugadores)}\n")
+            f.write(f"Flood: más de {self.max_mensajes} mensajes en {self.ventana_flood}s\n")
+            f.write(f"Spam: {self.max_repeticiones}+ mensajes iguales en {self.ventana_repeticion}s\n\n")
+
+            for posicion, (jugador, estado) in enumerate(infractores, 1):
+                f.write(f"{posicion}. {jugador} (puntaje {self.puntaje(estado)})\n")
+                f.write(f"   • Mensajes: {estado.total} | Ráfaga máxima: {estado.rafaga_maxima}\n")
+                f.write(f"   • Incidentes de flood: {estado.incidentes_flood}\n")
+                f.write(f"   • Mensajes repetidos: {estado.repeticiones}\n")
+                for archivo, timestamp, tipo, detalle in estado.eventos:
+                    f.write(f"     [{timestamp}] {archivo} - {tipo}: {detalle}\n")
+                f.write("\n")
+
+            f.write("="*80 + "\n")
+            f.write(f"TOTAL: {len(infractores)} infractores\n")
+            f.write("="*80 + "\n")
@@ -0,0 +1,216 @@
+"""
+Módulo de escaneo de toxicidad en logs de Minecraft
+Busca palabras prohibidas en el chat con un autómata Aho-Corasick
+"""
+
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter
+
+from core.filtro_logs import abrir_log, extraer_mensaje_chat
+
+
+LEETSPEAK = {
+    "0": "o", "1": "i", "3": "e", "4": "a", "5": "s",
+    "7": "t", "8": "b", "@": "a", "$": "s", "!": "i", "|": "l",
+}
+
+# Letras sueltas separadas por espacios: "p u t o"
+PATRON_LETRAS_SUELTAS = re.compile(r'\b[a-z](?: [a-z]){2,}\b')
+
+PATRON_LETRA_DOBLE = re.compile(r'([a-z])\1')
+
+
+def normalizar_texto(texto, repeticiones=1):
+    """Pasa a minúsculas, quita acentos, traduce leetspeak y deja cada letra repetida a lo sumo `repeticiones` veces."""
+    texto = unicodedata.normalize('NFKD', texto.lower())
+    resultado = []
+    anterior = " "
+    seguidas = 1
+    ultimo = len(texto) - 1
+    for posicion, caracter in enumerate(texto):
+        # Los símbolos solo cuentan como leetspeak dentro de una palabra ("p!to", no "hola!")
+        if caracter in LEETSPEAK and (caracter.isdigit() or (posicion < ultimo and texto[posicion + 1].isalnum())):
+            caracter = LEETSPEAK[caracter]
+        if not caracter.isalpha():
+            if unicodedata.combining(caracter):
+                continue
+            caracter = " "
+        if caracter == anterior:
+            seguidas += 1
+            if caracter == " " or seguidas > repeticiones:
+                continue
+        else:
+            anterior = caracter
+            seguidas = 1
+        resultado.append(caracter)
+    texto = "".join(resultado).strip()
+    return PATRON_LETRAS_SUELTAS.sub(lambda match: match.group(0).replace(" ", ""), texto)
+
+
+class AutomataPalabras:
+    """Autómata Aho-Corasick para buscar miles de términos en una sola pasada."""
+
+    def __init__(self, terminos):
+        # terminos: lista de (texto_normalizado, es_prefijo, termino_original)
+        self.transiciones = [{}]
+        self.salidas = [[]]
+        self.terminos = []
+
+        for texto, es_prefijo, original in terminos:
+            if not texto:
+                continue
+            estado = 0
+            for caracter in texto:
+                siguiente = self.transiciones[estado].get(caracter)
+                if siguiente is None:
+                    siguiente = len(self.transiciones)
+                    self.transiciones[estado][caracter] = siguiente
+                    self.transiciones.append({})
+                    self.salidas.append([])
+                estado = siguiente
+            self.salidas[estado].append(len(self.terminos))
+            self.terminos.append((len(texto), es_prefijo, original))
+
+        self._construir_fallos()
+
+    def _construir_fallos(self):
+        """Calcula los enlaces de fallo y propaga las salidas (BFS)."""
+        self.fallos = [0] * len(self.transiciones)
+        cola = list(self.transiciones[0].values())
+        indice = 0
+        while indice < len(cola):
+            estado = cola[indice]
+            indice += 1
+            for caracter, siguiente in self.transiciones[estado].items():
+                cola.append(siguiente)
+                fallo = self.fallos[estado]
+                while fallo and caracter not in self.transiciones[fallo]:
+                    fallo = self.fallos[fallo]
+                destino = self.transiciones[fallo].get(caracter, 0)
+                self.fallos[siguiente] = destino if destino != siguiente else 0
+                self.salidas[siguiente] = self.salidas[siguiente] + self.salidas[self.fallos[siguiente]]
+
+    def buscar(self, texto):
+        """Retorna los términos originales encontrados respetando límites de palabra."""
+        encontrados = []
+        transiciones = self.transiciones
+        fallos = self.fallos
+        estado = 0
+        largo = len(texto)
+
+        for posicion, caracter in enumerate(texto):
+            while estado and caracter not in transiciones[estado]:
+                estado = fallos[estado]
+            estado = transiciones[estado].get(caracter, 0)
+
+            for indice in self.salidas[estado]:
+                longitud, es_prefijo, original = self.terminos[indice]
+                inicio = posicion - longitud + 1
+                if inicio > 0 and texto[inicio - 1] != " ":
+                    continue
+                if not es_prefijo and posicion + 1 < largo and texto[posicion + 1] != " ":
+                    continue
+                encontrados.append(original)
+
+        return encontrados
+
+
+class EscanerToxicidad:
+    """Escanea el chat en busca de palabras prohibidas y resume los hits por jugador."""
+
+    def __init__(self, archivo_palabras=None, max_eventos=50):
+        if archivo_palabras is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            archivo_palabras = os.path.join(app_dir, "core", "palabras_prohibidas.json")
+
+        self.archivo_palabras = archivo_palabras
+        self.max_eventos = max_eventos
+        # Los términos con letras dobles ("perra") se buscan en el texto que conserva las dobles ("perrrra" -> "perra"):
+        # colapsarlas del todo los volvería "pera". El resto se busca con todas las repeticiones colapsadas.
+        terminos = self.cargar_palabras()
+        self.automata = AutomataPalabras([termino for termino in terminos if not PATRON_LETRA_DOBLE.search(termino[0])])
+        self.automata_dobles = AutomataPalabras([termino for termino in terminos if PATRON_LETRA_DOBLE.search(termino[0])])
+        self.hits = {}
+        self.terminos_por_jugador = {}
+        self.eventos = {}
+        self.lineas_chat = 0
+        self.archivo_actual = ""
+
+    def cargar_palabras(self):
+        """Carga la lista de palabras. Un '*' final indica coincidencia por prefijo."""
+        with open(self.archivo_palabras, 'r', encoding='utf-8') as f:
+            palabras = json.load(f).get("palabras", [])
+
+        terminos = []
+        for palabra in palabras:
+            palabra = palabra.strip()
+            es_prefijo = palabra.endswith("*")
+            texto = normalizar_texto(palabra.rstrip("*"), repeticiones=2)
+            terminos.append((texto, es_prefijo, palabra.rstrip("*")))
+        return terminos
+
+    def procesar_linea(self, linea):
+        """Procesa una línea del log. Retorna la lista de términos encontrados."""
+        datos = extraer_mensaje_chat(linea)
+        if not datos:
+            return []
+
+        timestamp, jugador, mensaje = datos
+        self.lineas_chat += 1
+        encontrados = self.automata.buscar(normalizar_texto(mensaje))
+        if self.automata_dobles.terminos:
+            encontrados += self.automata_dobles.buscar(normalizar_texto(mensaje, repeticiones=2))
+        if not encontrados:
+            return encontrados
+
+        self.hits[jugador] = self.hits.get(jugador, 0) + len(encontrados)
+        self.terminos_por_jugador.setdefault(jugador, Counter()).update(encontrados)
+        eventos = self.eventos.setdefault(jugador, [])
+        if len(eventos) < self.max_eventos:
+            eventos.append((self.archivo_actual, timestamp, mensaje[:100]))
+        return encontrados
+
+    def analizar_archivos(self, archivos):
+        """Analiza uno o varios archivos de log en una sola pasada."""
+        for archivo in archivos:
+            self.archivo_actual = os.path.basename(archivo)
+            with abrir_log(archivo) as f:
+                for linea in f:
+                    if "[CHAT]" in linea:
+                        self.procesar_linea(linea)
+        return self.ranking()
+
+    def ranking(self, top=None):
+        """Retorna [(jugador, hits)] ordenado de mayor a menor."""
+        ranking = sorted(self.hits.items(), key=lambda item: item[1], reverse=True)
+        return ranking[:top] if top else ranking
+
+    def guardar_reporte(self, archivo_salida, top=50):
+        """Guarda el resumen de toxicidad por jugador en un archivo."""
+        ranking = self.ranking(top)
+        with open(archivo_salida, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("REPORTE DE TOXICIDAD\n")
+            f.write("="*80 + "\n\n")
+            f.write(f"Mensajes de chat analizados: {self.lineas_chat}\n")
+            f.write(f"Términos vigilados: {len(self.automata.terminos) + len(self.automata_dobles.terminos)}\n\n")
+
+            for posicion, (jugador, hits) in enumerate(ranking, 1):
+                terminos = ", ".join(
+                    f"{termino} x{count}" for termino, count in self.terminos_por_jugador[jugador].most_common(5)
+                )
+                f.write(f"{posicion}. {jugador}: {hits} coincidencias ({terminos})\n")
+                for archivo, timestamp, mensaje in self.eventos[jugador]:
+                    f.write(f"     [{timestamp}] {archivo} - {mensaje}\n")
+                f.write("\n")
+
+            f.write("="*80 + "\n")
+            f.write(f"TOTAL: {len(ranking)} jugadores con coincidencias\n")
+            f.write("="*80 + "\n")
@@ -3,8 +3,13 @@ Módulo de filtrado de logs de Minecraft
 Integrado con la interfaz gráfica de Staff Tools
 """
 
+import gzip
+import os
 import re
 from collections import Counter
+from datetime import datetime
+
+from core.contador_top import ContadorTopN
 
 
 FRASES_IGNORADAS = [
@@ -24,6 +29,86 @@ PATRONES_IGNORADOS = [
     r"textures '.*' was added",
 ]
 
+PATRON_TIMESTAMP = re.compile(r'\[(\d{2}:\d{2}:\d{2})\]')
+
+# [12:00:00] [Render thread/INFO]: [System] [CHAT] [LATAM+] Nick: mensaje
+PATRON_MENSAJE_CHAT = re.compile(
+    r'^\[(\d{2}:\d{2}:\d{2})\].*?\[CHAT\]\s*(?:\[[^\]]*\]\s*)*'
+    r'([A-Za-z0-9_]{2,16})\s*(?::|»|>>|>)\s?(.*)$'
+)
+
+PATRON_FECHA_ARCHIVO = re.compile(r'(\d{4}-\d{2}-\d{2})')
+PATRON_NUMERO_ROTACION = re.compile(r'-(\d+)\.log')
+EXTENSIONES_LOG = ('.log', '.log.gz')
+
+PATRON_CONEXION = re.compile(
+    r'\[CHAT\]\s*(?:\[[^\]]*\]\s*)*([A-Za-z0-9_]{2,16})\s+(?:se ha conectado|acaba de unirse)'
+)
+
+PATRON_ZONA = re.compile(
+    r'\[CHAT\]\s*(?:\[[^\]]*\]\s*)*([A-Za-z0-9_]{2,16})\b.*?(?:Entrando a|Saliendo de) la zona'
+)
+
+
+def abrir_log(ruta):
+    """Abre un log en modo texto, soportando archivos rotados .gz."""
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rt', encoding='utf-8', errors='ignore')
+    return open(ruta, 'r', encoding='utf-8', errors='ignore')
+
+
+def fecha_de_archivo(ruta):
+    """Retorna la fecha de un log rotado (2024-01-15-1.log.gz) o la de su última modificación."""
+    match = PATRON_FECHA_ARCHIVO.search(os.path.basename(ruta))
+    if match:
+        return datetime.strptime(match.group(1), '%Y-%m-%d').date()
+    return datetime.fromtimestamp(os.path.getmtime(ruta)).date()
+
+
+def listar_logs(carpeta):
+    """Lista los logs de una carpeta en orden cronológico (rotados primero, latest.log al final)."""
+    def orden(ruta):
+        nombre = os.path.basename(ruta)
+        numero = PATRON_NUMERO_ROTACION.search(nombre)
+        return (fecha_de_archivo(ruta), nombre.startswith("latest"), int(numero.group(1)) if numero else 0)
+    
+    archivos = [
+        os.path.join(carpeta, nombre) for nombre in os.listdir(carpeta)
+        if nombre.endswith(EXTENSIONES_LOG)
+    ]
+    return sorted(archivos, key=orden)
+
+
+def segundos_del_dia(timestamp):
+    """Convierte un timestamp HH:MM:SS en segundos desde medianoche."""
+    return int(timestamp[0:2]) * 3600 + int(timestamp[3:5]) * 60 + int(timestamp[6:8])
+
+
+def extraer_mensaje_chat(linea):
+    """Extrae (timestamp, jugador, mensaje) de una línea de chat o None."""
+    if "[CHAT]" not in linea:
+        return None
+    match = PATRON_MENSAJE_CHAT.match(linea)
+    if not match:
+        return None
+    return match.group(1), match.group(2), match.group(3)
+
+
+class RelojLogs:
+    """Convierte timestamps HH:MM:SS en segundos continuos detectando el cambio de día."""
+    
+    def __init__(self):
+        self.dia = 0
+        self.ultimo = 0
+    
+    def segundos(self, timestamp):
+        """Retorna los segundos absolutos desde el inicio del log."""
+        actual = segundos_del_dia(timestamp)
+        if actual < self.ultimo - 3600:
+            self.dia += 1
+        self.ultimo = actual
+        return self.dia * 86400 + actual
+
 
 class FiltroLogs:
     """Clase para filtrar logs de Minecraft por jugadores."""
@@ -47,7 +132,7 @@ class FiltroLogs:
     
     def extraer_timestamp(self, linea):
         """Extrae el timestamp de una línea del log."""
-        match = re.match(r'\[(\d{2}:\d{2}:\d{2})\]', linea)
+        match = PATRON_TIMESTAMP.match(linea)
         return match.group(1) if match else None
     
     def filtrar_por_jugadores(self, jugadores, case_sensitive=False):
@@ -114,6 +199,52 @@ class FiltroLogs:
         
         return stats, tipos_mensaje
     
+    def descubrir_activos(self, top_n=10, capacidad=1000):
+        """Encuentra los jugadores más activos sin lista previa, en una sola pasada."""
+        contadores = {
+            "Mensajes de chat": ContadorTopN(capacidad),
+            "Conexiones": ContadorTopN(capacidad),
+            "Movimientos de zona": ContadorTopN(capacidad),
+        }
+        chat = contadores["Mensajes de chat"]
+        conexiones = contadores["Conexiones"]
+        zonas = contadores["Movimientos de zona"]
+        
+        with abrir_log(self.archivo_log) as f:
+            for linea in f:
+                if "[CHAT]" not in linea:
+                    continue
+                
+                if "se ha conectado" in linea or "acaba de unirse" in linea:
+                    match = PATRON_CONEXION.search(linea)
+                    if match:
+                        conexiones.agregar(match.group(1))
+                elif "la zona" in linea:
+                    match = PATRON_ZONA.search(linea)
+                    if match:
+                        zonas.agregar(match.group(1))
+                else:
+                    datos = extraer_mensaje_chat(linea)
+                    if datos:
+                        chat.agregar(datos[1])
+        
+        return {categoria: contador.top(top_n) for categoria, contador in contadores.items()}
+    
+    def guardar_descubrimiento(self, archivo_salida, resultados):
+        """Guarda el ranking de jugadores más activos en un archivo."""
+        with open(archivo_salida, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("JUGADORES MÁS ACTIVOS\n")
+            f.write("="*80 + "\n")
+            
+            for categoria, ranking in resultados.items():
+                f.write(f"\n{categoria}:\n")
+                if not ranking:
+                    f.write("  (sin datos)\n")
+                for posicion, (jugador, count, error) in enumerate(ranking, 1):
+                    aproximado = f" (±{error})" if error else ""
+                    f.write(f"  {posicion}. {jugador}: {count}{aproximado}\n")
+    
     def guardar_resultados(self, archivo_salida, incluir_stats=True, jugadores=None):
         """Guarda los resultados en un archivo."""
         with open(archivo_salida, 'w', encoding='utf-8') as f:
@@ -0,0 +1,455 @@
+"""
+Historial compacto de latencia, jugadores y rendimiento (TPS/MSPT/memoria) por servidor
+Buffers circulares sobre array con submuestreo a buckets de 1 y 15 minutos
+"""
+
+import os
+import struct
+import sys
+from array import array
+
+
+SIN_DATO = 0xFFFF
+MAGIA = b"MSTH"
+VERSION_ARCHIVO = 4
+
+# timestamp, latencia (ms), jugadores online, jugadores max, código de estado
+TIPOS_MUESTRA = "IHHHB"
+# timestamp, TPS x100, MSPT x10, memoria usada (MB)
+TIPOS_RENDIMIENTO = "IHHH"
+# timestamp, latencia min/prom/max, online min/prom/max, max, muestras, muestras online
+TIPOS_BUCKET = "IHHHHHHHHH"
+# timestamp, TPS min/prom, MSPT prom/max, memoria prom/max, mediciones
+TIPOS_BUCKET_RENDIMIENTO = "IHHHHHHH"
+
+ESCALA_TPS = 100
+ESCALA_MSPT = 10
+
+
+def acotar(valor):
+    """Convierte un valor a uint16 reservando SIN_DATO para 'sin dato'."""
+    if valor is None:
+        return SIN_DATO
+    return max(0, min(int(round(valor)), SIN_DATO - 1))
+
+
+def empaquetar_bucket(bucket, tipos):
+    """Serializa un bucket en construcción (o su ausencia) como un byte de presencia y su fila."""
+    if bucket is None:
+        return struct.pack('<B', 0)
+    return struct.pack('<B' + tipos, 1, *bucket.fila())
+
+
+def desempaquetar_bucket(datos, posicion, tipos, clase):
+    """Lee un bucket guardado con empaquetar_bucket. Retorna (bucket o None, nueva posición)."""
+    (presente,) = struct.unpack_from('<B', datos, posicion)
+    posicion += 1
+    if not presente:
+        return None, posicion
+    fila = struct.unpack_from('<' + tipos, datos, posicion)
+    return clase.desde_fila(fila), posicion + struct.calcsize('<' + tipos)
+
+
+class BufferCircular:
+    """Buffer circular de columnas numéricas de tamaño fijo respaldado por array."""
+
+    def __init__(self, capacidad, tipos):
+        self.capacidad = capacidad
+        self.tipos = tipos
+        self.columnas = [array(tipo, [0]) * capacidad for tipo in tipos]
+        self.inicio = 0
+        self.cantidad = 0
+
+    def agregar(self, valores):
+        """Agrega una fila, pisando la más vieja si el buffer está lleno."""
+        posicion = (self.inicio + self.cantidad) % self.capacidad
+        for columna, valor in zip(self.columnas, valores):
+            columna[posicion] = valor
+        if self.cantidad < self.capacidad:
+            self.cantidad += 1
+        else:
+            self.inicio = (self.inicio + 1) % self.capacidad
+
+    def fila(self, indice):
+        """Retorna la fila `indice` (0 = la más vieja)."""
+        posicion = (self.inicio + indice) % self.capacidad
+        return tuple(columna[posicion] for columna in self.columnas)
+
+    def __len__(self):
+        return self.cantidad
+
+    def __iter__(self):
+        for indice in range(self.cantidad):
+            yield self.fila(indice)
+
+    def ultimas(self, n):
+        """Retorna las últimas n filas, de la más vieja a la más nueva."""
+        n = min(n, self.cantidad)
+        return [self.fila(indice) for indice in range(self.cantidad - n, self.cantidad)]
+
+    def serializar(self):
+        """Retorna el buffer como bytes (little-endian)."""
+        partes = [struct.pack('<III', self.capacidad, self.inicio, self.cantidad)]
+        for columna in self.columnas:
+            if sys.byteorder != 'little':
+                columna = array(columna.typecode, columna)
+                columna.byteswap()
+            partes.append(columna.tobytes())
+        return b"".join(partes)
+
+    def deserializar(self, datos, posicion):
+        """Carga el buffer desde bytes. Retorna la nueva posición."""
+        capacidad, inicio, cantidad = struct.unpack_from('<III', datos, posicion)
+        posicion += 12
+        columnas = []
+        for tipo in self.tipos:
+            columna = array(tipo)
+            largo = capacidad * columna.itemsize
+            columna.frombytes(datos[posicion:posicion + largo])
+            if sys.byteorder != 'little':
+                columna.byteswap()
+            columnas.append(columna)
+            posicion += largo
+
+        if capacidad == self.capacidad:
+            self.columnas, self.inicio, self.cantidad = columnas, inicio, cantidad
+        else:
+            # Cambió la capacidad: se conservan las filas más nuevas que entren
+            viejo = BufferCircular(capacidad, self.tipos)
+            viejo.columnas, viejo.inicio, viejo.cantidad = columnas, inicio, cantidad
+            for fila in viejo.ultimas(self.capacidad):
+                self.agregar(fila)
+        return posicion
+
+
+class Estadistica:
+    """Mínimo, suma ponderada y máximo de un valor dentro de un bucket."""
+
+    __slots__ = ("minimo", "suma", "maximo", "n")
+
+    def __init__(self):
+        self.minimo = None
+        self.suma = 0
+        self.maximo = 0
+        self.n = 0
+
+    def agregar(self, valor, peso, minimo=None, maximo=None):
+        """Suma un valor (o el promedio de un bucket, con sus extremos)."""
+        if valor == SIN_DATO:
+            return
+        minimo = valor if minimo is None or minimo == SIN_DATO else minimo
+        maximo = valor if maximo is None or maximo == SIN_DATO else maximo
+        self.minimo = minimo if self.minimo is None else min(self.minimo, minimo)
+        self.maximo = max(self.maximo, maximo)
+        self.suma += valor * peso
+        self.n += peso
+
+    def valores(self):
+        """Retorna (min, prom, max) acotados o SIN_DATO si no hubo valores."""
+        if not self.n:
+            return SIN_DATO, SIN_DATO, SIN_DATO
+        return acotar(self.minimo), acotar(self.suma / self.n), acotar(self.maximo)
+
+
+class Acumulador:
+    """Estadísticas min/prom/max de un bucket en construcción."""
+
+    __slots__ = ("inicio", "muestras", "arriba", "latencia", "jugadores", "maximo")
+
+    def __init__(self, inicio):
+        self.inicio = inicio
+        self.muestras = 0
+        self.arriba = 0
+        self.latencia = Estadistica()
+        self.jugadores = Estadistica()
+        self.maximo = 0
+
+    @classmethod
+    def desde_fila(cls, fila):
+        """Reconstruye un bucket en construcción a partir de su fila (TIPOS_BUCKET)."""
+        inicio, lat_min, lat_prom, lat_max, jug_min, jug_prom, jug_max, maximo, muestras, arriba = fila
+        acumulador = cls(inicio)
+        acumulador.agregar(lat_prom, jug_prom, maximo, arriba, peso=muestras,
+                           lat_min=lat_min, lat_max=lat_max, jug_min=jug_min, jug_max=jug_max)
+        return acumulador
+
+    def agregar(self, latencia, online, maximo, arriba, peso=1,
+                lat_min=None, lat_max=None, jug_min=None, jug_max=None):
+        """Suma una muestra (o un bucket ya cerrado, con su peso y sus extremos).
+        
+        Los promedios se ponderan por las muestras con el servidor arriba,
+        que son las únicas que tienen latencia.
+        """
+        self.muestras += peso
+        self.arriba += arriba
+        self.latencia.agregar(latencia, arriba, lat_min, lat_max)
+        self.jugadores.agregar(online, arriba, jug_min, jug_max)
+        if maximo != SIN_DATO:
+            self.maximo = max(self.maximo, maximo)
+
+    def fila(self):
+        """Retorna el bucket como fila de TIPOS_BUCKET."""
+        return (self.inicio,) + self.latencia.valores() + self.jugadores.valores() + (
+            acotar(self.maximo), acotar(self.muestras), acotar(self.arriba)
+        )
+
+
+class AcumuladorRendimiento:
+    """TPS, MSPT y memoria de un bucket de 15 minutos en construcción."""
+
+    __slots__ = ("inicio", "mediciones", "tps", "mspt", "memoria")
+
+    def __init__(self, inicio):
+        self.inicio = inicio
+        self.mediciones = 0
+        self.tps = Estadistica()
+        self.mspt = Estadistica()
+        self.memoria = Estadistica()
+
+    @classmethod
+    def desde_fila(cls, fila):
+        """Reconstruye un bucket en construcción a partir de su fila (TIPOS_BUCKET_RENDIMIENTO)."""
+        inicio, tps_min, tps_prom, mspt_prom, mspt_max, memoria_prom, memoria_max, mediciones = fila
+        acumulador = cls(inicio)
+        acumulador.mediciones = mediciones
+        acumulador.tps.agregar(tps_prom, mediciones, minimo=tps_min)
+        acumulador.mspt.agregar(mspt_prom, mediciones, maximo=mspt_max)
+        acumulador.memoria.agregar(memoria_prom, mediciones, maximo=memoria_max)
+        return acumulador
+
+    def agregar(self, tps, mspt, memoria):
+        """Suma una medición."""
+        self.mediciones += 1
+        self.tps.agregar(tps, 1)
+        self.mspt.agregar(mspt, 1)
+        self.memoria.agregar(memoria, 1)
+
+    def fila(self):
+        """Retorna el bucket como fila de TIPOS_BUCKET_RENDIMIENTO."""
+        tps_min, tps_prom, _ = self.tps.valores()
+        _, mspt_prom, mspt_max = self.mspt.valores()
+        _, memoria_prom, memoria_max = self.memoria.valores()
+        return (self.inicio, tps_min, tps_prom, mspt_prom, mspt_max, memoria_prom, memoria_max,
+                acotar(self.mediciones))
+
+
+class HistorialServidor:
+    """Historial de un servidor: muestras crudas recientes y buckets submuestreados.
+
+    El rendimiento (solo servidores con RCON) se guarda aparte: mediciones crudas y buckets de 15 minutos,
+    creados recién con la primera medición.
+    """
+
+    def __init__(self, capacidad_cruda=720, capacidad_minutos=1440, capacidad_cuartos=672,
+                 capacidad_rendimiento=240):
+        self.crudo = BufferCircular(capacidad_cruda, TIPOS_MUESTRA)
+        self.minutos = BufferCircular(capacidad_minutos, TIPOS_BUCKET)
+        self.cuartos = BufferCircular(capacidad_cuartos, TIPOS_BUCKET)
+        self.capacidad_rendimiento = capacidad_rendimiento
+        self.rendimiento = None
+        self.cuartos_rendimiento = None
+        self.bucket_minuto = None
+        self.bucket_cuarto = None
+        self.bucket_rendimiento = None
+
+    def _crear_rendimiento(self):
+        """Crea los buffers de rendimiento (la primera vez que llega una medición)."""
+        if self.rendimiento is None:
+            self.rendimiento = BufferCircular(self.capacidad_rendimiento, TIPOS_RENDIMIENTO)
+            self.cuartos_rendimiento = BufferCircular(self.cuartos.capacidad, TIPOS_BUCKET_RENDIMIENTO)
+
+    def agregar(self, timestamp, latencia, online, maximo, codigo_estado, arriba):
+        """Registra una muestra en O(1) y actualiza los buckets."""
+        timestamp = int(timestamp)
+        fila = (timestamp, acotar(latencia), acotar(online), acotar(maximo), codigo_estado)
+        self.crudo.agregar(fila)
+        self._bucket(timestamp).agregar(fila[1], fila[2], fila[3], 1 if arriba else 0)
+
+    def agregar_rendimiento(self, timestamp, tps, mspt, memoria):
+        """Registra una medición de TPS, MSPT (ms) y memoria usada (MB) en O(1)."""
+        timestamp = int(timestamp)
+        fila = (
+            timestamp,
+            acotar(None if tps is None else tps * ESCALA_TPS),
+            acotar(None if mspt is None else mspt * ESCALA_MSPT),
+            acotar(memoria),
+        )
+        self._crear_rendimiento()
+        self.rendimiento.agregar(fila)
+
+        inicio_cuarto = timestamp - timestamp % 900
+        if self.bucket_rendimiento and self.bucket_rendimiento.inicio != inicio_cuarto:
+            self.cuartos_rendimiento.agregar(self.bucket_rendimiento.fila())
+            self.bucket_rendimiento = None
+        if self.bucket_rendimiento is None:
+            self.bucket_rendimiento = AcumuladorRendimiento(inicio_cuarto)
+        self.bucket_rendimiento.agregar(*fila[1:])
+
+    def _bucket(self, timestamp):
+        """Retorna el bucket del minuto de `timestamp`, cerrando el anterior si cambió."""
+        inicio_minuto = timestamp - timestamp % 60
+        if self.bucket_minuto and self.bucket_minuto.inicio != inicio_minuto:
+            self._cerrar_minuto()
+        if self.bucket_minuto is None:
+            self.bucket_minuto = Acumulador(inicio_minuto)
+        return self.bucket_minuto
+
+    def _cerrar_minuto(self):
+        """Pasa el bucket de minuto al buffer y lo acumula en el de 15 minutos."""
+        bucket = self.bucket_minuto.fila()
+        self.minutos.agregar(bucket)
+        self.bucket_minuto = None
+
+        inicio_cuarto = bucket[0] - bucket[0] % 900
+        if self.bucket_cuarto and self.bucket_cuarto.inicio != inicio_cuarto:
+            self.cuartos.agregar(self.bucket_cuarto.fila())
+            self.bucket_cuarto = None
+        if self.bucket_cuarto is None:
+            self.bucket_cuarto = Acumulador(inicio_cuarto)
+        _, lat_min, lat_prom, lat_max, jug_min, jug_prom, jug_max, maximo, muestras, arriba = bucket
+        self.bucket_cuarto.agregar(
+            lat_prom, jug_prom, maximo, arriba, peso=muestras,
+            lat_min=lat_min, lat_max=lat_max, jug_min=jug_min, jug_max=jug_max
+        )
+
+    def ultimas(self, n):
+        """Retorna las últimas n muestras crudas."""
+        return self.crudo.ultimas(n)
+
+    def tendencia(self, n):
+        """Retorna las últimas n muestras como [(latencia, jugadores)] con None si no hay dato."""
+        return [
+            (None if latencia == SIN_DATO else latencia, None if online == SIN_DATO else online)
+            for _, latencia, online, _, _ in self.crudo.ultimas(n)
+        ]
+
+    def ultimo_rendimiento(self):
+        """Retorna la última medición como {"tps", "mspt", "memoria"} (None si no hay dato) o None."""
+        if self.rendimiento is None or not len(self.rendimiento):
+            return None
+        _, tps, mspt, memoria = self.rendimiento.fila(len(self.rendimiento) - 1)
+        return {
+            "tps": None if tps == SIN_DATO else tps / ESCALA_TPS,
+            "mspt": None if mspt == SIN_DATO else mspt / ESCALA_MSPT,
+            "memoria": None if memoria == SIN_DATO else memoria,
+        }
+
+    def serializar(self):
+        """Retorna el historial como bytes."""
+        # Los buckets en construcción también se guardan: un reinicio no pierde los últimos 15 minutos
+        partes = [
+            self.crudo.serializar(), self.minutos.serializar(), self.cuartos.serializar(),
+            empaquetar_bucket(self.bucket_minuto, TIPOS_BUCKET), empaquetar_bucket(self.bucket_cuarto, TIPOS_BUCKET),
+        ]
+        if self.rendimiento is None:
+            partes.append(struct.pack('<B', 0))
+        else:
+            partes += [
+                struct.pack('<B', 1), self.rendimiento.serializar(), self.cuartos_rendimiento.serializar(),
+                empaquetar_bucket(self.bucket_rendimiento, TIPOS_BUCKET_RENDIMIENTO),
+            ]
+        return b"".join(partes)
+
+    def deserializar(self, datos, posicion):
+        """Carga el historial desde bytes. Retorna la nueva posición."""
+        posicion = self.crudo.deserializar(datos, posicion)
+        posicion = self.minutos.deserializar(datos, posicion)
+        posicion = self.cuartos.deserializar(datos, posicion)
+        self.bucket_minuto, posicion = desempaquetar_bucket(datos, posicion, TIPOS_BUCKET, Acumulador)
+        self.bucket_cuarto, posicion = desempaquetar_bucket(datos, posicion, TIPOS_BUCKET, Acumulador)
+        (con_rendimiento,) = struct.unpack_from('<B', datos, posicion)
+        posicion += 1
+        if con_rendimiento:
+            self._crear_rendimiento()
+            posicion = self.rendimiento.deserializar(datos, posicion)
+            posicion = self.cuartos_rendimiento.deserializar(datos, posicion)
+            self.bucket_rendimiento, posicion = desempaquetar_bucket(
+                datos, posicion, TIPOS_BUCKET_RENDIMIENTO, AcumuladorRendimiento
+            )
+        return posicion
+
+
+class HistorialMonitor:
+    """Historiales de todos los servidores monitoreados con persistencia en un archivo binario."""
+
+    def __init__(self, archivo=None):
+        if archivo is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            archivo = os.path.join(app_dir, "core", "historial_monitor.bin")
+        
+        self.archivo = archivo
+        self.servidores = {}
+
+    def obtener(self, nombre):
+        """Retorna (creando si hace falta) el historial de un servidor."""
+        historial = self.servidores.get(nombre)
+        if historial is None:
+            historial = self.servidores[nombre] = HistorialServidor()
+        return historial
+
+    def podar(self, nombres):
+        """Descarta los historiales de los servidores que ya no se monitorean."""
+        for nombre in list(self.servidores):
+            if nombre not in nombres:
+                del self.servidores[nombre]
+
+    def registrar(self, nombre, timestamp, latencia, online, maximo, codigo_estado, arriba):
+        """Agrega una muestra al historial del servidor."""
+        self.obtener(nombre).agregar(timestamp, latencia, online, maximo, codigo_estado, arriba)
+
+    def registrar_rendimiento(self, nombre, timestamp, tps, mspt, memoria):
+        """Agrega una medición de rendimiento al historial del servidor."""
+        self.obtener(nombre).agregar_rendimiento(timestamp, tps, mspt, memoria)
+
+    def serializar(self):
+        """Retorna todos los historiales como bytes."""
+        partes = [MAGIA, struct.pack('<BH', VERSION_ARCHIVO, len(self.servidores))]
+        for nombre, historial in list(self.servidores.items()):
+            nombre_bytes = nombre.encode('utf-8')
+            partes.append(struct.pack('<H', len(nombre_bytes)))
+            partes.append(nombre_bytes)
+            partes.append(historial.serializar())
+        return b"".join(partes)
+
+    def escribir(self, datos):
+        """Escribe bytes ya serializados al archivo de forma atómica."""
+        if not self.archivo:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
+            temporal = self.archivo + ".tmp"
+            with open(temporal, 'wb') as f:
+                f.write(datos)
+            os.replace(temporal, self.archivo)
+        except Exception as e:
+            print(f"Error al guardar historial: {e}")
+
+    def guardar(self):
+        """Guarda todos los historiales en disco."""
+        self.escribir(self.serializar())
+
+    def cargar(self):
+        """Carga los historiales desde disco (si el archivo existe y es válido)."""
+        if not self.archivo or not os.path.exists(self.archivo):
+            return
+        try:
+            with open(self.archivo, 'rb') as f:
+                datos = f.read()
+            if datos[:4] != MAGIA:
+                return
+            version, cantidad = struct.unpack_from('<BH', datos, 4)
+            if version != VERSION_ARCHIVO:
+                # Formato desconocido: se empieza un historial nuevo
+                return
+            posicion = 7
+            for _ in range(cantidad):
+                (largo,) = struct.unpack_from('<H', datos, posicion)
+                posicion += 2
+                nombre = datos[posicion:posicion + largo].decode('utf-8')
+                posicion += largo
+                posicion = self.obtener(nombre).deserializar(datos, posicion)
+        except Exception as e:
+            print(f"Error al cargar historial: {e}")
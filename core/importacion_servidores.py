@@ -0,0 +1,169 @@
+"""
+Importación y exportación de listas de servidores (texto, CSV o JSON)
+Valida las entradas todas a la vez (DNS/SRV y estado) con un límite de concurrencia
+"""
+
+import asyncio
+import csv
+import io
+import json
+import re
+
+from core.monitor_servidor import MonitorServidor
+from core.resolucion_dns import es_ip, separar_direccion
+
+
+FORMATOS = ("texto", "csv", "json")
+ENCABEZADOS = {"nombre", "name", "servidor", "server"}
+PATRON_HOST = re.compile(r'^(?=.{1,253}$)([A-Za-z0-9_]([A-Za-z0-9_-]{0,61}[A-Za-z0-9])?\.)*[A-Za-z0-9-]{1,63}$')
+
+
+class EntradaImportada:
+    """Servidor leído de la lista a importar y su resultado de validación."""
+
+    __slots__ = ("nombre", "direccion", "error", "estado")
+
+    def __init__(self, nombre, direccion, error=None):
+        self.nombre = nombre
+        self.direccion = direccion
+        self.error = error
+        self.estado = None
+
+    @property
+    def valida(self):
+        return self.error is None
+
+
+def validar_direccion(direccion):
+    """Retorna None si 'host[:puerto]' tiene formato válido o el motivo si no."""
+    host, puerto = separar_direccion(direccion)
+    if puerto is not None and not 0 < puerto < 65536:
+        return "Puerto inválido"
+    if not host or not (es_ip(host) or PATRON_HOST.match(host)):
+        return "Dirección inválida"
+    return None
+
+
+def nombre_desde_direccion(direccion):
+    """Nombre por defecto para una dirección sin nombre.
+
+    'play.horusmc.net' -> 'Horusmc'; los subdominios propios se conservan: 'bg3.minelatino.com' -> 'Minelatino Bg3'.
+    """
+    host, _ = separar_direccion(direccion)
+    if es_ip(host):
+        return host
+    partes = [parte for parte in host.lower().split('.') if parte not in ("play", "mc", "www")]
+    if len(partes) < 2:
+        return (partes[0] if partes else host).capitalize()
+    return " ".join(parte.capitalize() for parte in [partes[-2]] + partes[:-2])
+
+
+def _desde_json(datos):
+    """Retorna [(nombre, dirección)] de un JSON {nombre: ip}, {"servidores": {...}} o una lista."""
+    if isinstance(datos, dict):
+        datos = datos.get("servidores", datos)
+    if isinstance(datos, dict):
+        return [(str(nombre), str(ip)) for nombre, ip in datos.items()]
+    if not isinstance(datos, list):
+        raise ValueError("El JSON debe ser un objeto {nombre: ip} o una lista")
+
+    pares = []
+    for elemento in datos:
+        if isinstance(elemento, str):
+            pares.append((None, elemento))
+        elif isinstance(elemento, dict):
+            direccion = elemento.get("ip") or elemento.get("direccion") or elemento.get("address")
+            pares.append((elemento.get("nombre") or elemento.get("name"), direccion))
+        elif isinstance(elemento, list) and len(elemento) >= 2:
+            pares.append((str(elemento[0]), str(elemento[1])))
+    return pares
+
+
+def _desde_texto(texto):
+    """Retorna [(nombre, dirección)] de un CSV o de líneas 'Nombre  ip'."""
+    lineas = [linea for linea in texto.splitlines() if linea.strip() and not linea.lstrip().startswith('#')]
+    try:
+        dialecto = csv.Sniffer().sniff("\n".join(lineas[:20]), delimiters=",;\t=|")
+        filas = csv.reader(lineas, dialecto)
+    except csv.Error:
+        # Sin separador: la última palabra es la dirección y el resto el nombre
+        filas = ([" ".join(linea.split()[:-1]), linea.split()[-1]] for linea in lineas)
+
+    pares = []
+    for fila in filas:
+        campos = [campo.strip() for campo in fila if campo.strip()]
+        if not campos or campos[0].lower() in ENCABEZADOS:
+            continue
+        if len(campos) == 1:
+            pares.append((None, campos[0]))
+        else:
+            pares.append((campos[0], campos[1]))
+    return pares
+
+
+def interpretar_lista(texto, servidores_actuales=None):
+    """Lee una lista pegada o de archivo. Retorna [EntradaImportada] con los errores de formato marcados."""
+    texto = texto.strip().lstrip('﻿')
+    if not texto:
+        return []
+    if texto[0] in "[{":
+        pares = _desde_json(json.loads(texto))
+    else:
+        pares = _desde_texto(texto)
+
+    actuales = servidores_actuales or {}
+    direcciones_actuales = {ip.lower() for ip in actuales.values()}
+    nombres = set()
+    direcciones = set()
+    entradas = []
+    for nombre, direccion in pares:
+        direccion = (direccion or "").strip()
+        nombre = (nombre or "").strip()
+        if not nombre:
+            # Los nombres generados no se rechazan por repetidos: se numeran
+            base = nombre = nombre_desde_direccion(direccion)
+            numero = 2
+            while nombre in actuales or nombre in nombres:
+                nombre = f"{base} {numero}"
+                numero += 1
+        error = validar_direccion(direccion)
+        if error is None:
+            if nombre in actuales or nombre in nombres:
+                error = "Nombre repetido"
+            elif direccion.lower() in direcciones_actuales or direccion.lower() in direcciones:
+                error = "Ya está en la lista"
+        nombres.add(nombre)
+        direcciones.add(direccion.lower())
+        entradas.append(EntradaImportada(nombre, direccion, error))
+    return entradas
+
+
+async def validar_entradas(entradas, resolucion, max_concurrentes=20, timeout=3):
+    """Resuelve y verifica el estado de las entradas válidas, todas a la vez con un límite de concurrencia.
+
+    Cada entrada queda con su estado (mismo formato que el monitor) o con el error de DNS.
+    """
+    semaforo = asyncio.Semaphore(max_concurrentes)
+
+    async def validar(entrada):
+        async with semaforo:
+            monitor = MonitorServidor(entrada.direccion, timeout=timeout)
+            entrada.estado = await monitor.verificar_async(resolucion)
+
+    await asyncio.gather(*(validar(entrada) for entrada in entradas if entrada.valida))
+    return entradas
+
+
+def exportar_lista(servidores, formato):
+    """Convierte {nombre: ip} al formato indicado ('texto', 'csv' o 'json')."""
+    if formato == "json":
+        return json.dumps({"servidores": servidores}, indent=4, ensure_ascii=False) + "\n"
+    if formato == "csv":
+        salida = io.StringIO()
+        escritor = csv.writer(salida, lineterminator="\n")
+        escritor.writerow(["nombre", "ip"])
+        escritor.writerows(servidores.items())
+        return salida.getvalue()
+    if formato == "texto":
+        return "".join(f"{nombre} = {ip}\n" for nombre, ip in servidores.items())
+    raise ValueError(f"Formato desconocido: {formato}")
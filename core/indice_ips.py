@@ -0,0 +1,255 @@
+"""
+Índice de IPs por cuenta a partir de logs del servidor
+Detecta multicuentas y evasiones de ban por IP compartida
+"""
+
+import json
+import os
+import re
+import sys
+import zlib
+from datetime import timedelta
+
+from core.filtro_logs import abrir_log, fecha_de_archivo, listar_logs, RelojLogs
+
+
+PATRON_HORA = re.compile(r'^\[(\d{2}:\d{2}:\d{2})')
+
+IP = r'/(\[[0-9a-fA-F:.]+\]|[0-9.]+):\d+'
+
+PATRONES_LOGIN = [
+    # Vanilla / Spigot / Paper: Nick[/1.2.3.4:5678] logged in with entity id ...
+    re.compile(r'([A-Za-z0-9_]{2,16})\[' + IP + r'\] logged in'),
+    # BungeeCord: [Nick,/1.2.3.4:5678] <-> ServerConnector [lobby] has connected
+    re.compile(r'\[([A-Za-z0-9_]{2,16}),\s*' + IP + r'\] <->'),
+    # Velocity: [connected player] Nick (/1.2.3.4:5678) has connected
+    re.compile(r'\[connected player\] ([A-Za-z0-9_]{2,16}) \(' + IP + r'\)'),
+]
+
+MARCAS_LOGIN = ("logged in", "<->", "[connected player]")
+
+
+def extraer_login(linea):
+    """Extrae (nick, ip) de una línea de login o None."""
+    if not any(marca in linea for marca in MARCAS_LOGIN):
+        return None
+    for patron in PATRONES_LOGIN:
+        match = patron.search(linea)
+        if match:
+            return match.group(1), match.group(2).strip("[]")
+    return None
+
+
+class IndiceIPs:
+    """Índice persistente IP -> nicks y nick -> IPs con primera y última vez visto.
+
+    Ambos índices usan el nick en minúsculas (casefold); `nombres` guarda cómo se escribe para mostrarlo.
+    """
+
+    def __init__(self, archivo_indice=None):
+        if archivo_indice is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            archivo_indice = os.path.join(app_dir, "core", "indice_ips.json")
+
+        self.archivo_indice = archivo_indice
+        self.ips = {}
+        self.ips_por_nick = {}
+        self.nombres = {}
+        self.archivos = {}
+        self.cargar()
+
+    def cargar(self):
+        """Carga el índice desde disco y reconstruye el índice inverso."""
+        try:
+            if os.path.exists(self.archivo_indice):
+                with open(self.archivo_indice, 'r', encoding='utf-8') as f:
+                    datos = json.load(f)
+                self.archivos = datos.get("archivos", {})
+                for ip, nicks in datos.get("ips", {}).items():
+                    for nick, (primera, ultima) in nicks.items():
+                        self.registrar(nick, ip, primera, ultima)
+        except Exception as e:
+            print(f"Error al cargar índice de IPs: {e}")
+
+    def guardar(self):
+        """Guarda el índice en disco."""
+        try:
+            os.makedirs(os.path.dirname(self.archivo_indice), exist_ok=True)
+            temporal = self.archivo_indice + ".tmp"
+            with open(temporal, 'w', encoding='utf-8') as f:
+                ips = {
+                    ip: {self.nombres[clave]: visto for clave, visto in nicks.items()}
+                    for ip, nicks in self.ips.items()
+                }
+                json.dump({"ips": ips, "archivos": self.archivos}, f, ensure_ascii=False)
+            os.replace(temporal, self.archivo_indice)
+            return True
+        except Exception as e:
+            print(f"Error al guardar índice de IPs: {e}")
+            return False
+
+    def registrar(self, nick, ip, primera, ultima=None):
+        """Registra un login actualizando ambos índices en O(1)."""
+        ultima = ultima or primera
+        clave = nick.casefold()
+        self.nombres[clave] = nick
+
+        nicks = self.ips.setdefault(ip, {})
+        visto = nicks.get(clave)
+        if visto is None:
+            visto = nicks[clave] = [primera, ultima]
+        else:
+            visto[0] = min(visto[0], primera)
+            visto[1] = max(visto[1], ultima)
+        # Ambos índices comparten la misma lista [primera, ultima]
+        self.ips_por_nick.setdefault(clave, {})[ip] = visto
+
+    def ingerir_archivo(self, ruta):
+        """Procesa solo la parte nueva de un log. Retorna la cantidad de logins leídos."""
+        info = os.stat(ruta)
+        previo = self.archivos.get(ruta, {})
+
+        if ruta.endswith('.gz'):
+            # Los rotados no cambian: se procesan una sola vez
+            if previo.get("tamano") == info.st_size:
+                return 0
+            inicio = 0
+        else:
+            inicio = previo.get("offset", 0)
+            if info.st_size < inicio or previo.get("huella") != self._huella(ruta, previo.get("huella")):
+                inicio = 0  # latest.log fue rotado o truncado
+            if info.st_size == inicio:
+                return 0
+
+        reloj = RelojLogs()
+        eventos = []
+
+        if ruta.endswith('.gz'):
+            with abrir_log(ruta) as f:
+                for linea in f:
+                    self._leer_linea(linea, reloj, eventos)
+            fin = info.st_size
+        else:
+            with open(ruta, 'rb') as f:
+                f.seek(inicio)
+                datos = f.read()
+            # Solo se consumen líneas completas; el resto se lee en la próxima ingesta
+            corte = datos.rfind(b"\n") + 1
+            fin = inicio + corte
+            for linea in datos[:corte].decode('utf-8', errors='ignore').splitlines():
+                self._leer_linea(linea, reloj, eventos)
+
+        # La fecha del archivo corresponde al primer día salvo en latest.log,
+        # cuya fecha de modificación corresponde al último día leído
+        base = fecha_de_archivo(ruta)
+        if not ruta.endswith('.gz') and "latest" in os.path.basename(ruta):
+            base -= timedelta(days=reloj.dia)
+
+        for dia, hora, nick, ip in eventos:
+            momento = f"{base + timedelta(days=dia)} {hora}"
+            self.registrar(nick, ip, momento)
+
+        self.archivos[ruta] = {"tamano": info.st_size, "offset": fin, "huella": self._huella(ruta)}
+        return len(eventos)
+
+    def _huella(self, ruta, previa=None):
+        """Retorna [bytes, crc32] del comienzo del archivo para detectar si fue reemplazado."""
+        largo = previa[0] if previa else 256
+        with open(ruta, 'rb') as f:
+            inicio = f.read(largo)
+        return [len(inicio), zlib.crc32(inicio)]
+
+    def _leer_linea(self, linea, reloj, eventos):
+        """Agrega a eventos el login de la línea, si lo hay."""
+        login = extraer_login(linea)
+        if not login:
+            return
+        match = PATRON_HORA.match(linea)
+        if not match:
+            return
+        reloj.segundos(match.group(1))
+        eventos.append((reloj.dia, match.group(1), login[0], login[1]))
+
+    def ingerir(self, rutas):
+        """Ingiere archivos y/o carpetas de logs y guarda el índice."""
+        total = 0
+        for ruta in rutas:
+            archivos = listar_logs(ruta) if os.path.isdir(ruta) else [ruta]
+            for archivo in archivos:
+                total += self.ingerir_archivo(archivo)
+        self.guardar()
+        return total
+
+    def ips_de(self, nick):
+        """Retorna {ip: [primera, ultima]} de un nick."""
+        return self.ips_por_nick.get(nick.casefold(), {})
+
+    def nicks_de(self, ip):
+        """Retorna {nick: [primera, ultima]} de una IP."""
+        return {self.nombres[clave]: visto for clave, visto in self.ips.get(ip, {}).items()}
+
+    def _compartidas(self, clave):
+        """Retorna {clave de otra cuenta: [ips que comparte con la cuenta `clave`]}."""
+        cuentas = {}
+        for ip in self.ips_por_nick.get(clave, {}):
+            for otra in self.ips[ip]:
+                if otra != clave:
+                    cuentas.setdefault(otra, []).append(ip)
+        return cuentas
+
+    def alts_de(self, nick):
+        """Retorna {alt: [ips compartidas con el nick]} de las cuentas que usaron alguna IP del nick."""
+        return {self.nombres[clave]: sorted(ips) for clave, ips in self._compartidas(nick.casefold()).items()}
+
+    def alts_encadenados(self, nick, max_cuentas=200):
+        """Retorna {alt: (cuenta, [ips])} de las cuentas que solo se conectan al nick por una cadena de IPs.
+
+        Las IPs no son del nick sino las que el alt comparte con `cuenta`, la anterior en la cadena. Una IP pública
+        o compartida puede encadenar cuentas sin relación: son solo indicios.
+        """
+        origen = nick.casefold()
+        directos = self._compartidas(origen)
+        visitados = {origen, *directos}
+        pendientes = list(directos)
+        encadenados = {}
+
+        while pendientes and len(encadenados) < max_cuentas:
+            actual = pendientes.pop(0)
+            for clave, ips in self._compartidas(actual).items():
+                if clave in visitados:
+                    continue
+                visitados.add(clave)
+                pendientes.append(clave)
+                encadenados[self.nombres[clave]] = (self.nombres[actual], sorted(ips))
+
+        return encadenados
+
+    def guardar_reporte(self, archivo_salida, nicks):
+        """Guarda un reporte de IPs y cuentas relacionadas para los nicks dados."""
+        with open(archivo_salida, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("CUENTAS RELACIONADAS POR IP\n")
+            f.write("="*80 + "\n")
+
+            for nick in nicks:
+                f.write(f"\n{nick}:\n")
+                ips = self.ips_de(nick)
+                if not ips:
+                    f.write("  (sin logins registrados)\n")
+                    continue
+                for ip, (primera, ultima) in sorted(ips.items(), key=lambda item: item[1][1], reverse=True):
+                    f.write(f"  • {ip}  (primera vez: {primera} | última: {ultima})\n")
+                    for otro, (primera_otro, ultima_otro) in self.nicks_de(ip).items():
+                        if otro.casefold() != nick.casefold():
+                            f.write(f"      ↳ {otro}  ({primera_otro} - {ultima_otro})\n")
+
+                alts = self.alts_de(nick)
+                f.write(f"  Alts posibles ({len(alts)}): {', '.join(sorted(alts)) or '-'}\n")
+                encadenados = self.alts_encadenados(nick)
+                if encadenados:
+                    f.write(f"  Encadenados por otras cuentas ({len(encadenados)}, solo indicios):\n")
+                    for alt, (cuenta, ips) in sorted(encadenados.items()):
+                        f.write(f"      ↳ {alt}  (vía {cuenta}: {', '.join(ips)})\n")
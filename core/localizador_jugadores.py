@@ -0,0 +1,180 @@
+"""
+Localizador de jugadores entre servidores
+Junta las muestras del estado y, donde está habilitado, la lista completa del protocolo Query (UDP)
+"""
+
+import asyncio
+import random
+import re
+import struct
+import time
+
+from core.protocolo_minecraft import consultar_estado
+from core.resolucion_dns import ErrorResolucion, separar_direccion
+
+
+PATRON_NICK = re.compile(r'^[A-Za-z0-9_]{2,16}$')
+SEPARADOR_JUGADORES = b"\x00\x00\x01player_\x00\x00"
+
+
+class ErrorQuery(OSError):
+    """El servidor no respondió al protocolo Query o la respuesta es inválida."""
+
+
+class _ProtocoloQuery(asyncio.DatagramProtocol):
+    """Recibe las respuestas UDP de una consulta Query."""
+
+    def __init__(self):
+        self.respuestas = asyncio.Queue()
+
+    def datagram_received(self, datos, direccion):
+        self.respuestas.put_nowait(datos)
+
+    def error_received(self, error):
+        self.respuestas.put_nowait(error)
+
+
+async def _recibir(protocolo, sesion, tipo, timeout):
+    """Espera la respuesta del tipo y la sesión indicados."""
+    while True:
+        datos = await asyncio.wait_for(protocolo.respuestas.get(), timeout)
+        if isinstance(datos, Exception):
+            raise ErrorQuery(str(datos))
+        if len(datos) >= 5 and datos[0] == tipo and datos[1:5] == sesion:
+            return datos[5:]
+
+
+def interpretar_query(datos):
+    """Extrae (valores, jugadores) de la respuesta 'full stat'."""
+    if not datos.startswith(b"splitnum\x00"):
+        raise ErrorQuery("Respuesta Query inválida")
+    datos = datos[11:]
+    valores_bytes, _, jugadores_bytes = datos.partition(SEPARADOR_JUGADORES)
+    campos = valores_bytes.split(b"\x00")
+    valores = {}
+    for indice in range(0, len(campos) - 1, 2):
+        if not campos[indice]:
+            break
+        valores[campos[indice].decode('utf-8', 'replace')] = campos[indice + 1].decode('utf-8', 'replace')
+    jugadores = [nombre.decode('utf-8', 'replace') for nombre in jugadores_bytes.split(b"\x00") if nombre]
+    return valores, jugadores
+
+
+async def consultar_query(ip, puerto, timeout=2):
+    """Consulta la lista completa de jugadores por el protocolo Query (enable-query=true)."""
+    loop = asyncio.get_running_loop()
+    transporte, protocolo = await loop.create_datagram_endpoint(_ProtocoloQuery, remote_addr=(ip, puerto))
+    try:
+        sesion = struct.pack('>i', random.getrandbits(32) & 0x0F0F0F0F)
+        transporte.sendto(b"\xFE\xFD\x09" + sesion)
+        datos = await _recibir(protocolo, sesion, 0x09, timeout)
+        try:
+            token = int(datos.rstrip(b"\x00"))
+        except ValueError:
+            raise ErrorQuery("Token Query inválido")
+
+        transporte.sendto(b"\xFE\xFD\x00" + sesion + struct.pack('>i', token) + b"\x00\x00\x00\x00")
+        return interpretar_query(await _recibir(protocolo, sesion, 0x00, timeout))
+    except asyncio.TimeoutError:
+        raise ErrorQuery("El servidor no respondió al Query")
+    finally:
+        transporte.close()
+
+
+class LocalizadorJugadores:
+    """Índice nick -> servidores armado con muestras del estado y listas del Query."""
+
+    def __init__(self, servicio, ttl=30, timeout=2):
+        self.servicio = servicio
+        self.ttl = ttl
+        self.timeout = timeout
+        self.indice = {}
+        self.jugadores = {}
+        self.fuentes = {}
+        self.actualizado = 0
+        self._pendiente = None
+
+    def puerto_query(self, nombre):
+        """Retorna el puerto Query de un servidor o None si no está habilitado."""
+        configuracion = self.servicio.config.get("query", {}).get(nombre)
+        if configuracion is None or configuracion is False:
+            return None
+        if configuracion is True:
+            monitor = self.servicio.monitores.get(nombre)
+            return monitor.puerto if monitor and monitor.puerto else 25565
+        return int(configuracion)
+
+    async def _jugadores_de(self, nombre, ip):
+        """Retorna (fuente, [nicks]) de un servidor."""
+        host, puerto = separar_direccion(ip)
+        resolucion = self.servicio.motor.resolucion
+        try:
+            puerto_query = self.puerto_query(nombre)
+            if puerto_query:
+                destino, _ = await resolucion.resolver(host, puerto)
+                try:
+                    _, jugadores = await consultar_query(destino, puerto_query, self.timeout)
+                    return "query", jugadores
+                except (ErrorQuery, OSError):
+                    pass  # Se usa la muestra del estado
+
+            # La muestra del último estado del monitor evita verificar de nuevo
+            estado = self.servicio.estado(nombre)
+            if estado is not None and not estado["online"]:
+                return "error", []
+            if estado is not None and "muestra" in estado:
+                return "muestra", estado["muestra"]
+            destino, puerto_final = await resolucion.resolver(host, puerto)
+            respuesta = await consultar_estado(destino, puerto_final, host, self.timeout)
+            return "muestra", respuesta["muestra"]
+        except (OSError, asyncio.TimeoutError, ErrorResolucion):
+            return "error", []
+
+    async def actualizar(self):
+        """Consulta todos los servidores a la vez y reconstruye el índice."""
+        servidores = dict(self.servicio.servidores)
+        resultados = await asyncio.gather(
+            *(self._jugadores_de(nombre, ip) for nombre, ip in servidores.items())
+        )
+
+        indice = {}
+        jugadores = {}
+        fuentes = {}
+        for nombre, (fuente, nicks) in zip(servidores, resultados):
+            validos = [nick for nick in nicks if PATRON_NICK.match(nick)]
+            jugadores[nombre] = validos
+            fuentes[nombre] = fuente
+            for nick in validos:
+                indice.setdefault(nick.lower(), {})[nombre] = nick
+
+        # Se reemplaza todo junto: las búsquedas nunca ven un índice a medio armar
+        self.indice, self.jugadores, self.fuentes = indice, jugadores, fuentes
+        self.actualizado = time.monotonic()
+
+    async def asegurar_vigente(self):
+        """Actualiza el índice si venció el TTL (compartiendo una actualización en curso)."""
+        if time.monotonic() - self.actualizado < self.ttl:
+            return
+        if self._pendiente is None or self._pendiente.done():
+            self._pendiente = asyncio.ensure_future(self.actualizar())
+        await asyncio.shield(self._pendiente)
+
+    def buscar(self, nick):
+        """Retorna {servidor: nick} donde está el jugador según el índice actual (instantáneo)."""
+        return dict(self.indice.get(nick.lower(), {}))
+
+    def buscar_parcial(self, texto, limite=20):
+        """Retorna [(nick, servidor)] cuyos nicks contienen el texto."""
+        texto = texto.lower()
+        encontrados = []
+        for clave, servidores in self.indice.items():
+            if texto in clave:
+                encontrados.extend((nick, servidor) for servidor, nick in servidores.items())
+                if len(encontrados) >= limite:
+                    break
+        return sorted(encontrados)[:limite]
+
+    async def localizar(self, nick):
+        """Busca un jugador refrescando antes el índice si está vencido."""
+        await self.asegurar_vigente()
+        return self.buscar(nick)
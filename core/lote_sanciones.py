@@ -0,0 +1,137 @@
+"""
+Sanciones en lote a partir de una lista de nicks o un CSV (nick, tipo, motivo, tiempo, modalidad)
+Genera y valida todos los comandos en una sola pasada con las reglas de sanción
+"""
+
+import csv
+
+from core.reglas_sanciones import ErrorSancion
+
+
+COLUMNAS = ("nick", "tipo", "motivo", "tiempo", "modalidad")
+ENCABEZADOS = {
+    "nick": "nick", "jugador": "nick", "player": "nick", "nombre": "nick",
+    "tipo": "tipo", "sancion": "tipo", "sanción": "tipo", "type": "tipo",
+    "motivo": "motivo", "razon": "motivo", "razón": "motivo", "reason": "motivo",
+    "tiempo": "tiempo", "duracion": "tiempo", "duración": "tiempo", "time": "tiempo",
+    "modalidad": "modalidad", "servidor": "modalidad", "server": "modalidad",
+}
+SEPARADORES = ",;\t"
+
+
+class EntradaLote:
+    """Fila del lote con su comando generado o el motivo por el que no se pudo generar."""
+
+    __slots__ = ("linea", "nick", "tipo", "motivo", "tiempo", "modalidad", "anteriores", "comando", "error")
+
+    def __init__(self, linea, nick):
+        self.linea = linea
+        self.nick = nick
+        self.tipo = self.motivo = self.tiempo = self.modalidad = None
+        self.anteriores = 0
+        self.comando = None
+        self.error = None
+
+    @property
+    def valida(self):
+        return self.error is None
+
+    def datos(self):
+        """Retorna (nick, tipo, motivo, tiempo, modalidad, comando) para el registro de sanciones."""
+        return self.nick, self.tipo, self.motivo, self.tiempo, self.modalidad, self.comando
+
+
+def leer_filas(texto):
+    """Retorna [(número de línea, {columna: valor})] de una lista de nicks o de un CSV.
+
+    Sin separadores cada palabra es un nick. Con separadores las columnas van en el orden de COLUMNAS,
+    salvo que la primera fila sea un encabezado.
+    """
+    lineas = [(numero, linea) for numero, linea in enumerate(texto.lstrip('﻿').splitlines(), 1)
+              if linea.strip() and not linea.lstrip().startswith('#')]
+    if not any(separador in linea for _, linea in lineas for separador in SEPARADORES):
+        return [(numero, {"nick": nick}) for numero, linea in lineas for nick in linea.split()]
+
+    try:
+        dialecto = csv.Sniffer().sniff("\n".join(linea for _, linea in lineas[:20]), delimiters=SEPARADORES)
+    except csv.Error:
+        dialecto = csv.excel
+    columnas = COLUMNAS
+    filas = []
+    for indice, (numero, linea) in enumerate(lineas):
+        campos = [campo.strip() for campo in next(csv.reader([linea], dialecto), [])]
+        if indice == 0 and campos and all(campo.casefold() in ENCABEZADOS for campo in campos if campo):
+            columnas = [ENCABEZADOS.get(campo.casefold()) for campo in campos]
+            continue
+        filas.append((numero, {columna: campo for columna, campo in zip(columnas, campos) if columna and campo}))
+    return filas
+
+
+def _generar(entrada, campos, reglas, por_defecto, registro, excluir):
+    """Completa la entrada y arma su comando. Lanza ErrorSancion con el primer problema encontrado."""
+    tipo = campos.get("tipo") or por_defecto.get("tipo") or ""
+    sancion = reglas.sancion(tipo)
+    if sancion is None:
+        raise ErrorSancion(f"Tipo de sanción desconocido: '{tipo}'" if tipo else "Falta el tipo de sanción")
+    entrada.tipo = sancion.nombre
+
+    motivo = sancion.motivo_oficial(campos.get("motivo") or por_defecto.get("motivo") or "")
+    if not motivo:
+        raise ErrorSancion("Falta el motivo")
+    entrada.motivo = motivo
+
+    if sancion.requiere_tiempo:
+        tiempo = campos.get("tiempo") or por_defecto.get("tiempo")
+        if not tiempo:
+            # Sin tiempo indicado: el del motivo, escalado según las sanciones anteriores del jugador
+            tiempo = reglas.tiempo_para(motivo) or sancion.tiempo_default
+            if registro is not None:
+                entrada.anteriores = registro.anteriores(entrada.nick, motivo, reglas.escalado["ventana_dias"], excluir)
+                tiempo = reglas.escalar(tiempo, entrada.anteriores)
+        entrada.tiempo = tiempo
+
+    # La modalidad escrita en la fila se respeta siempre: descartarla volvería global la sanción.
+    # La por defecto solo se usa cuando el motivo la requiere.
+    modalidad = campos.get("modalidad")
+    if sancion.requiere_modalidad_para(motivo):
+        modalidad = modalidad or por_defecto.get("modalidad")
+        if not modalidad:
+            raise ErrorSancion("Falta la modalidad")
+    if modalidad:
+        entrada.modalidad = reglas.modalidad_valida(modalidad)
+        if entrada.modalidad is None:
+            raise ErrorSancion(f"Modalidad desconocida: '{modalidad}'")
+
+    entrada.comando = sancion.generar(entrada.nick, motivo, entrada.tiempo, entrada.modalidad)
+
+
+def generar_lote(filas, reglas, por_defecto=None, registro=None, excluir=()):
+    """Genera y valida todos los comandos en una pasada. Retorna [EntradaLote].
+
+    `por_defecto` completa las columnas vacías (tipo, motivo, tiempo, modalidad). Con `registro`, el tiempo
+    que no se indicó se escala según las sanciones anteriores de cada jugador, sin contar los ids de `excluir`.
+    """
+    por_defecto = por_defecto or {}
+    vistos = set()
+    entradas = []
+    for linea, campos in filas:
+        entrada = EntradaLote(linea, campos.get("nick", "").strip())
+        entradas.append(entrada)
+        clave = entrada.nick.casefold()
+        # Los nicks vacíos no se comparan: cada uno falla por su cuenta al validar
+        if clave and clave in vistos:
+            entrada.error = "Nick repetido en el lote"
+            continue
+        try:
+            _generar(entrada, campos, reglas, por_defecto, registro, excluir)
+        except ErrorSancion as e:
+            entrada.error = str(e)
+            continue
+        # Solo cuenta la fila válida: una inválida no bloquea a otra correcta del mismo nick
+        vistos.add(clave)
+    return entradas
+
+
+def script_lote(entradas):
+    """Bloque con un comando por línea de las entradas válidas."""
+    return "".join(f"{entrada.comando}\n" for entrada in entradas if entrada.valida)
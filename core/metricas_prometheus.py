@@ -0,0 +1,153 @@
+"""
+Endpoint /metrics en formato de texto de Prometheus
+Servidor HTTP mínimo sobre asyncio que corre en el mismo loop del motor de monitoreo
+"""
+
+import asyncio
+import time
+
+from core.monitor_servidor import EstadoSonda
+
+
+TIPO_CONTENIDO = "text/plain; version=0.0.4; charset=utf-8"
+
+METRICAS = [
+    ("mc_server_up", "gauge", "1 si el servidor acepta conexiones"),
+    ("mc_server_latency_milliseconds", "gauge", "Latencia de la última verificación"),
+    ("mc_server_players_online", "gauge", "Jugadores conectados"),
+    ("mc_server_players_max", "gauge", "Máximo de jugadores"),
+    ("mc_server_probe_duration_seconds", "gauge", "Duración de la última verificación"),
+    ("mc_server_last_probe_timestamp_seconds", "gauge", "Momento de la última verificación"),
+    ("mc_server_state", "gauge", "Estado de la última verificación (1 en el estado actual)"),
+    ("mc_server_tps", "gauge", "TPS medidos por RCON"),
+    ("mc_server_mspt_milliseconds", "gauge", "Milisegundos por tick medidos por RCON"),
+    ("mc_server_memory_used_megabytes", "gauge", "Memoria usada medida por RCON"),
+]
+
+METRICAS_RENDIMIENTO = {
+    "tps": "mc_server_tps",
+    "mspt": "mc_server_mspt_milliseconds",
+    "memoria": "mc_server_memory_used_megabytes",
+}
+
+
+def escapar(valor):
+    """Escapa el valor de una etiqueta."""
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def etiquetas(**valores):
+    """Arma el bloque {clave="valor",...}."""
+    return "{" + ",".join(f'{clave}="{escapar(valor)}"' for clave, valor in valores.items()) + "}"
+
+
+class ServidorMetricas:
+    """Expone el estado del servicio de monitoreo en /metrics."""
+
+    def __init__(self, servicio, host="127.0.0.1", puerto=9465):
+        self.servicio = servicio
+        self.host = host
+        self.puerto = puerto
+        self.momentos = {}
+        self.servidor = None
+        self.solicitudes = 0
+
+    def registrar(self, nombre, estado):
+        """Suscriptor del servicio: guarda el momento de cada verificación."""
+        self.momentos[nombre] = time.time()
+
+    async def iniciar(self):
+        """Abre el puerto HTTP (debe llamarse dentro del loop del motor)."""
+        self.servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+
+    async def detener(self):
+        """Cierra el puerto HTTP."""
+        if self.servidor:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+
+    def generar(self):
+        """Genera el texto de las métricas."""
+        lineas = {nombre: [f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}"] for nombre, tipo, ayuda in METRICAS}
+
+        for nombre, ip in list(self.servicio.servidores.items()):
+            estado = self.servicio.estado(nombre)
+            if estado is None:
+                continue
+            base = etiquetas(server=nombre, address=ip)
+            lineas["mc_server_up"].append(f"mc_server_up{base} {1 if estado['online'] else 0}")
+            if estado["latencia"] is not None:
+                lineas["mc_server_latency_milliseconds"].append(f"mc_server_latency_milliseconds{base} {estado['latencia']}")
+            if estado.get("conectados") is not None:
+                lineas["mc_server_players_online"].append(f"mc_server_players_online{base} {estado['conectados']}")
+                lineas["mc_server_players_max"].append(f"mc_server_players_max{base} {estado['maximo']}")
+            if estado.get("duracion") is not None:
+                lineas["mc_server_probe_duration_seconds"].append(
+                    f"mc_server_probe_duration_seconds{base} {estado['duracion']:.4f}"
+                )
+            if nombre in self.momentos:
+                lineas["mc_server_last_probe_timestamp_seconds"].append(
+                    f"mc_server_last_probe_timestamp_seconds{base} {self.momentos[nombre]:.0f}"
+                )
+            rendimiento = self.servicio.rendimiento.ultimos.get(nombre, {})
+            for clave, metrica in METRICAS_RENDIMIENTO.items():
+                valor = rendimiento.get(clave)
+                if valor is not None:
+                    lineas[metrica].append(f"{metrica}{base} {valor:g}")
+            for tipo in EstadoSonda:
+                valor = 1 if estado["tipo"] is tipo else 0
+                lineas["mc_server_state"].append(
+                    f"mc_server_state{etiquetas(server=nombre, address=ip, state=tipo.name.lower())} {valor}"
+                )
+
+        motor = self.servicio.motor
+        generales = [
+            ("mc_monitor_targets", "gauge", "Servidores monitoreados", len(self.servicio.servidores)),
+            ("mc_monitor_probes_in_flight", "gauge", "Verificaciones en curso", len(motor.planificador.en_curso)),
+            ("mc_monitor_skipped_checks_total", "counter", "Verificaciones omitidas por seguir en curso la anterior",
+             motor.planificador.omitidas),
+            ("mc_monitor_stale_results_total", "counter", "Resultados descartados por llegar fuera de orden",
+             motor.planificador.obsoletas),
+            ("mc_monitor_dns_queries_total", "counter", "Consultas DNS realizadas", motor.resolucion.consultas),
+            ("mc_monitor_dns_cache_hits_total", "counter", "Resoluciones servidas desde la caché",
+             motor.resolucion.aciertos),
+        ]
+
+        salida = []
+        for bloque in lineas.values():
+            if len(bloque) > 2:
+                salida.extend(bloque)
+        for nombre, tipo, ayuda, valor in generales:
+            salida.extend([f"# HELP {nombre} {ayuda}", f"# TYPE {nombre} {tipo}", f"{nombre} {valor}"])
+        return "\n".join(salida) + "\n"
+
+    async def _atender(self, reader, writer):
+        """Atiende una petición HTTP/1.x (solo GET /metrics)."""
+        try:
+            pedido = await asyncio.wait_for(reader.readline(), 5)
+            # Se descartan los encabezados
+            while True:
+                linea = await asyncio.wait_for(reader.readline(), 5)
+                if linea in (b"\r\n", b"\n", b""):
+                    break
+
+            partes = pedido.decode('latin-1').split()
+            if len(partes) >= 2 and partes[0] in ("GET", "HEAD") and partes[1].split('?')[0] == "/metrics":
+                self.solicitudes += 1
+                cuerpo = self.generar().encode('utf-8')
+                estado, tipo = "200 OK", TIPO_CONTENIDO
+            else:
+                cuerpo = b"Usar /metrics\n"
+                estado, tipo = "404 Not Found", "text/plain; charset=utf-8"
+
+            writer.write(
+                f"HTTP/1.1 {estado}\r\nContent-Type: {tipo}\r\n"
+                f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n".encode('latin-1')
+            )
+            if partes and partes[0] != "HEAD":
+                writer.write(cuerpo)
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError, UnicodeDecodeError):
+            pass
+        finally:
+            writer.close()
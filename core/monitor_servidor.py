@@ -3,145 +3,117 @@ Módulo de monitoreo de servidores Minecraft
 Verifica estado, ping y jugadores online
 """
 
-from mcstatus import JavaServer
+import asyncio
+import random
 import socket
-import subprocess
-import platform
+import threading
+import time
+from enum import Enum
+from core.agregados_uptime import AgregadosMonitor
+from core.historial_servidores import HistorialMonitor
+from core.protocolo_minecraft import consultar_estado, ErrorEstado
+from core.resolucion_dns import CacheResolucion, ErrorResolucion, separar_direccion
+
+
+class EstadoSonda(Enum):
+    """Resultado tipado de una verificación. El valor es el texto que muestra la UI."""
+    ONLINE = None
+    QUERY_OFF = "Query OFF"
+    SIN_RESPUESTA = "Sin respuesta"
+    PUERTO_CERRADO = "Puerto cerrado"
+    NO_ALCANZABLE = "No alcanzable"
+    DNS = "DNS no resuelve"
+    ERROR = "Error"
+
+
+# Código compacto de cada estado para el historial
+CODIGOS_ESTADO = {tipo: codigo for codigo, tipo in enumerate(EstadoSonda)}
+
+
+def clasificar_error(error):
+    """Traduce una excepción de la verificación a un EstadoSonda."""
+    if isinstance(error, ErrorEstado):
+        return EstadoSonda.QUERY_OFF
+    if isinstance(error, ErrorResolucion):
+        return EstadoSonda.DNS
+    if isinstance(error, (socket.timeout, asyncio.TimeoutError)):
+        return EstadoSonda.SIN_RESPUESTA
+    if isinstance(error, ConnectionRefusedError):
+        return EstadoSonda.PUERTO_CERRADO
+    if isinstance(error, OSError):
+        return EstadoSonda.NO_ALCANZABLE
+    return EstadoSonda.ERROR
 
 
 class MonitorServidor:
     """Clase para monitorear servidores de Minecraft."""
     
-    def __init__(self, ip, puerto=25565, timeout=3):
+    def __init__(self, ip, puerto=None, timeout=3):
         self.ip = ip
-        self.puerto = puerto
+        # Sin puerto explícito se respeta el registro SRV (y si no hay, 25565)
+        self.host, self.puerto = separar_direccion(ip, puerto)
         self.timeout = timeout
+        self._resolucion = None
         self.estado = {
             "online": False,
             "latencia": None,
             "jugadores": "0/0",
-            "error": None
+            "conectados": None,
+            "maximo": None,
+            "error": None,
+            "tipo": EstadoSonda.ERROR
         }
     
-    def ping_simple(self):
-        """Ping simple como fallback."""
-        try:
-            param = '-n' if platform.system().lower() == 'windows' else '-c'
-            command = ['ping', param, '1', '-w', '2000', self.ip]
-            startupinfo = None
-            creationflags = 0
-            if platform.system().lower() == 'windows':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
-            
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                timeout=3,
-                text=True,
-                startupinfo=startupinfo,
-                creationflags=creationflags
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout
-                if 'time=' in output or 'tiempo=' in output:
-                    try:
-                        if 'time=' in output:
-                            time_str = output.split('time=')[1].split('ms')[0].strip()
-                        else:
-                            time_str = output.split('tiempo=')[1].split('ms')[0].strip()
-                        ping_time = float(time_str)
-                        return True, ping_time
-                    except:
-                        return True, None
-                return True, None
-            return False, None
-        except:
-            return False, None
-    
     def verificar(self):
-        """Verifica el estado del servidor."""
+        """Verifica el estado del servidor (versión bloqueante)."""
+        return asyncio.run(self.verificar_async())
+    
+    async def verificar_async(self, resolucion=None):
+        """Verifica el estado del servidor sin bloquear el loop de asyncio."""
+        if resolucion is None:
+            if self._resolucion is None:
+                self._resolucion = CacheResolucion()
+            resolucion = self._resolucion
         try:
-            server = JavaServer.lookup(f"{self.ip}:{self.puerto}", timeout=self.timeout)
-            status = server.status()
+            # Se conecta directo a la dirección cacheada pero manda el hostname en el handshake
+            ip, puerto = await resolucion.resolver(self.host, self.puerto)
+            status = await consultar_estado(ip, puerto, self.host, self.timeout)
             
             self.estado = {
                 "online": True,
-                "latencia": round(status.latency, 1),
-                "jugadores": f"{status.players.online}/{status.players.max}",
-                "error": None
+                "latencia": round(status["latencia"], 1),
+                "jugadores": f"{status['online']}/{status['max']}",
+                "conectados": status["online"],
+                "maximo": status["max"],
+                "muestra": status["muestra"],
+                "error": None,
+                "tipo": EstadoSonda.ONLINE
             }
-            return self.estado
-            
-        except socket.timeout:
-            online, ping_time = self.ping_simple()
-            if online:
-                self.estado = {
-                    "online": True,
-                    "latencia": round(ping_time, 1) if ping_time else "?",
-                    "jugadores": "?/?",
-                    "error": "Query OFF"
-                }
-            else:
-                self.estado = {
-                    "online": False,
-                    "latencia": None,
-                    "jugadores": "0/0",
-                    "error": "Sin respuesta"
-                }
-                
-        except ConnectionRefusedError:
-            online, ping_time = self.ping_simple()
-            if online:
-                self.estado = {
-                    "online": True,
-                    "latencia": round(ping_time, 1) if ping_time else "?",
-                    "jugadores": "?/?",
-                    "error": "Query OFF"
-                }
-            else:
-                self.estado = {
-                    "online": False,
-                    "latencia": None,
-                    "jugadores": "0/0",
-                    "error": "Puerto cerrado"
-                }
-                
-        except OSError:
-            online, ping_time = self.ping_simple()
-            if online:
-                self.estado = {
-                    "online": True,
-                    "latencia": round(ping_time, 1) if ping_time else "?",
-                    "jugadores": "?/?",
-                    "error": "Query OFF"
-                }
-            else:
-                self.estado = {
-                    "online": False,
-                    "latencia": None,
-                    "jugadores": "0/0",
-                    "error": "No alcanzable"
-                }
-                
+        
         except Exception as e:
-            online, ping_time = self.ping_simple()
-            if online:
+            tipo = clasificar_error(e)
+            if tipo is EstadoSonda.QUERY_OFF:
+                # El puerto acepta conexiones pero no responde al estado: se usa la latencia del connect
                 self.estado = {
                     "online": True,
-                    "latencia": round(ping_time, 1) if ping_time else "?",
+                    "latencia": round(e.latencia_conexion, 1),
                     "jugadores": "?/?",
-                    "error": "Query OFF"
+                    "conectados": None,
+                    "maximo": None,
+                    "muestra": [],
+                    "error": tipo.value,
+                    "tipo": tipo
                 }
             else:
-                error_msg = str(e)[:20] if str(e) else type(e).__name__
                 self.estado = {
                     "online": False,
                     "latencia": None,
                     "jugadores": "0/0",
-                    "error": error_msg
+                    "conectados": None,
+                    "maximo": None,
+                    "muestra": [],
+                    "error": tipo.value if tipo is not EstadoSonda.ERROR else (str(e)[:20] or type(e).__name__),
+                    "tipo": tipo
                 }
         
         return self.estado
@@ -149,3 +121,270 @@ class MonitorServidor:
     def obtener_estado(self):
         """Retorna el último estado verificado."""
         return self.estado
+
+
+# Demora extra tolerada entre dos resultados (cola del semáforo, DNS) además del intervalo y el timeout
+MARGEN_HUECO = 30
+
+
+class PlanificadorVerificaciones:
+    """Decide cuándo verificar cada servidor, evita superposiciones y descarta resultados fuera de orden."""
+    
+    def __init__(self, intervalo_base=5, intervalo_rapido=2, verificaciones_rapidas=3,
+                 intervalo_maximo=300, jitter=0.2):
+        self.intervalo_base = intervalo_base
+        self.intervalo_rapido = intervalo_rapido
+        self.verificaciones_rapidas = verificaciones_rapidas
+        self.intervalo_maximo = intervalo_maximo
+        self.jitter = jitter
+        self.factor = 1
+        self.intervalos = {}
+        self.proximo = {}
+        self.fallos = {}
+        self.rapidas = {}
+        self.ultimo_online = {}
+        self.en_curso = set()
+        # Numeración única para todos los servidores: sigue creciendo aunque un servidor se quite y se vuelva a agregar
+        self.secuencia = 0
+        self.ultima_entregada = {}
+        self.omitidas = 0
+        self.obsoletas = 0
+    
+    def configurar(self, nombres, intervalos=None):
+        """Define los servidores planificados. Los nuevos quedan vencidos de inmediato."""
+        self.intervalos = dict(intervalos or {})
+        nombres = set(nombres)
+        for nombre in list(self.proximo):
+            if nombre not in nombres:
+                for tabla in (self.proximo, self.fallos, self.rapidas, self.ultimo_online, self.ultima_entregada):
+                    tabla.pop(nombre, None)
+                self.en_curso.discard(nombre)
+        for nombre in nombres:
+            self.proximo.setdefault(nombre, 0)
+    
+    def vencidos(self, ahora):
+        """Retorna los servidores que ya deben verificarse y no tienen una verificación en curso."""
+        return [
+            nombre for nombre, proximo in self.proximo.items()
+            if proximo <= ahora and nombre not in self.en_curso
+        ]
+    
+    def adelantar(self, nombres=None):
+        """Marca servidores (o todos) para verificarse en el próximo ciclo."""
+        for nombre in (self.proximo if nombres is None else nombres):
+            if nombre in self.proximo:
+                self.proximo[nombre] = 0
+    
+    def registrar_resultado(self, nombre, online, ahora):
+        """Calcula la próxima verificación según el resultado (backoff, cambios de estado)."""
+        if nombre not in self.proximo:
+            return
+        base = self.intervalos.get(nombre, self.intervalo_base) * self.factor
+        
+        if nombre in self.ultimo_online and self.ultimo_online[nombre] != online:
+            # Cambio de estado: se confirma rápido
+            self.rapidas[nombre] = self.verificaciones_rapidas
+        self.ultimo_online[nombre] = online
+        
+        if online:
+            self.fallos[nombre] = 0
+        else:
+            self.fallos[nombre] = self.fallos.get(nombre, 0) + 1
+        
+        if self.rapidas.get(nombre):
+            self.rapidas[nombre] -= 1
+            intervalo = min(self.intervalo_rapido, base)
+        elif not online:
+            # Backoff exponencial con jitter para servidores caídos
+            intervalo = min(base * 2 ** (self.fallos[nombre] - 1), max(self.intervalo_maximo, base))
+            intervalo *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        else:
+            intervalo = base
+        
+        self.proximo[nombre] = ahora + intervalo
+    
+    def hueco_maximo(self, nombre, timeout=0):
+        """Mayor separación esperable entre dos resultados del servidor (backoff máximo con jitter + timeout)."""
+        base = self.intervalos.get(nombre, self.intervalo_base) * self.factor
+        return max(self.intervalo_maximo, base) * (1 + self.jitter) + timeout + MARGEN_HUECO
+
+    def reservar(self, nombre):
+        """Retorna el número de secuencia de la nueva verificación o None si ya hay una en curso."""
+        if nombre in self.en_curso:
+            self.omitidas += 1
+            return None
+        self.en_curso.add(nombre)
+        self.secuencia += 1
+        return self.secuencia
+    
+    def liberar(self, nombre):
+        """Marca la verificación del servidor como terminada."""
+        self.en_curso.discard(nombre)
+    
+    def es_vigente(self, nombre, secuencia):
+        """Indica si el resultado es más nuevo que el último entregado."""
+        if secuencia <= self.ultima_entregada.get(nombre, 0):
+            self.obsoletas += 1
+            return False
+        self.ultima_entregada[nombre] = secuencia
+        return True
+
+
+class MotorMonitoreo:
+    """Ejecuta las verificaciones de todos los servidores en un único loop de asyncio."""
+    
+    def __init__(self, al_verificar, max_concurrentes=50, planificador=None, historial=None,
+                 intervalo_guardado=300, agregados=None):
+        # al_verificar(nombre, estado) se llama desde el hilo del motor
+        self.al_verificar = al_verificar
+        self.max_concurrentes = max_concurrentes
+        self.planificador = planificador or PlanificadorVerificaciones()
+        self.resolucion = CacheResolucion()
+        self.historial = historial or HistorialMonitor()
+        self.agregados = agregados or AgregadosMonitor()
+        self.intervalo_guardado = intervalo_guardado
+        self._historial_cargado = False
+        self.monitores = {}
+        self.loop = None
+        self.hilo = None
+        self.semaforo = None
+        self._listo = threading.Event()
+    
+    def iniciar(self):
+        """Arranca el loop de asyncio en un hilo de fondo."""
+        if self.hilo and self.hilo.is_alive():
+            return
+        self._listo.clear()
+        self.hilo = threading.Thread(target=self._ejecutar_loop, name="MotorMonitoreo", daemon=True)
+        self.hilo.start()
+        self._listo.wait()
+    
+    def _ejecutar_loop(self):
+        """Cuerpo del hilo del motor."""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.semaforo = asyncio.Semaphore(self.max_concurrentes)
+        self.loop.create_task(self._bucle())
+        if not self._historial_cargado:
+            # Antes de arrancar el loop: ninguna verificación escribe mientras se carga
+            self.historial.cargar()
+            self.agregados.cargar()
+            self._historial_cargado = True
+        # Recién ahora: quien espera en iniciar() ya encuentra el historial cargado
+        self._listo.set()
+        try:
+            self.loop.run_forever()
+        finally:
+            pendientes = asyncio.all_tasks(self.loop)
+            for tarea in pendientes:
+                tarea.cancel()
+            if pendientes:
+                self.loop.run_until_complete(asyncio.gather(*pendientes, return_exceptions=True))
+            # Se esperan las escrituras periódicas en curso: el guardado final nunca se pisa con ellas
+            self.loop.run_until_complete(self.loop.shutdown_default_executor())
+            self.historial.guardar()
+            self.agregados.guardar()
+            self.loop.close()
+    
+    def detener(self):
+        """Detiene el loop, cancela las verificaciones en curso y guarda el historial (en el hilo del motor)."""
+        if self.loop and self.hilo and self.hilo.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.hilo.join(timeout=5)
+        self.hilo = None
+    
+    def configurar(self, monitores, intervalos=None):
+        """Define los servidores {nombre: MonitorServidor} a monitorear y sus intervalos propios."""
+        if not self.loop or not self.hilo:
+            return
+        self.loop.call_soon_threadsafe(self._configurar, dict(monitores), dict(intervalos or {}))
+    
+    def _configurar(self, monitores, intervalos):
+        """Aplica la configuración en el hilo del motor."""
+        self.monitores = monitores
+        self.planificador.configurar(monitores, intervalos)
+        self.historial.podar(monitores)
+        self.agregados.podar(monitores)
+    
+    def verificar_todos(self, monitores=None):
+        """Verifica ya mismo todos los servidores (o los indicados) sin esperar su intervalo."""
+        if not self.loop or not self.hilo:
+            return
+        if monitores is None:
+            self.loop.call_soon_threadsafe(self.planificador.adelantar)
+        else:
+            self.loop.call_soon_threadsafe(self._programar, dict(monitores))
+    
+    async def _bucle(self):
+        """Lanza las verificaciones vencidas y guarda el historial periódicamente."""
+        ultimo_guardado = time.monotonic()
+        while True:
+            ahora = time.monotonic()
+            vencidos = self.planificador.vencidos(ahora)
+            if vencidos:
+                self._programar({nombre: self.monitores[nombre] for nombre in vencidos if nombre in self.monitores})
+            if ahora - ultimo_guardado >= self.intervalo_guardado:
+                ultimo_guardado = ahora
+                # Se serializa en el hilo del motor (consistente) y se escribe en otro hilo
+                datos = self.historial.serializar()
+                self.loop.run_in_executor(None, self.historial.escribir, datos)
+                datos = self.agregados.serializar()
+                self.loop.run_in_executor(None, self.agregados.escribir, datos)
+            await asyncio.sleep(0.5)
+    
+    def ejecutar(self, corrutina):
+        """Ejecuta una corrutina en el loop del motor. Retorna un concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(corrutina, self.loop)
+    
+    def cambiar_ritmo(self, factor, adelantar=False):
+        """Multiplica los intervalos de verificación (p. ej. más lento en segundo plano)."""
+        if self.loop and self.hilo:
+            self.loop.call_soon_threadsafe(self._cambiar_ritmo, factor, adelantar)
+    
+    def _cambiar_ritmo(self, factor, adelantar):
+        """Aplica el nuevo ritmo en el hilo del motor."""
+        self.planificador.factor = factor
+        if adelantar:
+            self.planificador.adelantar()
+    
+    def forzar_resolucion(self, host=None):
+        """Descarta la caché DNS (de un host o de todos) antes de la próxima verificación."""
+        if self.loop and self.hilo:
+            self.loop.call_soon_threadsafe(self.resolucion.invalidar, host)
+    
+    def _programar(self, monitores):
+        """Crea las verificaciones (en el hilo del motor), salteando las que siguen en curso."""
+        for nombre, monitor in monitores.items():
+            secuencia = self.planificador.reservar(nombre)
+            if secuencia is not None:
+                self.loop.create_task(self._verificar(nombre, monitor, secuencia))
+    
+    async def _verificar(self, nombre, monitor, secuencia):
+        """Verifica un servidor respetando el límite de concurrencia."""
+        configurado = self.monitores.get(nombre) is monitor
+        try:
+            async with self.semaforo:
+                inicio = time.perf_counter()
+                estado = await monitor.verificar_async(self.resolucion)
+                duracion = time.perf_counter() - inicio
+        finally:
+            self.planificador.liberar(nombre)
+        self.planificador.registrar_resultado(nombre, estado["online"], time.monotonic())
+        
+        if configurado and self.monitores.get(nombre) is not monitor:
+            # Quitado (o con otra dirección) mientras se verificaba: no vuelve a aparecer en el historial
+            return
+        if self.planificador.es_vigente(nombre, secuencia):
+            ahora = time.time()
+            self.historial.registrar(
+                nombre, ahora, estado["latencia"], estado["conectados"], estado["maximo"],
+                CODIGOS_ESTADO[estado["tipo"]], estado["online"]
+            )
+            self.agregados.registrar(
+                nombre, ahora, estado["online"], estado["latencia"], estado["conectados"],
+                self.planificador.hueco_maximo(nombre, monitor.timeout)
+            )
+            estado = dict(estado)
+            estado["secuencia"] = secuencia
+            estado["duracion"] = duracion
+            self.al_verificar(nombre, estado)
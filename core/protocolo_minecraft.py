@@ -0,0 +1,183 @@
+"""
+Cliente del protocolo Server List Ping de Minecraft Java
+Permite conectarse a una IP ya resuelta enviando el hostname original en el handshake
+"""
+
+import asyncio
+import json
+import struct
+import time
+
+
+VERSION_PROTOCOLO = 47
+
+
+class ErrorProtocolo(OSError):
+    """Respuesta inválida o inesperada del servidor."""
+
+
+class ErrorEstado(OSError):
+    """El puerto aceptó la conexión TCP pero el Server List Ping falló."""
+    
+    def __init__(self, mensaje, latencia_conexion):
+        super().__init__(mensaje)
+        self.latencia_conexion = latencia_conexion
+
+
+def escribir_varint(valor):
+    """Codifica un entero de 32 bits como VarInt."""
+    valor &= 0xFFFFFFFF
+    salida = bytearray()
+    while True:
+        byte = valor & 0x7F
+        valor >>= 7
+        if valor:
+            salida.append(byte | 0x80)
+        else:
+            salida.append(byte)
+            return bytes(salida)
+
+
+def leer_varint_bytes(datos, posicion=0):
+    """Decodifica un VarInt desde un buffer. Retorna (valor, nueva_posicion)."""
+    valor = 0
+    for desplazamiento in range(5):
+        if posicion >= len(datos):
+            raise ErrorProtocolo("VarInt incompleto")
+        byte = datos[posicion]
+        posicion += 1
+        valor |= (byte & 0x7F) << (7 * desplazamiento)
+        if not byte & 0x80:
+            if valor & 0x80000000:
+                valor -= 1 << 32
+            return valor, posicion
+    raise ErrorProtocolo("VarInt demasiado largo")
+
+
+async def leer_varint(reader):
+    """Lee un VarInt de un stream."""
+    valor = 0
+    for desplazamiento in range(5):
+        byte = (await reader.readexactly(1))[0]
+        valor |= (byte & 0x7F) << (7 * desplazamiento)
+        if not byte & 0x80:
+            return valor
+    raise ErrorProtocolo("VarInt demasiado largo")
+
+
+def escribir_string(texto):
+    """Codifica un string con prefijo de longitud."""
+    datos = texto.encode('utf-8')
+    return escribir_varint(len(datos)) + datos
+
+
+def empaquetar(paquete_id, datos=b""):
+    """Arma un paquete con prefijo de longitud."""
+    cuerpo = escribir_varint(paquete_id) + datos
+    return escribir_varint(len(cuerpo)) + cuerpo
+
+
+async def leer_paquete(reader, maximo=2 * 1024 * 1024):
+    """Lee un paquete completo. Retorna (paquete_id, datos)."""
+    largo = await leer_varint(reader)
+    if largo <= 0 or largo > maximo:
+        raise ErrorProtocolo(f"Largo de paquete inválido: {largo}")
+    cuerpo = await reader.readexactly(largo)
+    paquete_id, posicion = leer_varint_bytes(cuerpo)
+    return paquete_id, cuerpo[posicion:]
+
+
+def paquete_handshake(host, puerto, siguiente_estado=1, version=VERSION_PROTOCOLO):
+    """Arma el paquete de handshake."""
+    datos = (
+        escribir_varint(version)
+        + escribir_string(host)
+        + struct.pack('>H', puerto)
+        + escribir_varint(siguiente_estado)
+    )
+    return empaquetar(0x00, datos)
+
+
+def interpretar_estado(respuesta, latencia):
+    """Extrae los campos útiles del JSON de estado."""
+    try:
+        jugadores = respuesta.get("players") or {}
+        descripcion = respuesta.get("description", "")
+        if isinstance(descripcion, dict):
+            descripcion = descripcion.get("text", "")
+        return {
+            "latencia": latencia,
+            "online": int(jugadores.get("online", 0)),
+            "max": int(jugadores.get("max", 0)),
+            "muestra": [j.get("name", "") for j in jugadores.get("sample") or [] if isinstance(j, dict)],
+            "version": (respuesta.get("version") or {}).get("name", ""),
+            "motd": descripcion,
+        }
+    except (AttributeError, TypeError, ValueError) as e:
+        raise ErrorProtocolo(f"Respuesta de estado inválida: {e}")
+
+
+async def _pedir_estado(reader, writer, host, puerto):
+    """Handshake y pedido de estado. Retorna (respuesta_json, latencia_ms)."""
+    inicio = time.perf_counter()
+    writer.write(paquete_handshake(host, puerto) + empaquetar(0x00))
+    await writer.drain()
+
+    paquete_id, datos = await leer_paquete(reader)
+    if paquete_id != 0x00:
+        raise ErrorProtocolo(f"Paquete inesperado: {paquete_id}")
+    latencia = (time.perf_counter() - inicio) * 1000
+    largo, posicion = leer_varint_bytes(datos)
+    try:
+        respuesta = json.loads(datos[posicion:posicion + largo].decode('utf-8'))
+    except ValueError as e:
+        raise ErrorProtocolo(f"JSON inválido: {e}")
+    if not isinstance(respuesta, dict):
+        raise ErrorProtocolo("Respuesta de estado inválida")
+    return respuesta, latencia
+
+
+async def _medir_ping(reader, writer):
+    """Ping/pong del protocolo. Retorna la latencia en ms o None."""
+    token = int(time.time() * 1000)
+    inicio = time.perf_counter()
+    writer.write(empaquetar(0x01, struct.pack('>q', token)))
+    await writer.drain()
+    paquete_id, datos = await leer_paquete(reader)
+    if paquete_id == 0x01 and datos[:8] == struct.pack('>q', token):
+        return (time.perf_counter() - inicio) * 1000
+    return None
+
+
+async def medir_conexion_tcp(ip, puerto, timeout=3):
+    """Conecta por TCP (sin bloquear) y retorna (reader, writer, latencia_ms)."""
+    inicio = time.perf_counter()
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(ip, puerto), timeout)
+    return reader, writer, (time.perf_counter() - inicio) * 1000
+
+
+async def consultar_estado(ip, puerto, host=None, timeout=3):
+    """Consulta el estado de un servidor en ip:puerto usando `host` en el handshake.
+    
+    Si la conexión TCP se establece pero el estado no se puede leer lanza
+    ErrorEstado con la latencia de la conexión.
+    """
+    reader, writer, latencia_conexion = await medir_conexion_tcp(ip, puerto, timeout)
+    try:
+        respuesta, latencia = await asyncio.wait_for(
+            _pedir_estado(reader, writer, host or ip, puerto), timeout
+        )
+        # El ping/pong da una latencia más precisa; si el servidor no lo responde se usa la del estado
+        try:
+            latencia = await asyncio.wait_for(_medir_ping(reader, writer), min(timeout, 1)) or latencia
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ErrorProtocolo):
+            pass
+        return interpretar_estado(respuesta, latencia)
+    except asyncio.TimeoutError:
+        raise ErrorEstado("El servidor no respondió al estado", latencia_conexion)
+    except asyncio.IncompleteReadError:
+        raise ErrorEstado("El servidor cerró la conexión", latencia_conexion)
+    except OSError as e:
+        raise ErrorEstado(str(e) or type(e).__name__, latencia_conexion)
+    finally:
+        writer.close()
@@ -0,0 +1,283 @@
+"""
+Cliente RCON (protocolo Source) con pools de conexiones persistentes por servidor
+Cada conexión lleva un comando a la vez (como exige Minecraft); el paralelismo sale de las conexiones del pool
+"""
+
+import asyncio
+import itertools
+import struct
+
+from core.resolucion_dns import separar_direccion
+
+
+PUERTO_RCON = 25575
+
+TIPO_RESPUESTA = 0
+TIPO_COMANDO = 2
+TIPO_LOGIN = 3
+
+# Minecraft parte las respuestas en cuerpos de 4096 caracteres: uno más corto es el último
+MAXIMO_CUERPO = 4096
+# Otros servidores mandan paquetes más grandes
+MAXIMO_PAQUETE = 1 << 16
+# Tras un cuerpo de 4096 exactos se espera este tiempo por otro fragmento antes de dar la respuesta por completa
+ESPERA_FRAGMENTO = 0.3
+
+
+class ErrorRcon(OSError):
+    """Error de conexión o de protocolo RCON."""
+
+
+class ErrorAutenticacion(ErrorRcon):
+    """La contraseña RCON es incorrecta."""
+
+
+class ErrorSinEnviar(ErrorRcon):
+    """El comando no llegó a escribirse en el socket (se puede reintentar sin riesgo)."""
+
+
+def empaquetar(id_paquete, tipo, cuerpo):
+    """Arma un paquete RCON."""
+    datos = struct.pack('<ii', id_paquete, tipo) + cuerpo.encode('utf-8') + b"\x00\x00"
+    return struct.pack('<i', len(datos)) + datos
+
+
+async def leer_paquete(reader, cabecera=None):
+    """Lee un paquete (o su resto, si ya se leyó la cabecera de 4 bytes). Retorna (id, tipo, cuerpo)."""
+    (largo,) = struct.unpack('<i', cabecera or await reader.readexactly(4))
+    if largo < 10 or largo > MAXIMO_PAQUETE:
+        raise ErrorRcon(f"Largo de paquete inválido: {largo}")
+    datos = await reader.readexactly(largo)
+    id_paquete, tipo = struct.unpack('<ii', datos[:8])
+    return id_paquete, tipo, datos[8:-2].decode('utf-8', 'replace')
+
+
+class ResultadoRcon:
+    """Resultado de un comando enviado a un servidor."""
+
+    __slots__ = ("servidor", "comando", "ok", "respuesta")
+
+    def __init__(self, servidor, comando, ok, respuesta):
+        self.servidor = servidor
+        self.comando = comando
+        self.ok = ok
+        self.respuesta = respuesta
+
+
+class ConexionRcon:
+    """Conexión autenticada: envía un comando y espera su respuesta antes del siguiente."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.ids = itertools.count(1)
+        self.error = None
+
+    @classmethod
+    async def conectar(cls, host, puerto, password, timeout=5):
+        """Abre la conexión y se autentica."""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(host, puerto), timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ErrorRcon(f"No se pudo conectar por RCON: {e or type(e).__name__}")
+        conexion = cls(reader, writer)
+        try:
+            writer.write(empaquetar(0, TIPO_LOGIN, password))
+            await writer.drain()
+            while True:
+                id_paquete, tipo, _ = await asyncio.wait_for(leer_paquete(reader), timeout)
+                if tipo == TIPO_COMANDO:  # respuesta de autenticación
+                    break
+            if id_paquete == -1:
+                raise ErrorAutenticacion("Contraseña RCON incorrecta")
+        except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            writer.close()
+            if isinstance(e, ErrorRcon):
+                raise
+            raise ErrorRcon(f"Falló la autenticación RCON: {e or type(e).__name__}")
+        return conexion
+
+    @property
+    def cerrada(self):
+        # at_eof detecta que el servidor cerró la conexión mientras estaba inactiva
+        return self.error is not None or self.writer.is_closing() or self.reader.at_eof()
+
+    def _fallar(self, error):
+        """Marca la conexión como rota y la cierra."""
+        self.error = error
+        self.writer.close()
+
+    async def _respuesta(self, id_comando):
+        """Junta los fragmentos de la respuesta a un comando."""
+        partes = []
+        cabecera = None
+        while True:
+            id_paquete, _, cuerpo = await leer_paquete(self.reader, cabecera)
+            cabecera = None
+            if id_paquete != id_comando:
+                continue  # resto de un comando anterior que venció
+            partes.append(cuerpo)
+            if len(cuerpo) < MAXIMO_CUERPO:
+                return "".join(partes)
+            # Cuerpo lleno: puede seguir otro fragmento o ser justo un múltiplo de 4096
+            try:
+                cabecera = await asyncio.wait_for(self.reader.readexactly(4), ESPERA_FRAGMENTO)
+            except asyncio.TimeoutError:
+                return "".join(partes)
+
+    async def ejecutar(self, comando, timeout=5):
+        """Envía un comando y espera su respuesta completa.
+
+        Lanza ErrorSinEnviar si la conexión ya estaba cerrada, o ErrorRcon si falló después de enviarlo
+        (en ese caso el servidor pudo haberlo ejecutado).
+        """
+        if self.cerrada:
+            raise ErrorSinEnviar(str(self.error or "Conexión RCON cerrada"))
+        id_comando = next(self.ids)
+        self.writer.write(empaquetar(id_comando, TIPO_COMANDO, comando))
+        try:
+            await self.writer.drain()
+            return await asyncio.wait_for(self._respuesta(id_comando), timeout)
+        except asyncio.TimeoutError:
+            self._fallar(ErrorRcon("El servidor no respondió al comando RCON (pudo haberse ejecutado)"))
+        except (OSError, asyncio.IncompleteReadError) as e:
+            self._fallar(ErrorRcon(f"Conexión RCON cerrada tras enviar el comando: {e or type(e).__name__}"))
+        raise self.error
+
+    def cerrar(self):
+        """Cierra la conexión."""
+        self._fallar(ErrorRcon("Conexión RCON cerrada"))
+
+
+class PoolRcon:
+    """Conexiones persistentes a un servidor, cada una con un comando a la vez; reconecta si una se cae."""
+
+    def __init__(self, host, puerto, password, tamano=2, timeout=5):
+        self.host = host
+        self.puerto = puerto
+        self.password = password
+        self.tamano = tamano
+        self.timeout = timeout
+        self.libres = []
+        self.ocupadas = set()
+        self.turnos = asyncio.Semaphore(tamano)
+
+    async def _tomar(self):
+        """Retorna una conexión libre y abierta, o abre una nueva."""
+        while self.libres:
+            conexion = self.libres.pop()
+            if not conexion.cerrada:
+                return conexion
+        return await ConexionRcon.conectar(self.host, self.puerto, self.password, self.timeout)
+
+    async def ejecutar(self, comando):
+        """Ejecuta un comando en una conexión libre.
+
+        Reintenta una vez solo si falló antes de escribir el comando (conexión, autenticación caída o
+        conexión vieja cerrada); nunca lo reenvía después de escribirlo. Si tampoco llega en el segundo intento
+        lanza ErrorSinEnviar (o ErrorAutenticacion, que no se reintenta).
+        """
+        async with self.turnos:
+            for intento in range(2):
+                try:
+                    conexion = await self._tomar()
+                except ErrorAutenticacion:
+                    raise
+                except ErrorRcon as e:
+                    if intento:
+                        raise ErrorSinEnviar(str(e)) from e
+                    continue
+                self.ocupadas.add(conexion)
+                try:
+                    return await conexion.ejecutar(comando, self.timeout)
+                except ErrorSinEnviar:
+                    if intento:
+                        raise
+                finally:
+                    self.ocupadas.discard(conexion)
+                    if not conexion.cerrada:
+                        self.libres.append(conexion)
+        raise ErrorSinEnviar("No se pudo ejecutar el comando RCON")
+
+    def cerrar(self):
+        """Cierra todas las conexiones."""
+        for conexion in self.libres + list(self.ocupadas):
+            conexion.cerrar()
+        self.libres = []
+        self.ocupadas = set()
+
+
+class ClienteRcon:
+    """Pools RCON por servidor a partir de la sección 'rcon' de monitor_config.json."""
+
+    def __init__(self, tamano_pool=2, timeout=5):
+        self.tamano_pool = tamano_pool
+        self.timeout = timeout
+        self.credenciales = {}
+        self.pools = {}
+
+    def configurar(self, servidores, credenciales):
+        """Define las credenciales {nombre: {"password", "puerto", "host"}} de cada servidor."""
+        nuevas = {}
+        for nombre, datos in (credenciales or {}).items():
+            if nombre not in servidores or not datos.get("password"):
+                continue
+            host, _ = separar_direccion(servidores[nombre])
+            nuevas[nombre] = (datos.get("host", host), int(datos.get("puerto", PUERTO_RCON)), datos["password"])
+        # Los pools con credenciales viejas se reemplazan al usarlos (en el hilo del loop)
+        self.credenciales = nuevas
+
+    def servidores(self):
+        """Nombres de los servidores con RCON configurado."""
+        return list(self.credenciales)
+
+    def _pool(self, nombre):
+        credenciales = self.credenciales[nombre]
+        pool = self.pools.get(nombre)
+        if pool is not None and (pool.host, pool.puerto, pool.password) != credenciales:
+            pool.cerrar()
+            pool = None
+        if pool is None:
+            host, puerto, password = credenciales
+            pool = self.pools[nombre] = PoolRcon(host, puerto, password, self.tamano_pool, self.timeout)
+        return pool
+
+    async def enviar(self, nombre, comando):
+        """Envía un comando a un servidor. Retorna un ResultadoRcon (nunca lanza)."""
+        return (await self.enviar_varios(nombre, [comando]))[0]
+
+    async def enviar_varios(self, nombre, comandos):
+        """Envía los comandos a un servidor de a uno y en orden, cada uno tras la respuesta del anterior.
+
+        Retorna [ResultadoRcon] (nunca lanza). Si el servidor no se alcanza o rechaza la contraseña, no se
+        insiste con el resto: quedan con ese mismo error.
+        """
+        comandos = [comando.strip().lstrip('/') for comando in comandos]
+        if nombre not in self.credenciales:
+            return [ResultadoRcon(nombre, comando, False, "Sin RCON configurado") for comando in comandos]
+        pool = self._pool(nombre)
+        resultados = []
+        for indice, comando in enumerate(comandos):
+            try:
+                resultados.append(ResultadoRcon(nombre, comando, True, await pool.ejecutar(comando)))
+            except (ErrorSinEnviar, ErrorAutenticacion) as e:
+                error = str(e) or type(e).__name__
+                resultados.extend(ResultadoRcon(nombre, resto, False, error) for resto in comandos[indice:])
+                break
+            except (ErrorRcon, OSError, asyncio.TimeoutError) as e:
+                resultados.append(ResultadoRcon(nombre, comando, False, str(e) or type(e).__name__))
+        return resultados
+
+    async def enviar_a_varios(self, nombres, comandos):
+        """Envía los comandos (en orden) a cada servidor, todos los servidores en paralelo.
+
+        Retorna {servidor: [ResultadoRcon]}.
+        """
+        resultados = await asyncio.gather(*(self.enviar_varios(nombre, comandos) for nombre in nombres))
+        return dict(zip(nombres, resultados))
+
+    def cerrar(self):
+        """Cierra todos los pools (debe llamarse en el hilo del loop)."""
+        for pool in self.pools.values():
+            pool.cerrar()
+        self.pools = {}
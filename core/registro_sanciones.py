@@ -0,0 +1,194 @@
+"""
+Registro de sanciones de solo agregado (SQLite) con índice por jugador
+Guarda cada comando copiado o enviado para ver el historial de un nick y escalar los tiempos
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from core.reglas_sanciones import normalizar
+
+
+VERSION_ESQUEMA = 1
+
+# La misma sanción (nick, tipo y motivo) copiada dos veces, o copiada y después enviada, cuenta una sola vez
+# aunque el comando cambie (otro tiempo, otra modalidad)
+VENTANA_DUPLICADO = 600
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sanciones (
+    id INTEGER PRIMARY KEY,
+    fecha INTEGER NOT NULL,
+    nick TEXT NOT NULL,
+    nick_clave TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    motivo TEXT NOT NULL,
+    motivo_clave TEXT NOT NULL,
+    tiempo TEXT,
+    modalidad TEXT,
+    comando TEXT NOT NULL,
+    origen TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sanciones_por_nick ON sanciones (nick_clave, fecha);
+
+CREATE TABLE IF NOT EXISTS envios (
+    sancion INTEGER NOT NULL REFERENCES sanciones (id),
+    fecha INTEGER NOT NULL,
+    servidor TEXT NOT NULL,
+    ok INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS envios_por_sancion ON envios (sancion);
+
+CREATE TRIGGER IF NOT EXISTS sanciones_sin_cambios BEFORE UPDATE ON sanciones
+BEGIN SELECT RAISE(ABORT, 'el registro de sanciones es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS sanciones_sin_borrado BEFORE DELETE ON sanciones
+BEGIN SELECT RAISE(ABORT, 'el registro de sanciones es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS envios_sin_cambios BEFORE UPDATE ON envios
+BEGIN SELECT RAISE(ABORT, 'el registro de sanciones es de solo agregado'); END;
+CREATE TRIGGER IF NOT EXISTS envios_sin_borrado BEFORE DELETE ON envios
+BEGIN SELECT RAISE(ABORT, 'el registro de sanciones es de solo agregado'); END;
+"""
+
+_registros = {}
+_candado = threading.Lock()
+
+
+def obtener_registro(archivo=None):
+    """Retorna el registro del archivo (una sola conexión por archivo)."""
+    with _candado:
+        registro = _registros.get(archivo)
+        if registro is None:
+            registro = _registros[archivo] = RegistroSanciones(archivo)
+        return registro
+
+
+class EntradaRegistro:
+    """Sanción registrada y los servidores a los que se envió."""
+
+    __slots__ = ("id", "fecha", "nick", "tipo", "motivo", "tiempo", "modalidad", "comando", "origen", "servidores")
+
+    def __init__(self, fila):
+        (self.id, self.fecha, self.nick, self.tipo, self.motivo, self.tiempo, self.modalidad,
+         self.comando, self.origen, servidores) = fila
+        self.servidores = servidores.split("\n") if servidores else []
+
+
+class RegistroSanciones:
+    """Historial de sanciones en SQLite: solo se agregan filas, nunca se modifican ni borran."""
+
+    def __init__(self, archivo=None):
+        if archivo is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            archivo = os.path.join(app_dir, "core", "registro_sanciones.db")
+
+        self.archivo = archivo
+        self.candado = threading.Lock()
+        self.conexion = None
+        try:
+            if archivo != ":memory:":
+                os.makedirs(os.path.dirname(archivo), exist_ok=True)
+            self.conexion = sqlite3.connect(archivo, check_same_thread=False)
+            self.conexion.execute("PRAGMA journal_mode=WAL")
+            self.conexion.executescript(ESQUEMA)
+            self.conexion.execute(f"PRAGMA user_version={VERSION_ESQUEMA}")
+            self.conexion.commit()
+        except (OSError, sqlite3.Error) as e:
+            print(f"Error al abrir registro de sanciones: {e}")
+            self.conexion = None
+
+    @property
+    def disponible(self):
+        return self.conexion is not None
+
+    def registrar(self, nick, tipo, motivo, tiempo, modalidad, comando, origen, fecha=None):
+        """Agrega una sanción. Retorna su id (el de la anterior si es el mismo comando hace poco) o None."""
+        return self.registrar_varios([(nick, tipo, motivo, tiempo, modalidad, comando)], origen, fecha)[0]
+
+    def registrar_varios(self, sanciones, origen, fecha=None):
+        """Agrega [(nick, tipo, motivo, tiempo, modalidad, comando)] en una sola transacción. Retorna sus ids."""
+        if self.conexion is None:
+            return [None] * len(sanciones)
+        fecha = int(fecha if fecha is not None else time.time())
+        ids = []
+        try:
+            with self.candado, self.conexion:
+                for nick, tipo, motivo, tiempo, modalidad, comando in sanciones:
+                    nick_clave = nick.casefold()
+                    motivo_clave = normalizar(motivo)
+                    fila = self.conexion.execute(
+                        "SELECT id FROM sanciones WHERE nick_clave = ? AND fecha >= ? AND tipo = ? AND motivo_clave = ? "
+                        "ORDER BY fecha DESC LIMIT 1",
+                        (nick_clave, fecha - VENTANA_DUPLICADO, tipo, motivo_clave)
+                    ).fetchone()
+                    if fila:
+                        ids.append(fila[0])
+                        continue
+                    cursor = self.conexion.execute(
+                        "INSERT INTO sanciones (fecha, nick, nick_clave, tipo, motivo, motivo_clave, tiempo, "
+                        "modalidad, comando, origen) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (fecha, nick, nick_clave, tipo, motivo, motivo_clave, tiempo or None,
+                         modalidad or None, comando, origen)
+                    )
+                    ids.append(cursor.lastrowid)
+            return ids
+        except sqlite3.Error as e:
+            print(f"Error al registrar sanción: {e}")
+            return [None] * len(sanciones)
+
+    def registrar_envios(self, envios, fecha=None):
+        """Agrega el resultado del envío por RCON de sanciones registradas: [(id, {servidor: ok})]."""
+        filas = [(sancion, servidor, int(ok)) for sancion, resultados in envios if sancion is not None
+                 for servidor, ok in resultados.items()]
+        if self.conexion is None or not filas:
+            return
+        fecha = int(fecha if fecha is not None else time.time())
+        try:
+            with self.candado, self.conexion:
+                self.conexion.executemany(
+                    "INSERT INTO envios (sancion, fecha, servidor, ok) VALUES (?, ?, ?, ?)",
+                    [(sancion, fecha, servidor, ok) for sancion, servidor, ok in filas]
+                )
+        except sqlite3.Error as e:
+            print(f"Error al registrar envío: {e}")
+
+    def historial(self, nick, limite=50):
+        """Últimas sanciones de un nick (sin importar mayúsculas), de la más reciente a la más vieja."""
+        if self.conexion is None or not nick:
+            return []
+        with self.candado:
+            filas = self.conexion.execute(
+                "SELECT s.id, s.fecha, s.nick, s.tipo, s.motivo, s.tiempo, s.modalidad, s.comando, s.origen, "
+                "(SELECT group_concat(servidor, char(10)) FROM "
+                "(SELECT DISTINCT servidor FROM envios WHERE sancion = s.id AND ok)) "
+                "FROM sanciones s WHERE s.nick_clave = ? ORDER BY s.fecha DESC, s.id DESC LIMIT ?",
+                (nick.casefold(), limite)
+            ).fetchall()
+        return [EntradaRegistro(fila) for fila in filas]
+
+    def anteriores(self, nick, motivo, dias, excluir=()):
+        """Cantidad de sanciones de un nick por el mismo motivo en los últimos `dias` días.
+
+        `excluir` son ids que no cuentan (p. ej. las que acaba de registrar la misma ventana).
+        """
+        if self.conexion is None or not nick or not motivo:
+            return 0
+        excluir = [sancion for sancion in excluir if sancion is not None]
+        with self.candado:
+            (cantidad,) = self.conexion.execute(
+                "SELECT COUNT(*) FROM sanciones WHERE nick_clave = ? AND fecha >= ? AND motivo_clave = ?"
+                + (f" AND id NOT IN ({','.join('?' * len(excluir))})" if excluir else ""),
+                (nick.casefold(), int(time.time()) - dias * 86400, normalizar(motivo), *excluir)
+            ).fetchone()
+        return cantidad
+
+    def cerrar(self):
+        """Cierra la conexión."""
+        if self.conexion is not None:
+            self.conexion.close()
+            self.conexion = None
@@ -0,0 +1,323 @@
+"""
+Reglas de sanción cargadas desde sanciones_config.json
+Valida el archivo una sola vez, precompila la plantilla de cada comando y recarga solo si cambió
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+
+
+PATRON_TIEMPO = re.compile(r'^(\d+(mo|[smhdwy]))+$', re.IGNORECASE)
+PATRON_NICK = re.compile(r'^[.*]?[A-Za-z0-9_]{1,16}$')
+PATRON_COMANDO = re.compile(r'^[a-z0-9_:-]+$', re.IGNORECASE)
+MODALIDAD_GLOBAL = "Global"
+
+# Segundos por unidad; 'mo' va antes que 'm' para no confundir meses con minutos
+UNIDADES_TIEMPO = (("mo", 2592000), ("y", 31536000), ("w", 604800), ("d", 86400), ("h", 3600),
+                   ("m", 60), ("s", 1))
+PATRON_PARTE_TIEMPO = re.compile(r'(\d+)(mo|[smhdwy])', re.IGNORECASE)
+# Unidades usadas al escribir un tiempo escalado (de mayor a menor, sin semanas ni meses)
+UNIDADES_SALIDA = (("y", 31536000), ("d", 86400), ("h", 3600), ("m", 60), ("s", 1))
+
+ESCALADO_POR_DEFECTO = {"ventana_dias": 90, "factor": 2, "maximo": "1y"}
+
+_reglas = {}
+_candado = threading.Lock()
+
+
+class ErrorConfigSanciones(ValueError):
+    """El archivo de sanciones no existe, no es JSON válido o no respeta el esquema."""
+
+
+class ErrorSancion(ValueError):
+    """Faltan datos o hay datos inválidos para generar un comando."""
+
+
+def normalizar(texto):
+    """Clave para comparar motivos sin importar mayúsculas ni espacios repetidos."""
+    return " ".join(texto.split()).casefold()
+
+
+def a_segundos(tiempo):
+    """Convierte '1d12h' a segundos. Lanza ErrorSancion si el formato es inválido."""
+    if not tiempo or not PATRON_TIEMPO.match(tiempo):
+        raise ErrorSancion(f"Tiempo inválido: '{tiempo}'")
+    unidades = dict(UNIDADES_TIEMPO)
+    return sum(int(cantidad) * unidades[unidad.lower()] for cantidad, unidad in PATRON_PARTE_TIEMPO.findall(tiempo))
+
+
+def desde_segundos(segundos):
+    """Convierte segundos al tiempo más corto de una sola unidad ('1209600' -> '14d')."""
+    for unidad, valor in UNIDADES_SALIDA:
+        if segundos >= valor and segundos % valor == 0:
+            return f"{segundos // valor}{unidad}"
+    return f"{segundos}s"
+
+
+def ruta_por_defecto():
+    """Ruta de sanciones_config.json junto a la aplicación."""
+    if getattr(sys, 'frozen', False):
+        app_dir = os.path.dirname(sys.executable)
+    else:
+        app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(app_dir, "core", "sanciones_config.json")
+
+
+def obtener_reglas(archivo=None):
+    """Retorna las reglas del archivo (cargadas una vez y recargadas solo si cambió)."""
+    archivo = archivo or ruta_por_defecto()
+    with _candado:
+        reglas = _reglas.get(archivo)
+        if reglas is None:
+            reglas = _reglas[archivo] = ReglasSanciones(archivo)
+        reglas.asegurar_vigente()
+        return reglas
+
+
+def _tipo(valor, tipo, ruta, errores):
+    """Agrega un error si `valor` no es del tipo esperado. Retorna True si lo es."""
+    if isinstance(valor, tipo) and not (tipo is int and isinstance(valor, bool)):
+        return True
+    nombres = {str: "texto", bool: "true/false", list: "lista", dict: "objeto"}
+    errores.append(f"{ruta}: se esperaba {nombres.get(tipo, tipo.__name__)}")
+    return False
+
+
+def validar_sancion(nombre, sancion):
+    """Valida un tipo de sanción. Retorna (errores, avisos)."""
+    errores = []
+    avisos = []
+    ruta = f"sanciones_config.{nombre}"
+    if not _tipo(sancion, dict, ruta, errores):
+        return errores, avisos
+
+    comando = sancion.get("comando")
+    if comando is None:
+        errores.append(f"{ruta}.comando: falta")
+    elif _tipo(comando, str, f"{ruta}.comando", errores) and not PATRON_COMANDO.match(comando.lstrip('/')):
+        errores.append(f"{ruta}.comando: comando inválido '{comando}'")
+    for clave in ("requiere_tiempo", "requiere_modalidad"):
+        if clave in sancion:
+            _tipo(sancion[clave], bool, f"{ruta}.{clave}", errores)
+    tiempo = sancion.get("tiempo_default")
+    if tiempo is not None and _tipo(tiempo, str, f"{ruta}.tiempo_default", errores) \
+            and not PATRON_TIEMPO.match(tiempo):
+        errores.append(f"{ruta}.tiempo_default: tiempo inválido '{tiempo}'")
+
+    motivos = sancion.get("motivos", [])
+    if not _tipo(motivos, list, f"{ruta}.motivos", errores):
+        return errores, avisos
+    for indice, motivo in enumerate(motivos):
+        _tipo(motivo, str, f"{ruta}.motivos[{indice}]", errores)
+    conocidos = {normalizar(motivo): motivo for motivo in motivos if isinstance(motivo, str)}
+
+    por_motivo = sancion.get("motivos_requieren_modalidad", {})
+    if not _tipo(por_motivo, dict, f"{ruta}.motivos_requieren_modalidad", errores):
+        return errores, avisos
+    for motivo, requiere in por_motivo.items():
+        _tipo(requiere, bool, f"{ruta}.motivos_requieren_modalidad.{motivo}", errores)
+        original = conocidos.get(normalizar(motivo))
+        if original is None:
+            avisos.append(f"{ruta}.motivos_requieren_modalidad: '{motivo}' no está en motivos")
+        elif original != motivo:
+            avisos.append(f"{ruta}.motivos_requieren_modalidad: '{motivo}' se tomó como '{original}'")
+    return errores, avisos
+
+
+def validar_escalado(escalado):
+    """Valida la sección opcional de escalado. Retorna la lista de errores."""
+    errores = []
+    if not _tipo(escalado, dict, "escalado", errores):
+        return errores
+    ventana = escalado.get("ventana_dias", 1)
+    if _tipo(ventana, int, "escalado.ventana_dias", errores) and ventana <= 0:
+        errores.append("escalado.ventana_dias: debe ser mayor a 0")
+    factor = escalado.get("factor", 1)
+    if not isinstance(factor, (int, float)) or isinstance(factor, bool) or factor < 1:
+        errores.append("escalado.factor: se esperaba un número mayor o igual a 1")
+    maximo = escalado.get("maximo")
+    if maximo is not None and _tipo(maximo, str, "escalado.maximo", errores) and not PATRON_TIEMPO.match(maximo):
+        errores.append(f"escalado.maximo: tiempo inválido '{maximo}'")
+    return errores
+
+
+def validar_config(config):
+    """Valida el esquema de todo el archivo. Retorna (errores, avisos)."""
+    errores = []
+    avisos = []
+    if not _tipo(config, dict, "raíz", errores):
+        return errores, avisos
+
+    tiempos = config.get("tiempos_por_motivo", {})
+    if _tipo(tiempos, dict, "tiempos_por_motivo", errores):
+        for motivo, tiempo in tiempos.items():
+            ruta = f"tiempos_por_motivo.{motivo}"
+            if _tipo(tiempo, str, ruta, errores) and not PATRON_TIEMPO.match(tiempo):
+                errores.append(f"{ruta}: tiempo inválido '{tiempo}'")
+
+    modalidades = config.get("modalidades", [])
+    if _tipo(modalidades, list, "modalidades", errores):
+        for indice, modalidad in enumerate(modalidades):
+            _tipo(modalidad, str, f"modalidades[{indice}]", errores)
+
+    errores.extend(validar_escalado(config.get("escalado", {})))
+
+    sanciones = config.get("sanciones_config")
+    if sanciones is None:
+        errores.append("sanciones_config: falta la sección")
+    elif _tipo(sanciones, dict, "sanciones_config", errores):
+        for nombre, sancion in sanciones.items():
+            errores_sancion, avisos_sancion = validar_sancion(nombre, sancion)
+            errores.extend(errores_sancion)
+            avisos.extend(avisos_sancion)
+    return errores, avisos
+
+
+class Sancion:
+    """Tipo de sanción con su plantilla de comando precompilada."""
+
+    __slots__ = ("nombre", "comando", "requiere_tiempo", "requiere_modalidad", "tiempo_default",
+                 "motivos", "motivos_por_clave", "modalidad_por_motivo", "plantilla")
+
+    def __init__(self, nombre, datos):
+        self.nombre = nombre
+        self.comando = datos["comando"].lstrip('/')
+        self.requiere_tiempo = datos.get("requiere_tiempo", False)
+        self.requiere_modalidad = datos.get("requiere_modalidad", False)
+        self.tiempo_default = datos.get("tiempo_default", "")
+        self.motivos = list(datos.get("motivos", []))
+        self.motivos_por_clave = {normalizar(motivo): motivo for motivo in self.motivos}
+        self.modalidad_por_motivo = {
+            normalizar(motivo): requiere for motivo, requiere in datos.get("motivos_requieren_modalidad", {}).items()
+        }
+        # Plantilla armada una sola vez: solo se completan los campos al generar
+        self.plantilla = f"/{self.comando} {{nick}}" + (" {tiempo}" if self.requiere_tiempo else "") + " {motivo}{servidor}"
+
+    def requiere_modalidad_para(self, motivo):
+        """Indica si el motivo lleva modalidad (sin importar mayúsculas)."""
+        return self.modalidad_por_motivo.get(normalizar(motivo), self.requiere_modalidad)
+
+    def motivo_oficial(self, motivo):
+        """Retorna el motivo como está escrito en la configuración (o tal cual si no es uno de ellos)."""
+        return self.motivos_por_clave.get(normalizar(motivo), motivo.strip())
+
+    def generar(self, nick, motivo, tiempo=None, modalidad=None):
+        """Arma el comando. Lanza ErrorSancion si falta o sobra algo."""
+        nick = nick.strip()
+        motivo = motivo.strip()
+        if not nick:
+            raise ErrorSancion("Falta el nick")
+        if not PATRON_NICK.match(nick):
+            raise ErrorSancion(f"Nick inválido: '{nick}'")
+        if not motivo:
+            raise ErrorSancion("Falta el motivo")
+        if self.requiere_tiempo:
+            tiempo = (tiempo or "").strip()
+            if not tiempo:
+                raise ErrorSancion("Falta el tiempo")
+            if not PATRON_TIEMPO.match(tiempo):
+                raise ErrorSancion(f"Tiempo inválido: '{tiempo}'")
+        servidor = f" server:{modalidad}" if modalidad and modalidad != MODALIDAD_GLOBAL else ""
+        return self.plantilla.format(nick=nick, tiempo=tiempo, motivo=motivo, servidor=servidor)
+
+
+class ReglasSanciones:
+    """Sanciones, tiempos por motivo y modalidades validadas de sanciones_config.json."""
+
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.firma = None
+        self.sanciones = {}
+        self.sanciones_por_clave = {}
+        self.tiempos = {}
+        self.modalidades = []
+        self.escalado = dict(ESCALADO_POR_DEFECTO)
+        self.errores = []
+        self.avisos = []
+
+    def _firma_actual(self):
+        estado = os.stat(self.archivo)
+        return estado.st_mtime_ns, estado.st_size
+
+    def asegurar_vigente(self):
+        """Recarga el archivo solo si cambió desde la última lectura."""
+        try:
+            firma = self._firma_actual()
+        except OSError:
+            raise ErrorConfigSanciones(f"No se encontró el archivo de configuración:\n{self.archivo}")
+        if firma != self.firma:
+            self.cargar()
+            self.firma = firma
+
+    def cargar(self):
+        """Lee y valida el archivo. Las sanciones con errores se omiten."""
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ErrorConfigSanciones(f"Error al leer el archivo de configuración:\n{e}")
+
+        self.errores, self.avisos = validar_config(config)
+        for error in self.errores:
+            print(f"Error en config de sanciones: {error}")
+        for aviso in self.avisos:
+            print(f"Aviso en config de sanciones: {aviso}")
+        if not isinstance(config, dict) or not isinstance(config.get("sanciones_config"), dict):
+            raise ErrorConfigSanciones("Configuración inválida:\n" + "\n".join(self.errores))
+
+        sanciones = {}
+        for nombre, datos in config["sanciones_config"].items():
+            errores, _ = validar_sancion(nombre, datos)
+            if not errores:
+                sanciones[nombre] = Sancion(nombre, datos)
+
+        tiempos = config.get("tiempos_por_motivo", {})
+        self.sanciones = sanciones
+        # También se aceptan el comando ('tempban') y el nombre sin importar mayúsculas
+        self.sanciones_por_clave = {normalizar(sancion.comando): sancion for sancion in sanciones.values()}
+        self.sanciones_por_clave.update((normalizar(nombre), sancion) for nombre, sancion in sanciones.items())
+        self.tiempos = {
+            normalizar(motivo): tiempo for motivo, tiempo in (tiempos.items() if isinstance(tiempos, dict) else ())
+            if isinstance(tiempo, str) and PATRON_TIEMPO.match(tiempo)
+        }
+        modalidades = config.get("modalidades", [])
+        self.modalidades = [m for m in modalidades if isinstance(m, str)] if isinstance(modalidades, list) else []
+        escalado = config.get("escalado", {})
+        # Con errores en la sección se usan los valores por defecto completos
+        if validar_escalado(escalado):
+            escalado = {}
+        self.escalado = dict(ESCALADO_POR_DEFECTO, **escalado)
+
+    def sancion(self, nombre):
+        """Retorna la Sancion (por nombre o comando, sin importar mayúsculas) o None."""
+        return self.sanciones.get(nombre) or self.sanciones_por_clave.get(normalizar(nombre))
+
+    def tiempo_para(self, motivo):
+        """Tiempo configurado para un motivo (sin importar mayúsculas) o None."""
+        return self.tiempos.get(normalizar(motivo))
+
+    def escalar(self, tiempo, anteriores):
+        """Tiempo sugerido tras `anteriores` sanciones previas por el mismo motivo (tope en 'maximo')."""
+        if not anteriores or not tiempo:
+            return tiempo
+        try:
+            base = a_segundos(tiempo)
+            maximo = a_segundos(self.escalado["maximo"])
+        except ErrorSancion:
+            return tiempo
+        if base >= maximo:
+            return tiempo
+        return desde_segundos(min(int(base * self.escalado["factor"] ** anteriores), maximo))
+
+    def modalidad_valida(self, modalidad):
+        """Retorna la modalidad con su nombre oficial (o None si no existe)."""
+        clave = normalizar(modalidad)
+        if clave == normalizar(MODALIDAD_GLOBAL):
+            return MODALIDAD_GLOBAL
+        for nombre in self.modalidades:
+            if normalizar(nombre) == clave:
+                return nombre
+        return None
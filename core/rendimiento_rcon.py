@@ -0,0 +1,124 @@
+"""
+Medición de rendimiento (TPS, MSPT y memoria) por RCON
+Envía comandos configurables por las conexiones persistentes del cliente RCON y extrae los valores con regex
+"""
+
+import asyncio
+import re
+import time
+
+
+INTERVALO_POR_DEFECTO = 60
+METRICAS = ("tps", "mspt", "memoria")
+
+# Salidas de Paper (/tps, /mspt) y de Essentials (/gc, con la memoria en MB)
+COMANDOS_POR_DEFECTO = [
+    {"comando": "tps", "metricas": {"tps": r"TPS from last 1m, 5m, 15m:\s*\*?([\d.,]+)"}},
+    {"comando": "mspt", "metricas": {"mspt": r"tick times.*?:\s*\S*\s*([\d.,]+)/"}},
+    {"comando": "gc", "metricas": {
+        "memoria": r"Allocated memory:\s*(?P<total>[\d.,]+).*?Free memory:\s*(?P<libre>[\d.,]+)"
+    }},
+]
+
+PATRON_COLORES = re.compile(r'§[0-9a-fk-orx]', re.IGNORECASE)
+
+
+def a_numero(texto):
+    """Convierte '19.98', '19,98' o '4,096' en número."""
+    if ',' in texto and '.' not in texto and len(texto.rsplit(',', 1)[1]) != 3:
+        texto = texto.replace(',', '.')  # coma decimal
+    return float(texto.replace(',', ''))
+
+
+def compilar_comandos(comandos):
+    """Retorna [(comando, [(métrica, regex)])] validando los nombres de las métricas."""
+    compilados = []
+    for entrada in comandos:
+        patrones = []
+        for metrica, patron in entrada.get("metricas", {}).items():
+            if metrica not in METRICAS:
+                print(f"Error en config de rendimiento: métrica desconocida '{metrica}'")
+                continue
+            try:
+                patrones.append((metrica, re.compile(patron, re.IGNORECASE | re.DOTALL)))
+            except re.error as e:
+                print(f"Error en config de rendimiento: regex inválida para '{metrica}': {e}")
+        if entrada.get("comando") and patrones:
+            compilados.append((entrada["comando"], patrones))
+    return compilados
+
+
+def extraer(texto, patrones):
+    """Aplica los patrones a la respuesta de un comando. Retorna {métrica: valor}.
+
+    Si el patrón tiene los grupos 'total' y 'libre' el valor es total - libre;
+    si no, el valor es el primer grupo.
+    """
+    texto = PATRON_COLORES.sub('', texto)
+    valores = {}
+    for metrica, patron in patrones:
+        coincidencia = patron.search(texto)
+        if not coincidencia:
+            continue
+        try:
+            grupos = coincidencia.groupdict()
+            if grupos.get("total") is not None and grupos.get("libre") is not None:
+                valores[metrica] = a_numero(grupos["total"]) - a_numero(grupos["libre"])
+            else:
+                valores[metrica] = a_numero(coincidencia.group(1))
+        except (ValueError, IndexError):
+            continue
+    return valores
+
+
+class MonitorRendimiento:
+    """Consulta periódicamente el rendimiento de los servidores con RCON y lo guarda en el historial."""
+
+    def __init__(self, servicio):
+        self.servicio = servicio
+        self.intervalo = INTERVALO_POR_DEFECTO
+        self.comandos = compilar_comandos(COMANDOS_POR_DEFECTO)
+        self.por_servidor = {}
+        self.ultimos = {}
+
+    def configurar(self, config):
+        """Lee la sección 'rendimiento' de monitor_config.json."""
+        config = config or {}
+        self.intervalo = max(5, config.get("intervalo", INTERVALO_POR_DEFECTO))
+        self.comandos = compilar_comandos(config.get("comandos", COMANDOS_POR_DEFECTO))
+        self.por_servidor = {
+            nombre: compilar_comandos(comandos) for nombre, comandos in config.get("servidores", {}).items()
+        }
+
+    async def medir(self, nombre):
+        """Envía los comandos de un servidor y retorna {métrica: valor} (vacío si no respondió)."""
+        comandos = self.por_servidor.get(nombre, self.comandos)
+        # De a uno: Minecraft no acepta varios comandos seguidos en la misma conexión
+        resultados = await self.servicio.rcon.enviar_varios(nombre, [comando for comando, _ in comandos])
+        valores = {}
+        for (_, patrones), resultado in zip(comandos, resultados):
+            if resultado.ok:
+                valores.update(extraer(resultado.respuesta, patrones))
+        return valores
+
+    async def medir_todos(self):
+        """Mide todos los servidores con RCON a la vez y registra los resultados."""
+        nombres = [nombre for nombre in self.servicio.rcon.servidores() if nombre in self.servicio.servidores]
+        resultados = await asyncio.gather(*(self.medir(nombre) for nombre in nombres))
+        ahora = time.time()
+        for nombre, valores in zip(nombres, resultados):
+            # Sin respuesta o quitado mientras se medía (no vuelve a aparecer en el historial)
+            if not valores or nombre not in self.servicio.motor.monitores:
+                self.ultimos.pop(nombre, None)
+                continue
+            self.ultimos[nombre] = valores
+            self.servicio.historial.registrar_rendimiento(
+                nombre, ahora, valores.get("tps"), valores.get("mspt"), valores.get("memoria")
+            )
+
+    async def bucle(self):
+        """Mide el rendimiento cada `intervalo` segundos (corre en el loop del motor)."""
+        while True:
+            inicio = time.monotonic()
+            await self.medir_todos()
+            await asyncio.sleep(max(0, self.intervalo - (time.monotonic() - inicio)))
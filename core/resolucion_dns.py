@@ -0,0 +1,160 @@
+"""
+Caché de resolución DNS/SRV para el monitor de servidores
+Respeta el TTL de los registros (con piso y techo) y también cachea los fallos
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+
+PUERTO_DEFECTO = 25565
+
+
+class ErrorResolucion(OSError):
+    """No se pudo resolver la dirección del servidor."""
+
+
+def separar_direccion(direccion, puerto=None):
+    """Separa 'host:puerto' o '[ipv6]:puerto'. Retorna (host, puerto o None)."""
+    direccion = direccion.strip()
+    if direccion.startswith('['):
+        host, _, resto = direccion[1:].partition(']')
+        if resto.startswith(':') and resto[1:].isdigit():
+            return host, int(resto[1:])
+        return host, puerto
+    if direccion.count(':') == 1:
+        host, _, numero = direccion.partition(':')
+        if numero.isdigit():
+            return host, int(numero)
+    return direccion, puerto
+
+
+def es_ip(host):
+    """Indica si el host ya es una dirección IP."""
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class EntradaResolucion:
+    """Resultado cacheado de una resolución (positivo o negativo)."""
+
+    __slots__ = ("ip", "puerto", "expira", "error")
+
+    def __init__(self, ip, puerto, expira, error=None):
+        self.ip = ip
+        self.puerto = puerto
+        self.expira = expira
+        self.error = error
+
+
+class CacheResolucion:
+    """Resuelve SRV + A/AAAA de servidores Minecraft y cachea el resultado según su TTL."""
+
+    def __init__(self, ttl_minimo=30, ttl_maximo=3600, ttl_negativo=20, timeout=3):
+        self.ttl_minimo = ttl_minimo
+        self.ttl_maximo = ttl_maximo
+        self.ttl_negativo = ttl_negativo
+        self.timeout = timeout
+        self.entradas = {}
+        self.pendientes = {}
+        self.consultas = 0
+        self.aciertos = 0
+        try:
+            self.resolutor = dns.asyncresolver.Resolver()
+            self.resolutor.lifetime = timeout
+        except dns.exception.DNSException:
+            # Sin configuración de DNS: se usa solo el resolutor del sistema
+            self.resolutor = None
+
+    async def resolver(self, host, puerto=None, forzar=False):
+        """Retorna (ip, puerto). Si no se indica puerto se consulta el registro SRV."""
+        if es_ip(host):
+            return host, puerto or PUERTO_DEFECTO
+
+        clave = (host.lower(), puerto)
+        entrada = self.entradas.get(clave)
+        if entrada is None or forzar or entrada.expira <= time.monotonic():
+            # Varias verificaciones simultáneas del mismo host comparten una sola consulta
+            tarea = self.pendientes.get(clave)
+            if tarea is None:
+                tarea = asyncio.ensure_future(self._resolver(clave, host, puerto))
+                self.pendientes[clave] = tarea
+                tarea.add_done_callback(lambda _: self.pendientes.pop(clave, None))
+            entrada = await asyncio.shield(tarea)
+        else:
+            self.aciertos += 1
+
+        if entrada.error:
+            raise ErrorResolucion(entrada.error)
+        return entrada.ip, entrada.puerto
+
+    def invalidar(self, host=None):
+        """Descarta la caché de un host (o toda) para forzar una nueva resolución."""
+        if host is None:
+            self.entradas.clear()
+            return
+        for clave in [clave for clave in self.entradas if clave[0] == host.lower()]:
+            del self.entradas[clave]
+
+    async def _resolver(self, clave, host, puerto):
+        """Hace la consulta real y guarda la entrada en la caché."""
+        self.consultas += 1
+        try:
+            destino, puerto_final, ttl = host, puerto or PUERTO_DEFECTO, self.ttl_maximo
+            if puerto is None:
+                srv = await self._buscar_srv(host)
+                if srv:
+                    destino, puerto_final, ttl = srv
+            ip, ttl_ip = await self._buscar_ip(destino)
+            ttl = max(self.ttl_minimo, min(ttl, ttl_ip, self.ttl_maximo))
+            entrada = EntradaResolucion(ip, puerto_final, time.monotonic() + ttl)
+        except ErrorResolucion as e:
+            entrada = EntradaResolucion(None, None, time.monotonic() + self.ttl_negativo, str(e))
+
+        self.entradas[clave] = entrada
+        return entrada
+
+    async def _buscar_srv(self, host):
+        """Retorna (destino, puerto, ttl) del registro _minecraft._tcp o None."""
+        if self.resolutor is None:
+            return None
+        try:
+            respuesta = await self.resolutor.resolve(f"_minecraft._tcp.{host}", "SRV")
+        except dns.exception.DNSException:
+            return None
+        registro = min(respuesta, key=lambda r: (r.priority, -r.weight))
+        return str(registro.target).rstrip('.'), registro.port, respuesta.rrset.ttl
+
+    async def _buscar_ip(self, host):
+        """Retorna (ip, ttl) del host."""
+        if es_ip(host):
+            return host, self.ttl_maximo
+
+        if self.resolutor is not None:
+            for tipo in ("A", "AAAA"):
+                try:
+                    respuesta = await self.resolutor.resolve(host, tipo)
+                    return respuesta[0].to_text(), respuesta.rrset.ttl
+                except dns.resolver.NoAnswer:
+                    continue
+                except dns.exception.DNSException:
+                    break
+
+        # Resolutor del sistema (archivo hosts, red local): no informa TTL
+        try:
+            loop = asyncio.get_running_loop()
+            direcciones = await asyncio.wait_for(
+                loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), self.timeout
+            )
+            return direcciones[0][4][0], self.ttl_minimo
+        except (OSError, asyncio.TimeoutError):
+            raise ErrorResolucion(f"No se pudo resolver {host}")
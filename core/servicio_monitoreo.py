@@ -0,0 +1,193 @@
+"""
+Servicio de monitoreo compartido
+Mantiene el motor corriendo en segundo plano y comparte estados e historial con los suscriptores
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+from core.importacion_servidores import validar_entradas
+from core.localizador_jugadores import LocalizadorJugadores
+from core.monitor_servidor import MonitorServidor, MotorMonitoreo
+from core.rcon import ClienteRcon
+from core.rendimiento_rcon import MonitorRendimiento
+
+
+SERVIDORES_POR_DEFECTO = {
+    "Staff": "staff.minelatino.com",
+    "Horus": "play.horusmc.net",
+    "BG 3": "bg3.minelatino.com",
+    "BG 4": "bg4.minelatino.com",
+    "BG 5": "bg5.minelatino.com"
+}
+
+_servicio = None
+_candado = threading.Lock()
+
+
+def obtener_servicio():
+    """Retorna la instancia única del servicio de monitoreo."""
+    global _servicio
+    with _candado:
+        if _servicio is None:
+            _servicio = ServicioMonitoreo()
+        return _servicio
+
+
+class ServicioMonitoreo:
+    """Motor de monitoreo único con caché de últimos estados y suscriptores."""
+
+    def __init__(self, config_file=None, intervalo_fondo=30):
+        if config_file is None:
+            if getattr(sys, 'frozen', False):
+                app_dir = os.path.dirname(sys.executable)
+            else:
+                app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            config_file = os.path.join(app_dir, "core", "monitor_config.json")
+
+        self.config_file = config_file
+        self.intervalo_fondo = intervalo_fondo
+        self.config = {}
+        self.servidores = {}
+        self.monitores = {}
+        self.estados = {}
+        self.suscriptores = []
+        self.motor = MotorMonitoreo(self._al_verificar)
+        self.localizador = LocalizadorJugadores(self)
+        self.rcon = ClienteRcon()
+        self.rendimiento = MonitorRendimiento(self)
+        self.cargar_config()
+
+    @property
+    def historial(self):
+        """Historial compartido de latencia y jugadores."""
+        return self.motor.historial
+
+    @property
+    def agregados(self):
+        """Agregados de uptime por hora y por día."""
+        return self.motor.agregados
+
+    def cargar_config(self):
+        """Carga la configuración desde el archivo JSON."""
+        try:
+            if os.path.exists(self.config_file):
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    config = json.load(f, object_pairs_hook=OrderedDict)
+                self.config = dict(config)
+                self.servidores = dict(config.get("servidores", SERVIDORES_POR_DEFECTO))
+                self.rcon.configurar(self.servidores, self.config.get("rcon"))
+                self.rendimiento.configurar(self.config.get("rendimiento"))
+                return self.servidores
+        except Exception as e:
+            print(f"Error al cargar config: {e}")
+
+        self.servidores = dict(SERVIDORES_POR_DEFECTO)
+        return self.servidores
+
+    def guardar_config(self, servidores=None):
+        """Guarda la configuración (con los servidores indicados, si se pasan) en el archivo JSON."""
+        if servidores is not None:
+            self.servidores = dict(servidores)
+        try:
+            config = dict(self.config)
+            config["servidores"] = self.servidores
+            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
+
+            with open(self.config_file, 'w', encoding='utf-8') as f:
+                json.dump(config, f, indent=4, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error al guardar config: {e}")
+
+    def iniciar(self):
+        """Arranca el motor (si no estaba corriendo) con los servidores de la configuración."""
+        if self.motor.hilo and self.motor.hilo.is_alive():
+            return
+        self.motor.iniciar()
+        self._aplicar_ritmo()
+        self.configurar(self.servidores)
+        # TPS/MSPT/memoria por RCON con su propio ritmo, más lento que el de las verificaciones
+        self.motor.ejecutar(self.rendimiento.bucle())
+
+    def detener(self):
+        """Cierra las conexiones RCON, detiene el motor y guarda el historial."""
+        if self.motor.loop and self.motor.hilo:
+            self.motor.loop.call_soon_threadsafe(self.rcon.cerrar)
+        self.motor.detener()
+
+    def configurar(self, servidores):
+        """Actualiza los servidores monitoreados conservando los monitores que no cambiaron."""
+        self.servidores = dict(servidores)
+        for nombre in list(self.monitores):
+            if self.servidores.get(nombre) != self.monitores[nombre].ip:
+                del self.monitores[nombre]
+                self.estados.pop(nombre, None)
+        for nombre, ip in self.servidores.items():
+            if nombre not in self.monitores:
+                self.monitores[nombre] = MonitorServidor(ip)
+
+        self.motor.configurar(self.monitores, self.config.get("intervalos", {}))
+        self.rcon.configurar(self.servidores, self.config.get("rcon"))
+
+    def estado(self, nombre):
+        """Retorna el último estado conocido de un servidor (sin verificarlo) o None."""
+        return self.estados.get(nombre)
+
+    def localizar_jugador(self, nick):
+        """Busca en qué servidores está un jugador. Retorna un Future con {servidor: nick}."""
+        self.iniciar()
+        return self.motor.ejecutar(self.localizador.localizar(nick))
+
+    def validar_servidores(self, entradas):
+        """Valida entradas importadas (DNS/SRV y estado) en el motor. Retorna un Future con las entradas."""
+        self.iniciar()
+        return self.motor.ejecutar(validar_entradas(entradas, self.motor.resolucion))
+
+    def reporte_uptime(self, periodo="dia"):
+        """Genera el CSV de uptime en el hilo del motor (sin carreras con las verificaciones). Retorna un Future."""
+        self.iniciar()
+
+        async def generar():
+            return self.agregados.reporte_csv(periodo, list(self.servidores))
+
+        return self.motor.ejecutar(generar())
+
+    def enviar_rcon(self, nombres, comandos):
+        """Envía comandos por RCON a varios servidores. Retorna un Future con {servidor: [ResultadoRcon]}."""
+        self.iniciar()
+        return self.motor.ejecutar(self.rcon.enviar_a_varios(list(nombres), list(comandos)))
+    
+    def suscribir(self, callback):
+        """Registra callback(nombre, estado), que se llama desde el hilo del motor."""
+        if callback not in self.suscriptores:
+            self.suscriptores.append(callback)
+        self._aplicar_ritmo(adelantar=len(self.suscriptores) == 1)
+
+    def desuscribir(self, callback):
+        """Quita un suscriptor. Sin suscriptores el motor verifica a ritmo bajo."""
+        if callback in self.suscriptores:
+            self.suscriptores.remove(callback)
+        self._aplicar_ritmo()
+
+    def _aplicar_ritmo(self, adelantar=False):
+        """Ajusta la frecuencia de verificación según haya o no alguien mirando."""
+        if self.suscriptores:
+            self.motor.cambiar_ritmo(1, adelantar)
+        else:
+            self.motor.cambiar_ritmo(self.intervalo_fondo / self.motor.planificador.intervalo_base)
+
+    def _al_verificar(self, nombre, estado):
+        """Guarda el resultado y lo reparte a los suscriptores (hilo del motor)."""
+        if nombre not in self.monitores:
+            return
+        estado["rendimiento"] = self.rendimiento.ultimos.get(nombre)
+        self.estados[nombre] = estado
+        for callback in tuple(self.suscriptores):
+            try:
+                callback(nombre, estado)
+            except RuntimeError:
+                # Ventana destruida entre la copia de la lista y el aviso
+                self.desuscribir(callback)
@@ -0,0 +1,246 @@
+"""
+Módulo de reconstrucción de sesiones de jugadores
+Empareja conexiones y desconexiones de los logs en una sola pasada
+"""
+
+import csv
+import os
+import re
+from collections import deque
+from datetime import datetime, timedelta
+
+from core.filtro_logs import abrir_log, fecha_de_archivo, PATRON_FECHA_ARCHIVO, RelojLogs
+
+
+PATRON_HORA = re.compile(r'^\[(\d{2}:\d{2}:\d{2})')
+
+PATRONES_ENTRADA = [
+    re.compile(r'\[CHAT\]\s*(?:\[[^\]]*\]\s*)*([A-Za-z0-9_]{2,16})\s+(?:se ha conectado|acaba de unirse)'),
+    re.compile(r'\]: ([A-Za-z0-9_]{2,16}) joined the game'),
+]
+
+PATRONES_SALIDA = [
+    re.compile(r'\[CHAT\]\s*(?:\[[^\]]*\]\s*)*([A-Za-z0-9_]{2,16})\s+(?:se ha desconectado|ha salido|abandonó)'),
+    re.compile(r'\]: ([A-Za-z0-9_]{2,16}) left the game'),
+]
+
+MARCAS_ENTRADA = ("se ha conectado", "acaba de unirse", "joined the game")
+MARCAS_SALIDA = ("se ha desconectado", "ha salido", "abandonó", "left the game")
+MARCAS_REINICIO = ("Stopping server", "Starting minecraft server")
+
+# Minutos de concurrencia que se conservan (los más recientes): la memoria no crece con el rango de los logs
+MINUTOS_CONCURRENCIA = 7 * 24 * 60
+
+
+def buscar_nick(linea, patrones):
+    """Retorna el nick del primer patrón que coincida o None."""
+    for patron in patrones:
+        match = patron.search(linea)
+        if match:
+            return match.group(1)
+    return None
+
+
+def formatear_duracion(segundos):
+    """Formatea segundos como 2h 05m."""
+    horas, resto = divmod(int(segundos), 3600)
+    return f"{horas}h {resto // 60:02d}m"
+
+
+class ResumenJugador:
+    """Tiempo online acumulado de un jugador."""
+
+    __slots__ = ("nick", "sesiones", "total", "mas_larga")
+
+    def __init__(self, nick):
+        self.nick = nick
+        self.sesiones = 0
+        self.total = 0
+        self.mas_larga = 0
+
+
+class AnalizadorSesiones:
+    """Reconstruye sesiones por jugador y cuenta jugadores conectados por minuto (últimos MINUTOS_CONCURRENCIA)."""
+
+    def __init__(self):
+        self.abiertas = {}
+        self.resumen = {}
+        self.concurrencia = deque(maxlen=MINUTOS_CONCURRENCIA)
+        self.minuto_actual = None
+        self.pico_minuto = 0
+        self.online = 0
+        self.salidas_huerfanas = 0
+        self.ultimo_momento = None
+        self.escritor = None
+
+    def base_archivo(self, ruta):
+        """Calcula la fecha del primer día de un archivo de log."""
+        base = datetime.combine(fecha_de_archivo(ruta), datetime.min.time())
+        if PATRON_FECHA_ARCHIVO.search(os.path.basename(ruta)):
+            return base
+        # latest.log: su última modificación es del último día; se retrocede un día por cada medianoche
+        return base - timedelta(days=self.dias_de_archivo(ruta))
+
+    def dias_de_archivo(self, ruta):
+        """Cuenta los cambios de día de un log (primera pasada, solo para los que no tienen fecha en el nombre)."""
+        reloj = RelojLogs()
+        with abrir_log(ruta) as f:
+            for linea in f:
+                match = PATRON_HORA.match(linea)
+                if match:
+                    reloj.segundos(match.group(1))
+        return reloj.dia
+
+    def avanzar_minuto(self, momento):
+        """Cierra el minuto anterior si el evento cae en otro minuto (antes de cambiar `online`)."""
+        minuto = momento.replace(second=0, microsecond=0)
+        if minuto == self.minuto_actual:
+            return
+        if self.minuto_actual is not None:
+            self.concurrencia.append((self.minuto_actual, self.pico_minuto))
+            # Minutos sin eventos: quedan conectados los mismos jugadores
+            sin_eventos = int((minuto - self.minuto_actual).total_seconds() // 60) - 1
+            for atras in range(min(sin_eventos, MINUTOS_CONCURRENCIA), 0, -1):
+                self.concurrencia.append((minuto - timedelta(minutes=atras), self.online))
+        self.minuto_actual = minuto
+        self.pico_minuto = self.online
+
+    def registrar_concurrencia(self):
+        """Actualiza el máximo de jugadores conectados del minuto en curso."""
+        self.pico_minuto = max(self.pico_minuto, self.online)
+
+    def abrir(self, nick, momento):
+        """Registra una conexión."""
+        clave = nick.lower()
+        if clave in self.abiertas:
+            # Falta la desconexión anterior: se cierra en la nueva conexión
+            self.cerrar(nick, momento, "incompleta")
+        self.abiertas[clave] = (nick, momento)
+        self.avanzar_minuto(momento)
+        self.online += 1
+        self.registrar_concurrencia()
+
+    def cerrar(self, nick, momento, estado="completa"):
+        """Registra una desconexión y emite la sesión."""
+        sesion = self.abiertas.pop(nick.lower(), None)
+        if sesion is None:
+            self.salidas_huerfanas += 1
+            return
+        nick, inicio = sesion
+        self.avanzar_minuto(momento)
+        self.online -= 1
+        self.registrar_concurrencia()
+
+        duracion = max(0, (momento - inicio).total_seconds())
+        resumen = self.resumen.get(nick.lower())
+        if resumen is None:
+            resumen = self.resumen[nick.lower()] = ResumenJugador(nick)
+        resumen.sesiones += 1
+        resumen.total += duracion
+        resumen.mas_larga = max(resumen.mas_larga, duracion)
+
+        if self.escritor:
+            self.escritor.writerow([nick, inicio, momento, int(duracion), estado])
+
+    def cerrar_todas(self, momento, estado):
+        """Cierra todas las sesiones abiertas (reinicio del servidor o fin de los logs)."""
+        for nick, _ in list(self.abiertas.values()):
+            self.cerrar(nick, momento, estado)
+
+    def procesar_archivo(self, ruta):
+        """Procesa un archivo de log en streaming."""
+        reloj = RelojLogs()
+        base = self.base_archivo(ruta)
+
+        with abrir_log(ruta) as f:
+            for linea in f:
+                match = PATRON_HORA.match(linea)
+                if not match:
+                    continue
+                # Todas las líneas con hora mueven el reloj, igual que en la primera pasada de dias_de_archivo
+                segundos = reloj.segundos(match.group(1))
+
+                entrada = any(marca in linea for marca in MARCAS_ENTRADA)
+                salida = not entrada and any(marca in linea for marca in MARCAS_SALIDA)
+                reinicio = not entrada and not salida and any(marca in linea for marca in MARCAS_REINICIO)
+                if not (entrada or salida or reinicio):
+                    continue
+
+                momento = base + timedelta(seconds=segundos)
+                self.ultimo_momento = momento
+
+                if reinicio:
+                    self.cerrar_todas(momento, "reinicio")
+                elif entrada:
+                    nick = buscar_nick(linea, PATRONES_ENTRADA)
+                    if nick:
+                        self.abrir(nick, momento)
+                else:
+                    nick = buscar_nick(linea, PATRONES_SALIDA)
+                    if nick:
+                        self.cerrar(nick, momento)
+
+    def analizar_archivos(self, archivos, salida_sesiones=None):
+        """Analiza los archivos en orden. Las sesiones se escriben a un CSV a medida que se cierran."""
+        archivo_csv = None
+        try:
+            if salida_sesiones:
+                archivo_csv = open(salida_sesiones, 'w', encoding='utf-8', newline='')
+                self.escritor = csv.writer(archivo_csv)
+                self.escritor.writerow(["jugador", "inicio", "fin", "segundos", "estado"])
+
+            for archivo in archivos:
+                self.procesar_archivo(archivo)
+
+            if self.ultimo_momento:
+                self.cerrar_todas(self.ultimo_momento, "abierta")
+        finally:
+            if archivo_csv:
+                archivo_csv.close()
+            self.escritor = None
+
+        return self.ranking()
+
+    def ranking(self, top=None):
+        """Retorna los resúmenes ordenados por tiempo online."""
+        ranking = sorted(self.resumen.values(), key=lambda resumen: resumen.total, reverse=True)
+        return ranking[:top] if top else ranking
+
+    def concurrencia_por_minuto(self):
+        """Retorna [(minuto, jugadores)] de los últimos MINUTOS_CONCURRENCIA minutos, incluido el minuto en curso."""
+        minutos = list(self.concurrencia)
+        if self.minuto_actual is not None:
+            minutos.append((self.minuto_actual, self.pico_minuto))
+        return minutos[-MINUTOS_CONCURRENCIA:]
+
+    def picos_por_hora(self):
+        """Retorna [(hora, pico de jugadores)] calculados a partir de la concurrencia por minuto."""
+        picos = {}
+        # Si los logs se solapan puede repetirse un minuto: se queda el mayor
+        for minuto, jugadores in self.concurrencia_por_minuto():
+            hora = minuto.replace(minute=0)
+            picos[hora] = max(picos.get(hora, 0), jugadores)
+        return sorted(picos.items())
+
+    def guardar_reporte(self, archivo_salida, top=100):
+        """Guarda el resumen de tiempo online y los picos de jugadores por hora."""
+        with open(archivo_salida, 'w', encoding='utf-8') as f:
+            f.write("="*80 + "\n")
+            f.write("TIEMPO ONLINE POR JUGADOR\n")
+            f.write("="*80 + "\n\n")
+
+            for posicion, resumen in enumerate(self.ranking(top), 1):
+                f.write(
+                    f"{posicion}. {resumen.nick}: {formatear_duracion(resumen.total)} "
+                    f"en {resumen.sesiones} sesiones (más larga: {formatear_duracion(resumen.mas_larga)})\n"
+                )
+
+            f.write("\n" + "="*80 + "\n")
+            f.write(f"PICO DE JUGADORES CONECTADOS POR HORA (últimos {MINUTOS_CONCURRENCIA // 1440} días)\n")
+            f.write("="*80 + "\n\n")
+
+            for hora, jugadores in self.picos_por_hora():
+                f.write(f"  {hora:%Y-%m-%d %H:00}  {jugadores}\n")
+
+            if self.salidas_huerfanas:
+                f.write(f"\n⚠️  Desconexiones sin conexión previa: {self.salidas_huerfanas}\n")
@@ -0,0 +1,4 @@
+"""
+Herramientas de desarrollo de Minecraft Staff Tools
+Servidores falsos y benchmarks para medir el monitor sin tocar servidores reales
+"""
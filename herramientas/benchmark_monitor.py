@@ -0,0 +1,123 @@
+"""
+Benchmark del motor de monitoreo contra servidores falsos locales
+Reporta verificaciones por segundo, latencia de cola, hilos y CPU
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from core.agregados_uptime import AgregadosMonitor
+from core.historial_servidores import HistorialMonitor
+from core.monitor_servidor import MonitorServidor, MotorMonitoreo
+from herramientas.servidor_falso_slp import leer_proporciones
+
+
+def percentil(valores, p):
+    """Percentil p (0-100) de una lista ordenada."""
+    if not valores:
+        return 0.0
+    indice = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+def tiempo_cpu():
+    """Segundos de CPU (usuario + sistema) del proceso."""
+    tiempos = os.times()
+    return tiempos.user + tiempos.system
+
+
+def levantar_flota(cantidad, latencia, modos):
+    """Levanta la flota en otro proceso (para no mezclar su CPU). Retorna (proceso, [(puerto, modo)])."""
+    comando = [
+        sys.executable, "-m", "herramientas.servidor_falso_slp",
+        "--cantidad", str(cantidad), "--latencia", str(latencia), "--modos", modos,
+    ]
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proceso = subprocess.Popen(comando, cwd=raiz, stdout=subprocess.PIPE, text=True)
+    flota = []
+    for linea in proceso.stdout:
+        if linea.startswith("LISTO"):
+            break
+        puerto, modo = linea.split()
+        flota.append((int(puerto), modo))
+    return proceso, flota
+
+
+def medir(cantidad, rondas, latencia, modos, timeout, max_concurrentes):
+    """Corre `rondas` verificaciones de toda la flota y retorna las mediciones."""
+    proceso, flota = levantar_flota(cantidad, latencia, modos)
+    try:
+        monitores = {f"falso{puerto}": MonitorServidor(f"127.0.0.1:{puerto}", timeout=timeout) for puerto, _ in flota}
+        duraciones = []
+        estados = {}
+        recibidos = threading.Event()
+        candado = threading.Lock()
+
+        def al_verificar(nombre, estado):
+            with candado:
+                duraciones.append(estado["duracion"])
+                estados[estado["tipo"].name] = estados.get(estado["tipo"].name, 0) + 1
+                if len(duraciones) % len(monitores) == 0:
+                    recibidos.set()
+
+        motor = MotorMonitoreo(al_verificar, max_concurrentes, historial=HistorialMonitor(archivo=""),
+                               agregados=AgregadosMonitor(archivo=""))
+        motor.iniciar()
+        hilos = threading.active_count()
+        cpu = tiempo_cpu()
+        inicio = time.perf_counter()
+        for _ in range(rondas):
+            recibidos.clear()
+            motor.verificar_todos(monitores)
+            recibidos.wait(timeout * 3 + 30)
+        total = time.perf_counter() - inicio
+        cpu = tiempo_cpu() - cpu
+        motor.detener()
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+    duraciones.sort()
+    return {
+        "servidores": cantidad,
+        "verificaciones": len(duraciones),
+        "por_segundo": len(duraciones) / total if total else 0,
+        "p50": percentil(duraciones, 50) * 1000,
+        "p95": percentil(duraciones, 95) * 1000,
+        "p99": percentil(duraciones, 99) * 1000,
+        "maximo": (duraciones[-1] if duraciones else 0) * 1000,
+        "hilos": hilos,
+        "cpu": cpu / total * 100 if total else 0,
+        "estados": estados,
+    }
+
+
+def main():
+    """Corre el benchmark para cada tamaño de flota e imprime una tabla."""
+    parser = argparse.ArgumentParser(description="Benchmark del monitor de servidores")
+    parser.add_argument("--tamanos", default="10,100,1000", help="Cantidades de servidores (por defecto 10,100,1000)")
+    parser.add_argument("--rondas", type=int, default=3)
+    parser.add_argument("--latencia", type=float, default=5, help="Latencia simulada en ms")
+    parser.add_argument("--modos", default="normal=1",
+                        help="Proporción de modos, p. ej. normal=85,lento=5,timeout=4,cerrado=3,malformado=3")
+    parser.add_argument("--timeout", type=float, default=2, help="Timeout de cada verificación en segundos")
+    parser.add_argument("--concurrencia", type=int, default=50, help="Verificaciones simultáneas del motor")
+    args = parser.parse_args()
+    leer_proporciones(args.modos)
+
+    print(f"{'servidores':>10} {'verif/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'hilos':>6} {'CPU %':>6}  estados")
+    for cantidad in (int(valor) for valor in args.tamanos.split(',')):
+        r = medir(cantidad, args.rondas, args.latencia, args.modos, args.timeout, args.concurrencia)
+        estados = ", ".join(f"{tipo}={n}" for tipo, n in sorted(r["estados"].items()))
+        print(
+            f"{r['servidores']:>10} {r['por_segundo']:>9.1f} {r['p50']:>8.1f} {r['p95']:>8.1f} "
+            f"{r['p99']:>8.1f} {r['maximo']:>8.1f} {r['hilos']:>6} {r['cpu']:>6.1f}  {estados}"
+        )
+
+
+if __name__ == "__main__":
+    main()
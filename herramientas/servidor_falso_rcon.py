@@ -0,0 +1,147 @@
+"""
+Servidor RCON falso en localhost
+Lee los paquetes como el RconClient de vanilla (una lectura por paquete) y parte las respuestas largas igual
+"""
+
+import argparse
+import asyncio
+import struct
+
+from core.rcon import MAXIMO_CUERPO, TIPO_COMANDO, TIPO_LOGIN, empaquetar
+
+
+# Vanilla lee cada paquete con una sola lectura de hasta 1460 bytes
+TAMANO_LECTURA = 1460
+
+
+class ServidorFalsoRcon:
+    """Atiende conexiones RCON como un servidor de Minecraft."""
+
+    def __init__(self, password="falso", latencia=0.0, jugadores=("Jugador1", "Jugador2"),
+                 tps=19.87, mspt=12.3, memoria=3072):
+        self.password = password
+        self.latencia = latencia
+        self.jugadores = list(jugadores)
+        self.tps = tps
+        self.mspt = mspt
+        self.memoria = memoria
+        self.servidor = None
+        self.puerto = None
+        self.conexiones = set()
+        self.comandos = []
+        self.autenticaciones = 0
+        self.rechazos = 0
+
+    async def iniciar(self, host="127.0.0.1", puerto=0):
+        """Abre el puerto. Retorna el puerto."""
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    async def detener(self):
+        """Cierra el puerto y las conexiones abiertas."""
+        self.cortar_conexiones()
+        if self.servidor:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+
+    def cortar_conexiones(self):
+        """Corta las conexiones abiertas (simula un reinicio del servidor)."""
+        for writer in list(self.conexiones):
+            writer.close()
+        self.conexiones.clear()
+
+    def responder(self, comando):
+        """Texto de respuesta a un comando."""
+        partes = comando.split()
+        if not partes:
+            return ""
+        if partes[0] == "list":
+            return (f"There are {len(self.jugadores)} of a max of 100 players online: "
+                    + ", ".join(self.jugadores))
+        if partes[0] == "tps":
+            return f"§6TPS from last 1m, 5m, 15m: §a{self.tps:.2f}, §a20.0, §a20.0"
+        if partes[0] == "mspt":
+            return ("§6Server tick times §e(§7avg§e/§7min§e/§7max§e)§6 from last 5s§7,§6 10s§7,§6 1m§e:\n"
+                    f"§6◴ §a{self.mspt:.1f}§7/§a0.5§7/§a30.2§7, §a10.0§7/§a0.5§7/§a30.2§7, §a10.0§7/§a0.5§7/§a30.2")
+        if partes[0] == "gc":
+            return ("§6Uptime:§c 1 hour\n§6Maximum memory:§c 8,192 MB.\n"
+                    f"§6Allocated memory:§c {self.memoria + 1024:,} MB.\n§6Free memory:§c 1,024 MB.")
+        if partes[0] == "largo" and len(partes) > 1 and partes[1].isdigit():
+            return "x" * int(partes[1])
+        return f"Ejecutado: {comando}"
+
+    def _interpretar(self, datos):
+        """Retorna (id, tipo, cuerpo) de una lectura o None si no es exactamente un paquete.
+
+        Como vanilla: si la lectura trae más (o menos) que el largo declarado, la conexión se cierra.
+        """
+        if len(datos) < 14:
+            return None
+        largo, id_paquete, tipo = struct.unpack_from('<iii', datos)
+        if largo != len(datos) - 4:
+            return None
+        return id_paquete, tipo, datos[12:-2].decode('utf-8', 'replace')
+
+    async def _atender(self, reader, writer):
+        """Atiende una conexión."""
+        self.conexiones.add(writer)
+        autenticado = False
+        try:
+            while True:
+                datos = await reader.read(TAMANO_LECTURA)
+                if not datos:
+                    break
+                paquete = self._interpretar(datos)
+                if paquete is None:
+                    self.rechazos += 1
+                    break
+                id_paquete, tipo, cuerpo = paquete
+                if tipo == TIPO_LOGIN:
+                    autenticado = cuerpo == self.password
+                    self.autenticaciones += autenticado
+                    writer.write(empaquetar(id_paquete if autenticado else -1, TIPO_COMANDO, ""))
+                elif not autenticado:
+                    writer.write(empaquetar(-1, TIPO_COMANDO, ""))
+                elif tipo == TIPO_COMANDO:
+                    self.comandos.append(cuerpo)
+                    if self.latencia:
+                        await asyncio.sleep(self.latencia)
+                    texto = self.responder(cuerpo)
+                    for inicio in range(0, max(len(texto), 1), MAXIMO_CUERPO):
+                        writer.write(empaquetar(id_paquete, 0, texto[inicio:inicio + MAXIMO_CUERPO]))
+                else:
+                    # Igual que Minecraft: los tipos desconocidos también reciben respuesta
+                    writer.write(empaquetar(id_paquete, 0, f"Unknown request {tipo:x}"))
+                await writer.drain()
+        except (OSError, asyncio.CancelledError):
+            pass
+        finally:
+            self.conexiones.discard(writer)
+            writer.close()
+
+
+async def _principal(args):
+    servidor = ServidorFalsoRcon(args.password, args.latencia / 1000)
+    puerto = await servidor.iniciar(args.host, args.puerto)
+    print(f"{puerto} rcon")
+    print("LISTO", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    """Levanta un servidor RCON falso e imprime su puerto."""
+    parser = argparse.ArgumentParser(description="Servidor RCON falso")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=0)
+    parser.add_argument("--password", default="falso")
+    parser.add_argument("--latencia", type=float, default=0, help="Demora simulada por comando en ms")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_principal(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
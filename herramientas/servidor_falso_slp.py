@@ -0,0 +1,156 @@
+"""
+Servidores falsos de Server List Ping en localhost
+Simulan latencia, timeouts, puertos cerrados y respuestas malformadas
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+
+from core.protocolo_minecraft import leer_paquete, empaquetar, escribir_string
+
+
+MODOS = ("normal", "lento", "timeout", "cerrado", "malformado")
+
+
+def puerto_libre(host="127.0.0.1"):
+    """Retorna un puerto TCP libre (sin dejarlo abierto: queda 'cerrado')."""
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+class ServidorFalsoSLP:
+    """Responde el Server List Ping según el modo elegido."""
+
+    def __init__(self, modo="normal", latencia=0.0, jugadores=10, maximo=100):
+        if modo not in MODOS:
+            raise ValueError(f"Modo desconocido: {modo}")
+        self.modo = modo
+        self.latencia = latencia
+        self.jugadores = jugadores
+        self.maximo = maximo
+        self.servidor = None
+        self.puerto = None
+        self.atendidas = 0
+
+    async def iniciar(self, host="127.0.0.1", puerto=0):
+        """Abre el puerto (salvo en modo 'cerrado'). Retorna el puerto."""
+        if self.modo == "cerrado":
+            self.puerto = puerto or puerto_libre(host)
+            return self.puerto
+        self.servidor = await asyncio.start_server(self._atender, host, puerto, backlog=1024)
+        self.puerto = self.servidor.sockets[0].getsockname()[1]
+        return self.puerto
+
+    async def detener(self):
+        """Cierra el puerto."""
+        if self.servidor:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+
+    def respuesta(self):
+        """JSON de estado del servidor falso."""
+        return {
+            "version": {"name": "Falso 1.20", "protocol": 763},
+            "players": {
+                "online": self.jugadores,
+                "max": self.maximo,
+                "sample": [{"name": f"Jugador{i}", "id": f"00000000-0000-0000-0000-{i:012d}"}
+                           for i in range(min(self.jugadores, 12))],
+            },
+            "description": {"text": f"Servidor falso ({self.modo})"},
+        }
+
+    async def _atender(self, reader, writer):
+        """Atiende una conexión."""
+        self.atendidas += 1
+        try:
+            await leer_paquete(reader)  # handshake
+            await leer_paquete(reader)  # pedido de estado
+
+            if self.modo == "timeout":
+                # Acepta la conexión pero nunca responde
+                await reader.read()
+                return
+            if self.latencia:
+                await asyncio.sleep(self.latencia)
+            if self.modo == "malformado":
+                writer.write(empaquetar(0x00, escribir_string("{no es json")))
+                await writer.drain()
+                return
+
+            writer.write(empaquetar(0x00, escribir_string(json.dumps(self.respuesta()))))
+            await writer.drain()
+
+            paquete_id, datos = await leer_paquete(reader)  # ping
+            if self.latencia:
+                await asyncio.sleep(self.latencia)
+            writer.write(empaquetar(0x01, datos))
+            await writer.drain()
+        except (OSError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def repartir_modos(cantidad, proporciones):
+    """Reparte `cantidad` servidores entre modos según {modo: proporción}."""
+    total = sum(proporciones.values()) or 1
+    modos = []
+    for modo, proporcion in proporciones.items():
+        modos.extend([modo] * round(cantidad * proporcion / total))
+    modos = (modos + ["normal"] * cantidad)[:cantidad]
+    random.Random(cantidad).shuffle(modos)
+    return modos
+
+
+async def iniciar_flota(cantidad, host="127.0.0.1", latencia=0.005, proporciones=None):
+    """Levanta `cantidad` servidores falsos. Retorna la lista de ServidorFalsoSLP."""
+    modos = repartir_modos(cantidad, proporciones or {"normal": 1})
+    flota = [ServidorFalsoSLP(modo, latencia * (10 if modo == "lento" else 1)) for modo in modos]
+    # Los puertos 'cerrado' se eligen al final para que ningún otro servidor los ocupe
+    for servidor in sorted(flota, key=lambda servidor: servidor.modo == "cerrado"):
+        await servidor.iniciar(host)
+    return flota
+
+
+def leer_proporciones(texto):
+    """Convierte 'normal=80,timeout=5' en {modo: proporción}."""
+    proporciones = {}
+    for parte in texto.split(','):
+        modo, _, valor = parte.partition('=')
+        modo = modo.strip()
+        if modo not in MODOS:
+            raise argparse.ArgumentTypeError(f"Modo desconocido: {modo}")
+        proporciones[modo] = float(valor or 1)
+    return proporciones
+
+
+async def _principal(args):
+    flota = await iniciar_flota(args.cantidad, args.host, args.latencia / 1000, args.modos)
+    for servidor in flota:
+        print(f"{servidor.puerto} {servidor.modo}")
+    print("LISTO", flush=True)
+    await asyncio.Event().wait()
+
+
+def main():
+    """Levanta una flota de servidores falsos e imprime 'puerto modo' de cada uno."""
+    parser = argparse.ArgumentParser(description="Servidores falsos de Server List Ping")
+    parser.add_argument("--cantidad", type=int, default=10)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--latencia", type=float, default=5, help="Latencia simulada en ms (x10 en modo 'lento')")
+    parser.add_argument("--modos", type=leer_proporciones, default={"normal": 1},
+                        help="Proporción de cada modo, p. ej. normal=85,lento=5,timeout=4,cerrado=3,malformado=3")
+    args = parser.parse_args()
+    try:
+        asyncio.run(_principal(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
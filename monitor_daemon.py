@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Minecraft Staff Tools - Monitor sin interfaz
+Monitorea los servidores de monitor_config.json y expone /metrics para Prometheus
+"""
+
+import argparse
+import signal
+import threading
+
+from core.metricas_prometheus import ServidorMetricas
+from core.servicio_monitoreo import ServicioMonitoreo
+
+
+def main():
+    """Función principal del monitor sin interfaz."""
+    parser = argparse.ArgumentParser(description="Monitor de servidores sin interfaz con métricas de Prometheus")
+    parser.add_argument("--config", help="Ruta de monitor_config.json (por defecto la de la aplicación)")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección del endpoint /metrics (por defecto 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=9465, help="Puerto del endpoint /metrics (por defecto 9465)")
+    args = parser.parse_args()
+
+    servicio = ServicioMonitoreo(args.config)
+    metricas = ServidorMetricas(servicio, args.host, args.puerto)
+    # Las métricas cuentan como suscriptor: el motor verifica al ritmo normal
+    servicio.suscribir(metricas.registrar)
+    servicio.iniciar()
+
+    try:
+        servicio.motor.ejecutar(metricas.iniciar()).result(timeout=10)
+    except OSError as e:
+        print(f"Error al abrir el puerto de métricas: {e}")
+        servicio.detener()
+        return 1
+
+    print(f"Monitoreando {len(servicio.servidores)} servidores - métricas en http://{args.host}:{args.puerto}/metrics")
+
+    salir = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: salir.set())
+    signal.signal(signal.SIGTERM, lambda *_: salir.set())
+    while not salir.wait(1):
+        pass
+
+    print("Deteniendo monitor...")
+    servicio.motor.ejecutar(metricas.detener()).result(timeout=5)
+    servicio.detener()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                               QListWidget, QListWidgetItem, QTextEdit, QMessageBox)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QFont
+from core.servicio_monitoreo import obtener_servicio
+
+
+class EnvioRconDialog(QDialog):
+    """Elige servidores y les envía comandos por RCON mostrando el resultado de cada uno."""
+
+    envio_terminado = Signal(object)
+
+    def __init__(self, comandos, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Enviar por RCON - Minecraft Staff Tools")
+        self.setFixedSize(500, 520)
+        self.comandos = list(comandos)
+        self.servicio = obtener_servicio()
+        self.envio_terminado.connect(self.mostrar_resultados)
+        self.crear_ui()
+
+    def crear_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        etiqueta = QLabel("💻 Comando:" if len(self.comandos) == 1 else f"💻 {len(self.comandos)} comandos:")
+        etiqueta.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        layout.addWidget(etiqueta)
+
+        if len(self.comandos) == 1:
+            comandos = QLabel(self.comandos[0])
+            comandos.setWordWrap(True)
+            comandos.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        else:
+            # Un lote puede tener decenas de comandos: van en un cuadro con scroll
+            comandos = QTextEdit("\n".join(self.comandos))
+            comandos.setReadOnly(True)
+            comandos.setMaximumHeight(100)
+        comandos.setFont(QFont("Consolas", 10))
+        layout.addWidget(comandos)
+
+        layout.addWidget(QLabel("🖥️ Servidores con RCON configurado:"))
+        self.lista = QListWidget()
+        for nombre in self.servicio.rcon.servidores():
+            item = QListWidgetItem(nombre)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            self.lista.addItem(item)
+        layout.addWidget(self.lista)
+
+        if not self.lista.count():
+            aviso = QLabel("No hay servidores con RCON. Agrega la sección \"rcon\" en core/monitor_config.json.")
+            aviso.setWordWrap(True)
+            aviso.setStyleSheet("color: gray;")
+            layout.addWidget(aviso)
+
+        self.text_resultados = QTextEdit()
+        self.text_resultados.setReadOnly(True)
+        self.text_resultados.setMaximumHeight(140)
+        self.text_resultados.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.text_resultados)
+
+        botones_layout = QHBoxLayout()
+
+        btn_todos = QPushButton("☑️ Todos")
+        btn_todos.setMinimumHeight(35)
+        btn_todos.setCursor(Qt.PointingHandCursor)
+        btn_todos.clicked.connect(self.marcar_todos)
+        botones_layout.addWidget(btn_todos)
+
+        self.btn_enviar = QPushButton("📡 Enviar")
+        self.btn_enviar.setMinimumHeight(35)
+        self.btn_enviar.setCursor(Qt.PointingHandCursor)
+        self.btn_enviar.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                font-weight: bold;
+                font-size: 11pt;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background-color: #F57C00; }
+            QPushButton:disabled { background-color: #BDBDBD; }
+        """)
+        self.btn_enviar.clicked.connect(self.enviar)
+        botones_layout.addWidget(self.btn_enviar)
+
+        layout.addLayout(botones_layout)
+
+    def seleccionados(self):
+        """Nombres de los servidores marcados."""
+        return [self.lista.item(i).text() for i in range(self.lista.count())
+                if self.lista.item(i).checkState() == Qt.Checked]
+
+    def marcar_todos(self):
+        """Marca todos los servidores (o los desmarca si ya estaban todos marcados)."""
+        estado = Qt.Unchecked if len(self.seleccionados()) == self.lista.count() else Qt.Checked
+        for i in range(self.lista.count()):
+            self.lista.item(i).setCheckState(estado)
+
+    def enviar(self):
+        """Envía los comandos a los servidores marcados, todos a la vez."""
+        nombres = self.seleccionados()
+        if not nombres:
+            QMessageBox.warning(self, "Advertencia", "Selecciona al menos un servidor")
+            return
+
+        self.btn_enviar.setEnabled(False)
+        self.text_resultados.setPlainText(f"⏳ Enviando a {len(nombres)} servidor(es)...")
+        futuro = self.servicio.enviar_rcon(nombres, self.comandos)
+        # El resultado llega en el hilo del motor; la señal lo pasa al hilo de la UI
+        futuro.add_done_callback(self._al_terminar)
+
+    def _al_terminar(self, futuro):
+        try:
+            self.envio_terminado.emit(futuro.result())
+        except Exception as e:
+            self.envio_terminado.emit(e)
+
+    def mostrar_resultados(self, resultados):
+        """Muestra el resultado de cada servidor."""
+        self.btn_enviar.setEnabled(True)
+        if isinstance(resultados, Exception):
+            self.text_resultados.setPlainText(f"❌ Error al enviar: {resultados}")
+            return
+
+        lineas = []
+        for nombre, lista in resultados.items():
+            for resultado in lista:
+                icono = "✅" if resultado.ok else "❌"
+                respuesta = resultado.respuesta.strip() or "(sin respuesta)"
+                lineas.append(f"{icono} {nombre}: {respuesta}")
+        self.text_resultados.setPlainText("\n".join(lineas))
@@ -1,78 +1,48 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
                                QPushButton, QLineEdit, QComboBox, QTextEdit,
-                               QGroupBox, QWidget, QMessageBox, QListView)
+                               QGroupBox, QWidget, QMessageBox, QListView, QListWidget)
 from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import QFont, QGuiApplication
 import sys
 import os
-import json
+import time
+from core.registro_sanciones import obtener_registro
+from core.reglas_sanciones import ErrorConfigSanciones, ErrorSancion, ReglasSanciones, obtener_reglas
 from core.theme_manager import theme_manager
+from ui.envio_rcon_ui import EnvioRconDialog
+from ui.lote_sanciones_ui import LoteSancionesDialog
 
 
 class GeneradorSancionesWindow(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Generador de Sanciones - Minecraft Staff Tools")
-        self.setFixedSize(600, 750)
+        self.setFixedSize(600, 970)
         if getattr(sys, 'frozen', False):
             app_dir = os.path.dirname(sys.executable)
         else:
             app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         
         self.config_file = os.path.join(app_dir, "core", "sanciones_config.json")
+        self.registro = obtener_registro()
+        # (nick, tipo, motivo, tiempo, modalidad) del comando mostrado, para registrarlo al usarlo
+        self.datos_comando = None
+        self.tiempo_sugerido = None
         self.cargar_config()        
         self.crear_ui()
     
     def cargar_config(self):
-        """Carga la configuración desde JSON."""
-        if not os.path.exists(self.config_file):
-            QMessageBox.critical(
-                self, 
-                "Error de Configuración",
-                f"No se encontró el archivo de configuración:\n{self.config_file}\n\n"
-                "Por favor, asegúrate de que el archivo 'sanciones_config.json' existe en la carpeta 'core'."
-            )
-            self.tiempos_por_motivo = {}
-            self.sanciones_config = {}
-            self.modalidades = []
-            return
-        
+        """Obtiene las reglas de sanción (el archivo se relee solo si cambió)."""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config = json.load(f)
-                self.tiempos_por_motivo = config.get("tiempos_por_motivo", {})
-                self.sanciones_config = config.get("sanciones_config", {})
-                self.modalidades = config.get("modalidades", [])
-        except Exception as e:
+            self.reglas = obtener_reglas(self.config_file)
+        except ErrorConfigSanciones as e:
             QMessageBox.critical(
                 self,
-                "Error de Configuración", 
-                f"Error al leer el archivo de configuración:\n{e}"
+                "Error de Configuración",
+                f"{e}\n\n"
+                "Por favor, asegúrate de que el archivo 'sanciones_config.json' existe en la carpeta 'core'."
             )
-            self.tiempos_por_motivo = {}
-            self.sanciones_config = {}
-            self.modalidades = []
-    
-    def guardar_config(self):
-        """Guarda la configuración actual en JSON."""
-        try:
-            config = {
-                "tiempos_por_motivo": self.tiempos_por_motivo,
-                "sanciones_config": self.sanciones_config,
-                "modalidades": self.modalidades
-            }
-            
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error al guardar config de sanciones: {e}")
-    
-    def closeEvent(self, event):
-        """Guardar al cerrar la ventana."""
-        self.guardar_config()
-        event.accept()
+            self.reglas = ReglasSanciones(self.config_file)
     
     def _configurar_combobox(self, combo):
         """Configura un QComboBox con estilos que fuerzan texto negro en el dropdown."""
@@ -146,7 +116,7 @@ class GeneradorSancionesWindow(QDialog):
         layout_sancion = QVBoxLayout(grupo_sancion)
         
         self.tipo_sancion = QComboBox()
-        self.tipo_sancion.addItems(list(self.sanciones_config.keys()))
+        self.tipo_sancion.addItems(list(self.reglas.sanciones))
         self.tipo_sancion.setFont(QFont("Segoe UI", 10))
         self._configurar_combobox(self.tipo_sancion)
         self.tipo_sancion.currentTextChanged.connect(self.on_sancion_change)
@@ -175,11 +145,30 @@ class GeneradorSancionesWindow(QDialog):
                 border: 2px solid rgba(255, 255, 255, 0.5);
             }}
         """)
-        self.entry_nick.textChanged.connect(self.generar_comando)
+        self.entry_nick.textChanged.connect(self.on_nick_change)
         layout_nick.addWidget(self.entry_nick)
         
         layout.addWidget(grupo_nick)
 
+        #Historial del jugador
+        grupo_historial = QGroupBox("📜 Historial del Jugador")
+        grupo_historial.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        grupo_historial.setStyleSheet(f"QGroupBox {{ color: {theme_manager.get_text_color()}; background: transparent; }}")
+        layout_historial = QVBoxLayout(grupo_historial)
+
+        self.lbl_historial = QLabel("Escribe un nick para ver sus sanciones anteriores")
+        self.lbl_historial.setFont(QFont("Segoe UI", 9))
+        self.lbl_historial.setStyleSheet(f"color: {theme_manager.get_text_alpha(0.8)}; background: transparent;")
+        layout_historial.addWidget(self.lbl_historial)
+
+        self.lista_historial = QListWidget()
+        self.lista_historial.setMaximumHeight(90)
+        self.lista_historial.setFont(QFont("Segoe UI", 9))
+        self.lista_historial.setStyleSheet("background: white; color: black; border-radius: 5px;")
+        layout_historial.addWidget(self.lista_historial)
+
+        layout.addWidget(grupo_historial)
+
         #Tiempo (condicional)
         self.grupo_tiempo = QGroupBox("⏱️ Tiempo de Sanción")
         self.grupo_tiempo.setFont(QFont("Segoe UI", 10, QFont.Bold))
@@ -213,6 +202,13 @@ class GeneradorSancionesWindow(QDialog):
         tiempo_layout.addStretch()
         
         layout_tiempo.addLayout(tiempo_layout)
+
+        self.lbl_escalado = QLabel("")
+        self.lbl_escalado.setFont(QFont("Segoe UI", 9))
+        self.lbl_escalado.setWordWrap(True)
+        self.lbl_escalado.setStyleSheet("color: #FF9800; background: transparent;")
+        self.lbl_escalado.hide()
+        layout_tiempo.addWidget(self.lbl_escalado)
         
         layout.addWidget(self.grupo_tiempo)
         self.grupo_tiempo.hide()
@@ -262,7 +258,7 @@ class GeneradorSancionesWindow(QDialog):
         
         self.modalidad_combo = QComboBox()
         # Primero las modalidades, Global al final
-        self.modalidad_combo.addItems(self.modalidades)
+        self.modalidad_combo.addItems(self.reglas.modalidades)
         self.modalidad_combo.addItem("Global")
         self.modalidad_combo.setFont(QFont("Segoe UI", 10))
         self._configurar_combobox(self.modalidad_combo)
@@ -291,6 +287,12 @@ class GeneradorSancionesWindow(QDialog):
         """)
         self.text_comando.setReadOnly(True)
         layout_comando.addWidget(self.text_comando)
+
+        self.lbl_error = QLabel("")
+        self.lbl_error.setFont(QFont("Segoe UI", 9))
+        self.lbl_error.setStyleSheet("color: #F44336; background: transparent;")
+        self.lbl_error.hide()
+        layout_comando.addWidget(self.lbl_error)
         
         layout.addWidget(grupo_comando)
 
@@ -329,6 +331,22 @@ class GeneradorSancionesWindow(QDialog):
         btn_copiar.clicked.connect(self.copiar_comando)
         botones_layout.addWidget(btn_copiar)
         
+        btn_rcon = QPushButton("📡 Enviar por RCON")
+        btn_rcon.setMinimumHeight(40)
+        btn_rcon.setCursor(Qt.PointingHandCursor)
+        btn_rcon.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                font-weight: bold;
+                font-size: 11pt;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background-color: #F57C00; }
+        """)
+        btn_rcon.clicked.connect(self.enviar_rcon)
+        botones_layout.addWidget(btn_rcon)
+        
         btn_limpiar = QPushButton("🗑️ Limpiar")
         btn_limpiar.setMinimumHeight(40)
         btn_limpiar.setCursor(Qt.PointingHandCursor)
@@ -346,46 +364,113 @@ class GeneradorSancionesWindow(QDialog):
         botones_layout.addWidget(btn_limpiar)
         
         layout.addLayout(botones_layout)
+
+        btn_lote = QPushButton("📑 Sanciones en Lote")
+        btn_lote.setMinimumHeight(40)
+        btn_lote.setCursor(Qt.PointingHandCursor)
+        btn_lote.setStyleSheet("""
+            QPushButton {
+                background-color: #673AB7;
+                color: white;
+                font-weight: bold;
+                font-size: 11pt;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background-color: #5E35B1; }
+        """)
+        btn_lote.clicked.connect(self.abrir_lote)
+        layout.addWidget(btn_lote)
     
     def on_motivo_change(self, motivo):
         """Actualiza la visibilidad de modalidad según el motivo seleccionado."""
         if not motivo:
             return
         
-        tipo = self.tipo_sancion.currentText()
-        if not tipo:
+        sancion = self.reglas.sancion(self.tipo_sancion.currentText())
+        if sancion is None:
             return
         
-        config = self.sanciones_config[tipo]
-        if motivo in self.tiempos_por_motivo:
-            self.entry_tiempo.setText(self.tiempos_por_motivo[motivo])
-        motivos_modalidad = config.get("motivos_requieren_modalidad", {})
+        self.aplicar_escalado()
         
-        if motivo in motivos_modalidad and motivos_modalidad[motivo]:
+        if sancion.requiere_modalidad_para(motivo):
             self.modalidad_combo.setCurrentText("SurvivalClasico")
             self.grupo_modalidad.show()
         else:
             self.grupo_modalidad.hide()
         self.generar_comando()
     
+    def on_nick_change(self):
+        """Muestra el historial del jugador y ajusta el tiempo sugerido."""
+        self.actualizar_historial()
+        self.aplicar_escalado(respetar_manual=True)
+        self.generar_comando()
+
+    def actualizar_historial(self):
+        """Lista las sanciones anteriores del nick escrito (consulta indexada, sin demora)."""
+        self.lista_historial.clear()
+        nick = self.entry_nick.text().strip()
+        if not nick:
+            self.lbl_historial.setText("Escribe un nick para ver sus sanciones anteriores")
+            return
+        if not self.registro.disponible:
+            self.lbl_historial.setText("⚠️ El registro de sanciones no está disponible")
+            return
+
+        entradas = self.registro.historial(nick)
+        if not entradas:
+            self.lbl_historial.setText("✅ Sin sanciones registradas")
+            return
+        semana = time.time() - 7 * 86400
+        recientes = sum(1 for entrada in entradas if entrada.fecha >= semana)
+        self.lbl_historial.setText(f"⚠️ {len(entradas)} sanción(es) registrada(s), {recientes} en los últimos 7 días")
+        for entrada in entradas:
+            partes = [time.strftime("%d/%m/%Y %H:%M", time.localtime(entrada.fecha)),
+                      f"{entrada.tipo} {entrada.tiempo}" if entrada.tiempo else entrada.tipo,
+                      entrada.motivo]
+            if entrada.modalidad:
+                partes.append(entrada.modalidad)
+            if entrada.servidores:
+                partes.append("📡 " + ", ".join(entrada.servidores))
+            self.lista_historial.addItem(" · ".join(partes))
+
+    def aplicar_escalado(self, respetar_manual=False):
+        """Sugiere el tiempo del motivo escalado según las sanciones anteriores del jugador por el mismo motivo."""
+        self.lbl_escalado.hide()
+        sancion = self.reglas.sancion(self.tipo_sancion.currentText())
+        motivo = self.motivo_combo.currentText()
+        if sancion is None or not sancion.requiere_tiempo or not motivo:
+            return
+
+        base = self.reglas.tiempo_para(motivo) or sancion.tiempo_default
+        # Al cambiar de nick no se pisa un tiempo escrito a mano
+        if respetar_manual and self.entry_tiempo.text().strip() not in ("", base, self.tiempo_sugerido):
+            return
+        ventana = self.reglas.escalado["ventana_dias"]
+        anteriores = self.registro.anteriores(self.entry_nick.text().strip(), motivo, ventana)
+        self.tiempo_sugerido = self.reglas.escalar(base, anteriores)
+        self.entry_tiempo.setText(self.tiempo_sugerido)
+        if anteriores:
+            self.lbl_escalado.setText(
+                f"⬆️ {anteriores} sanción(es) por este motivo en los últimos {ventana} días: "
+                f"tiempo escalado de {base} a {self.tiempo_sugerido}"
+            )
+            self.lbl_escalado.show()
+
     def on_sancion_change(self, tipo):
         """Actualiza campos según el tipo de sanción seleccionado."""
-        if not tipo:
+        sancion = self.reglas.sancion(tipo)
+        if sancion is None:
             return
 
-        config = self.sanciones_config[tipo]
-        if config["requiere_tiempo"]:
+        if sancion.requiere_tiempo:
             self.grupo_tiempo.show()
-            self.entry_tiempo.setText(config.get("tiempo_default", ""))
+            self.entry_tiempo.setText(sancion.tiempo_default)
         else:
             self.grupo_tiempo.hide()
         self.motivo_combo.clear()
-        self.motivo_combo.addItems(config["motivos"])
-        if config["motivos"]:
-            primer_motivo = config["motivos"][0]
-            motivos_modalidad = config.get("motivos_requieren_modalidad", {})
-            
-            if primer_motivo in motivos_modalidad and motivos_modalidad[primer_motivo]:
+        self.motivo_combo.addItems(sancion.motivos)
+        if sancion.motivos:
+            if sancion.requiere_modalidad_para(sancion.motivos[0]):
                 self.modalidad_combo.setCurrentText("SurvivalClasico")
                 self.grupo_modalidad.show()
             else:
@@ -393,33 +478,34 @@ class GeneradorSancionesWindow(QDialog):
         self.generar_comando()
     
     def generar_comando(self):
-        """Genera el comando de sanción sin mostrar errores."""
-        tipo = self.tipo_sancion.currentText()
-        if not tipo:
+        """Genera el comando de sanción o, si algo no es válido, lo borra y muestra el error (solo con un nick escrito)."""
+        sancion = self.reglas.sancion(self.tipo_sancion.currentText())
+        if sancion is None:
             return
 
-        nick = self.entry_nick.text().strip()
-        if not nick:
-            return
-
-        config = self.sanciones_config[tipo]
-        motivo_custom = self.entry_motivo_custom.text().strip()
-        motivo = motivo_custom if motivo_custom else self.motivo_combo.currentText()
-
-        if not motivo:
+        motivo = self.entry_motivo_custom.text().strip() or self.motivo_combo.currentText()
+        modalidad = self.modalidad_combo.currentText() if self.grupo_modalidad.isVisible() else None
+        tiempo = self.entry_tiempo.text().strip() if sancion.requiere_tiempo else None
+        try:
+            comando = sancion.generar(self.entry_nick.text(), motivo, tiempo, modalidad)
+        except ErrorSancion as e:
+            # Nunca queda a la vista el comando anterior: se copiaría o enviaría para otro jugador
+            self.text_comando.clear()
+            self.datos_comando = None
+            # Con el nick vacío (ventana recién abierta o limpiada) no se avisa todavía
+            self.lbl_error.setText(f"⚠️ {e}")
+            self.lbl_error.setVisible(bool(self.entry_nick.text().strip()))
             return
-        comando = f"/{config['comando']} {nick}"
-        if config["requiere_tiempo"]:
-            tiempo = self.entry_tiempo.text().strip()
-            if not tiempo:
-                return
-            comando += f" {tiempo}"
-        comando += f" {motivo}"
-        if self.grupo_modalidad.isVisible():
-            modalidad = self.modalidad_combo.currentText()
-            if modalidad != "Global":
-                comando += f" server:{modalidad}"
+        self.lbl_error.hide()
+        self.datos_comando = (self.entry_nick.text().strip(), sancion.nombre, motivo, tiempo, modalidad)
         self.text_comando.setPlainText(comando)
+
+    def registrar_comando(self, origen):
+        """Guarda el comando mostrado en el registro. Retorna el id de la sanción o None."""
+        comando = self.text_comando.toPlainText().strip()
+        if not comando or self.datos_comando is None:
+            return None
+        return self.registro.registrar(*self.datos_comando, comando, origen)
     
     def copiar_comando(self):
         """Copia el comando al portapapeles."""
@@ -430,9 +516,43 @@ class GeneradorSancionesWindow(QDialog):
 
         clipboard = QGuiApplication.clipboard()
         clipboard.setText(comando)
+        self.registrar_comando("copiado")
+        self.actualizar_historial()
 
         self.mostrar_tooltip("✓ Comando copiado")
     
+    def enviar_rcon(self):
+        """Abre la selección de servidores para enviar el comando por RCON."""
+        comando = self.text_comando.toPlainText().strip()
+        if not comando:
+            QMessageBox.warning(self, "Advertencia", "Genera un comando primero")
+            return
+
+        dialogo = EnvioRconDialog([comando], self)
+        dialogo.envio_terminado.connect(self._registrar_envio)
+        dialogo.exec()
+
+    def abrir_lote(self):
+        """Abre el modo lote con el tipo, motivo y modalidad elegidos."""
+        dialogo = LoteSancionesDialog(self.reglas, {
+            "tipo": self.tipo_sancion.currentText(),
+            "motivo": self.entry_motivo_custom.text().strip() or self.motivo_combo.currentText(),
+            "modalidad": self.modalidad_combo.currentText(),
+        }, self)
+        dialogo.exec()
+        self.actualizar_historial()
+
+    def _registrar_envio(self, resultados):
+        """Registra la sanción y el resultado por servidor si llegó a algún servidor."""
+        if isinstance(resultados, Exception):
+            return
+        por_servidor = {nombre: all(r.ok for r in lista) for nombre, lista in resultados.items()}
+        if not any(por_servidor.values()):
+            return
+        sancion_id = self.registrar_comando("rcon")
+        self.registro.registrar_envios([(sancion_id, por_servidor)])
+        self.actualizar_historial()
+    
     def mostrar_tooltip(self, mensaje):
         """Muestra un tooltip temporal."""
         tooltip = QLabel(mensaje, self)
@@ -461,5 +581,8 @@ class GeneradorSancionesWindow(QDialog):
         self.entry_motivo_custom.clear()
         self.modalidad_combo.setCurrentText("Global")
         self.text_comando.clear()
+        self.datos_comando = None
+        self.lbl_error.hide()
+        self.lbl_escalado.hide()
         self.grupo_tiempo.hide()
         self.grupo_modalidad.hide()
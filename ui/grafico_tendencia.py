@@ -0,0 +1,171 @@
+from PySide6.QtCore import Qt, QRectF, QPointF
+from PySide6.QtGui import QPainter, QPainterPath, QPixmap, QColor, QPen
+from collections import deque
+import math
+
+
+def escala_para(valor):
+    """Redondea hacia arriba el máximo de la escala (10, 20, 50, 100, 200...)."""
+    valor = max(valor * 1.2, 10)
+    potencia = 10 ** math.floor(math.log10(valor))
+    for factor in (1, 2, 5, 10):
+        if valor <= factor * potencia:
+            return factor * potencia
+    return 10 * potencia
+
+
+class TrazoTendencia:
+    """Serie de un gráfico de tendencia con sus segmentos de QPainterPath cacheados."""
+
+    def __init__(self, capacidad, color, relleno=False, color_vacio=None):
+        self.valores = deque(maxlen=capacidad)
+        self.segmentos = deque(maxlen=capacidad)
+        self.color = QColor(color)
+        self.relleno = relleno
+        self.color_vacio = QColor(color_vacio) if color_vacio else None
+        self.escala = 10
+
+    def agregar(self, valor, paso, alto):
+        """Agrega un valor. Retorna True si cambió la escala y hay que redibujar todo."""
+        anterior = self.valores[-1] if self.valores else None
+        self.valores.append(valor)
+
+        maximo = max((v for v in self.valores if v is not None), default=0)
+        escala = escala_para(maximo)
+        # Se agranda enseguida, pero solo se achica si sobra mucho (evita redibujar seguido)
+        if escala > self.escala or escala * 4 <= self.escala:
+            self.escala = escala
+            self.reconstruir(paso, alto)
+            return True
+
+        self.segmentos.append(self._segmento(anterior, valor, paso, alto))
+        return False
+
+    def reconstruir(self, paso, alto):
+        """Recalcula todos los segmentos (cambio de escala o de tamaño)."""
+        valores = list(self.valores)
+        self.segmentos.clear()
+        anterior = None
+        for valor in valores:
+            self.segmentos.append(self._segmento(anterior, valor, paso, alto))
+            anterior = valor
+
+    def _y(self, valor, alto):
+        """Convierte un valor a coordenada vertical (1 px de margen)."""
+        return alto - 1 - min(valor / self.escala, 1) * (alto - 2)
+
+    def _segmento(self, anterior, valor, paso, alto):
+        """Arma el path del tramo que termina en `valor`, en coordenadas locales [0, paso]."""
+        camino = QPainterPath()
+        if valor is None:
+            if self.color_vacio is not None:
+                camino.addRect(QRectF(0, alto - 2, paso, 2))
+            return camino
+
+        y = self._y(valor, alto)
+        y_anterior = self._y(anterior, alto) if anterior is not None else y
+        if self.relleno:
+            camino.moveTo(0, alto)
+            camino.lineTo(0, y_anterior)
+            camino.lineTo(paso, y)
+            camino.lineTo(paso, alto)
+            camino.closeSubpath()
+        else:
+            camino.moveTo(0, y_anterior)
+            camino.lineTo(paso, y)
+        return camino
+
+    def dibujar_segmento(self, painter, indice, x):
+        """Dibuja el segmento `indice` desplazado a la posición x."""
+        camino = self.segmentos[indice]
+        if camino.isEmpty():
+            return
+        painter.save()
+        painter.translate(x, 0)
+        if self.valores[indice] is None:
+            painter.fillPath(camino, self.color_vacio)
+        elif self.relleno:
+            painter.fillPath(camino, self.color)
+        else:
+            painter.setPen(QPen(self.color, 1.5))
+            painter.drawPath(camino)
+        painter.restore()
+
+    def dibujar(self, painter, ancho, paso):
+        """Dibuja todos los segmentos alineados a la derecha."""
+        cantidad = len(self.segmentos)
+        for indice in range(cantidad):
+            self.dibujar_segmento(painter, indice, ancho - (cantidad - indice) * paso)
+
+
+class LienzoTendencia:
+    """Mini gráfico de latencia y jugadores sobre un pixmap que solo pinta el tramo nuevo en cada muestra."""
+
+    def __init__(self, puntos=40, paso=3, alto=32):
+        self.paso = paso
+        self.ancho = puntos * paso
+        self.alto = alto
+        self.dpr = 1.0
+
+        jugadores = QColor("#4CAF50")
+        jugadores.setAlpha(70)
+        self.trazos = [
+            TrazoTendencia(puntos, jugadores, relleno=True),
+            TrazoTendencia(puntos, "#2196F3", color_vacio="#f44336"),
+        ]
+        self.pixmap = None
+
+    def agregar(self, latencia, jugadores):
+        """Agrega una muestra y pinta solo la franja nueva del pixmap."""
+        redibujar = False
+        for trazo, valor in zip(self.trazos, (jugadores, latencia)):
+            redibujar |= trazo.agregar(valor, self.paso, self.alto)
+
+        if redibujar or self.pixmap is None:
+            self.pixmap = None
+            return
+
+        # Corre el pixmap hacia la izquierda y dibuja el último tramo en el hueco
+        self.pixmap.scroll(-round(self.paso * self.dpr), 0, self.pixmap.rect())
+        franja = QRectF(self.ancho - self.paso, 0, self.paso, self.alto)
+
+        painter = QPainter(self.pixmap)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(franja, Qt.transparent)
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setClipRect(franja)
+        for trazo in self.trazos:
+            trazo.dibujar_segmento(painter, len(trazo.segmentos) - 1, self.ancho - self.paso)
+        painter.end()
+
+    def cargar(self, muestras):
+        """Carga muestras previas [(latencia, jugadores)] con un único redibujado."""
+        for latencia, jugadores in muestras:
+            for trazo, valor in zip(self.trazos, (jugadores, latencia)):
+                trazo.valores.append(valor)
+        for trazo in self.trazos:
+            maximo = max((v for v in trazo.valores if v is not None), default=0)
+            trazo.escala = escala_para(maximo)
+            trazo.reconstruir(self.paso, self.alto)
+        self.pixmap = None
+
+    def _redibujar(self):
+        """Pinta el pixmap completo a partir de los segmentos cacheados."""
+        self.pixmap = QPixmap(round(self.ancho * self.dpr), round(self.alto * self.dpr))
+        self.pixmap.setDevicePixelRatio(self.dpr)
+        self.pixmap.fill(Qt.transparent)
+
+        painter = QPainter(self.pixmap)
+        painter.setRenderHint(QPainter.Antialiasing)
+        for trazo in self.trazos:
+            trazo.dibujar(painter, self.ancho, self.paso)
+        painter.end()
+
+    def dibujar(self, painter, x, y):
+        """Dibuja el gráfico en (x, y), redibujando el pixmap solo si hace falta."""
+        dpr = painter.device().devicePixelRatioF()
+        if self.pixmap is None or dpr != self.dpr:
+            self.dpr = dpr
+            self._redibujar()
+        painter.drawPixmap(QPointF(x, y), self.pixmap)
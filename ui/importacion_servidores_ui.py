@@ -0,0 +1,169 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                               QListWidget, QListWidgetItem, QTextEdit, QMessageBox, QFileDialog)
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtGui import QFont
+from core.importacion_servidores import interpretar_lista, exportar_lista
+from core.servicio_monitoreo import obtener_servicio
+from core.theme_manager import theme_manager
+
+
+FILTROS_ARCHIVO = "Listas de servidores (*.txt *.csv *.json);;Todos los archivos (*)"
+FORMATOS_EXTENSION = {".csv": "csv", ".json": "json"}
+
+
+class ImportarServidoresDialog(QDialog):
+    """Importa servidores desde texto, CSV o JSON validándolos antes, y exporta la lista actual."""
+
+    validacion_terminada = Signal(object)
+
+    def __init__(self, servidores, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Importar / Exportar Servidores - Minecraft Staff Tools")
+        self.setFixedSize(600, 620)
+        self.servidores = servidores
+        self.servicio = obtener_servicio()
+        self.entradas = []
+        self.validacion_terminada.connect(self.mostrar_validacion)
+        self.crear_ui()
+
+    def crear_ui(self):
+        self.setStyleSheet(theme_manager.get_background_style())
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        ayuda = QLabel(
+            "Pega una lista o abre un archivo. Formatos: una línea por servidor ('Nombre ip', "
+            "'Nombre,ip', 'Nombre = ip' o solo la ip), CSV o JSON {\"nombre\": \"ip\"}."
+        )
+        ayuda.setWordWrap(True)
+        ayuda.setStyleSheet(f"color: {theme_manager.get_text_color()}; background: transparent;")
+        layout.addWidget(ayuda)
+
+        self.text_lista = QTextEdit()
+        self.text_lista.setFont(QFont("Consolas", 10))
+        self.text_lista.setPlaceholderText("Horus, play.horusmc.net\nBG 3, bg3.minelatino.com:25566")
+        self.text_lista.setStyleSheet("background: white; color: black; border-radius: 5px;")
+        layout.addWidget(self.text_lista)
+
+        archivo_layout = QHBoxLayout()
+
+        btn_abrir = QPushButton("📂 Abrir Archivo")
+        btn_abrir.setMinimumHeight(35)
+        btn_abrir.setCursor(Qt.PointingHandCursor)
+        btn_abrir.setStyleSheet(theme_manager.get_button_style())
+        btn_abrir.clicked.connect(self.abrir_archivo)
+        archivo_layout.addWidget(btn_abrir)
+
+        self.btn_validar = QPushButton("✔️ Validar")
+        self.btn_validar.setMinimumHeight(35)
+        self.btn_validar.setCursor(Qt.PointingHandCursor)
+        self.btn_validar.setStyleSheet(theme_manager.get_button_style())
+        self.btn_validar.clicked.connect(self.validar)
+        archivo_layout.addWidget(self.btn_validar)
+
+        btn_exportar = QPushButton("📤 Exportar Lista Actual")
+        btn_exportar.setMinimumHeight(35)
+        btn_exportar.setCursor(Qt.PointingHandCursor)
+        btn_exportar.setStyleSheet(theme_manager.get_button_style())
+        btn_exportar.clicked.connect(self.exportar)
+        archivo_layout.addWidget(btn_exportar)
+
+        layout.addLayout(archivo_layout)
+
+        self.lbl_resumen = QLabel("")
+        self.lbl_resumen.setStyleSheet(f"color: {theme_manager.get_text_color()}; background: transparent;")
+        layout.addWidget(self.lbl_resumen)
+
+        self.lista = QListWidget()
+        self.lista.setStyleSheet("background: white; color: black; border-radius: 5px;")
+        layout.addWidget(self.lista)
+
+        self.btn_importar = QPushButton("📥 Importar Seleccionados")
+        self.btn_importar.setMinimumHeight(40)
+        self.btn_importar.setCursor(Qt.PointingHandCursor)
+        self.btn_importar.setStyleSheet(theme_manager.get_button_style())
+        self.btn_importar.setEnabled(False)
+        self.btn_importar.clicked.connect(self.accept)
+        layout.addWidget(self.btn_importar)
+
+    def abrir_archivo(self):
+        """Carga una lista desde un archivo de texto, CSV o JSON."""
+        ruta, _ = QFileDialog.getOpenFileName(self, "Abrir lista de servidores", "", FILTROS_ARCHIVO)
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'r', encoding='utf-8-sig') as f:
+                self.text_lista.setPlainText(f.read())
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer el archivo:\n{e}")
+
+    def exportar(self):
+        """Guarda la lista actual de servidores (el formato sale de la extensión)."""
+        ruta, _ = QFileDialog.getSaveFileName(self, "Exportar servidores", "servidores.csv", FILTROS_ARCHIVO)
+        if not ruta:
+            return
+        extension = ruta[ruta.rfind('.'):].lower() if '.' in ruta else ""
+        try:
+            with open(ruta, 'w', encoding='utf-8', newline='') as f:
+                f.write(exportar_lista(self.servidores, FORMATOS_EXTENSION.get(extension, "texto")))
+            QMessageBox.information(self, "Éxito", f"{len(self.servidores)} servidores exportados")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo exportar:\n{e}")
+
+    def validar(self):
+        """Interpreta la lista y verifica todos los servidores a la vez."""
+        try:
+            self.entradas = interpretar_lista(self.text_lista.toPlainText(), self.servidores)
+        except ValueError as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer la lista:\n{e}")
+            return
+        if not self.entradas:
+            QMessageBox.warning(self, "Advertencia", "No se encontraron servidores en la lista")
+            return
+
+        self.btn_validar.setEnabled(False)
+        self.btn_importar.setEnabled(False)
+        self.lista.clear()
+        self.lbl_resumen.setText(f"⏳ Verificando {len(self.entradas)} servidores...")
+        futuro = self.servicio.validar_servidores(self.entradas)
+        futuro.add_done_callback(lambda f: self.validacion_terminada.emit(f.exception() or f.result()))
+
+    def mostrar_validacion(self, resultado):
+        """Lista el resultado de cada entrada; las que respondieron quedan marcadas."""
+        self.btn_validar.setEnabled(True)
+        if isinstance(resultado, Exception):
+            self.lbl_resumen.setText(f"❌ Error al validar: {resultado}")
+            return
+
+        online = 0
+        for entrada in resultado:
+            item = QListWidgetItem()
+            if not entrada.valida:
+                item.setText(f"⚠️ {entrada.nombre} — {entrada.direccion} ({entrada.error})")
+                item.setFlags(Qt.NoItemFlags)
+            else:
+                estado = entrada.estado
+                if estado["online"]:
+                    online += 1
+                    item.setText(f"🟢 {entrada.nombre} — {entrada.direccion} "
+                                  f"({estado['latencia']} ms, {estado['jugadores']})")
+                else:
+                    item.setText(f"🔴 {entrada.nombre} — {entrada.direccion} ({estado['error']})")
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                # Las que no respondieron se pueden importar igual (el servidor puede estar caído)
+                item.setCheckState(Qt.Checked if estado["online"] else Qt.Unchecked)
+            item.setData(Qt.UserRole, entrada)
+            self.lista.addItem(item)
+
+        invalidas = sum(1 for entrada in resultado if not entrada.valida)
+        self.lbl_resumen.setText(
+            f"🟢 {online} online · 🔴 {len(resultado) - online - invalidas} sin respuesta · ⚠️ {invalidas} con errores"
+        )
+        self.btn_importar.setEnabled(True)
+
+    def seleccionadas(self):
+        """Entradas marcadas para importar."""
+        return [self.lista.item(i).data(Qt.UserRole) for i in range(self.lista.count())
+                if self.lista.item(i).checkState() == Qt.Checked]
@@ -1,20 +1,41 @@
-from PySide6.QtWidgets import (QDialog, QVBoxLayout, QLabel, QPushButton, 
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
                                QLineEdit, QFileDialog, QMessageBox)
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QThread, Signal
 from PySide6.QtGui import QFont
 import os
 import sys
-from core.filtro_logs import FiltroLogs
+from core.filtro_logs import FiltroLogs, listar_logs
+from core.detector_flood import DetectorFlood
+from core.escaner_toxicidad import EscanerToxicidad
+from core.indice_ips import IndiceIPs
+from core.sesiones_jugadores import AnalizadorSesiones
 from core.theme_manager import theme_manager
 
 
+class AnalisisThread(QThread):
+    """Thread para analizar logs grandes sin bloquear la UI."""
+    finished = Signal(object)
+    error = Signal(str)
+    
+    def __init__(self, funcion):
+        super().__init__()
+        self.funcion = funcion
+        
+    def run(self):
+        try:
+            self.finished.emit(self.funcion())
+        except Exception as e:
+            self.error.emit(str(e))
+
+
 class LogFilterWindow(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Filtro de Logs")
-        self.setFixedSize(500, 300)
+        self.setFixedSize(500, 400)
         
         self.archivo_log = None
+        self.thread_analisis = None
         
         self.crear_ui()
         
@@ -89,6 +110,51 @@ class LogFilterWindow(QDialog):
         btn_filtrar.clicked.connect(self.ejecutar_filtro)
         layout.addWidget(btn_filtrar)
         
+        #Análisis avanzados (no requieren lista de jugadores)
+        analisis_layout = QHBoxLayout()
+        
+        btn_flood = QPushButton("🌊 Flood/Spam")
+        btn_flood.setMinimumHeight(35)
+        btn_flood.setCursor(Qt.PointingHandCursor)
+        btn_flood.setStyleSheet(theme_manager.get_button_style())
+        btn_flood.clicked.connect(self.analizar_flood)
+        analisis_layout.addWidget(btn_flood)
+        
+        btn_activos = QPushButton("🏆 Top Activos")
+        btn_activos.setMinimumHeight(35)
+        btn_activos.setCursor(Qt.PointingHandCursor)
+        btn_activos.setStyleSheet(theme_manager.get_button_style())
+        btn_activos.clicked.connect(self.descubrir_activos)
+        analisis_layout.addWidget(btn_activos)
+        
+        btn_toxicidad = QPushButton("🤬 Toxicidad")
+        btn_toxicidad.setMinimumHeight(35)
+        btn_toxicidad.setCursor(Qt.PointingHandCursor)
+        btn_toxicidad.setStyleSheet(theme_manager.get_button_style())
+        btn_toxicidad.clicked.connect(self.escanear_toxicidad)
+        analisis_layout.addWidget(btn_toxicidad)
+        
+        layout.addLayout(analisis_layout)
+        
+        #Análisis sobre logs del servidor (usan la carpeta del log seleccionado)
+        servidor_layout = QHBoxLayout()
+        
+        btn_alts = QPushButton("🌐 Alts por IP")
+        btn_alts.setMinimumHeight(35)
+        btn_alts.setCursor(Qt.PointingHandCursor)
+        btn_alts.setStyleSheet(theme_manager.get_button_style())
+        btn_alts.clicked.connect(self.buscar_alts)
+        servidor_layout.addWidget(btn_alts)
+        
+        btn_sesiones = QPushButton("⏱️ Sesiones")
+        btn_sesiones.setMinimumHeight(35)
+        btn_sesiones.setCursor(Qt.PointingHandCursor)
+        btn_sesiones.setStyleSheet(theme_manager.get_button_style())
+        btn_sesiones.clicked.connect(self.analizar_sesiones)
+        servidor_layout.addWidget(btn_sesiones)
+        
+        layout.addLayout(servidor_layout)
+        
     def seleccionar_archivo(self):
         """Abre diálogo para seleccionar archivo de log."""
         archivo, _ = QFileDialog.getOpenFileName(
@@ -117,13 +183,7 @@ class LogFilterWindow(QDialog):
         jugadores = [j.strip() for j in jugadores_raw.split(",") if j.strip()]
         filtro = FiltroLogs(self.archivo_log)
         filtro.filtrar_por_jugadores(jugadores)
-        if getattr(sys, 'frozen', False):
-            app_dir = os.path.dirname(sys.executable)
-        else:
-            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        output_dir = os.path.join(app_dir, "LOGS Filtrados")
-        os.makedirs(output_dir, exist_ok=True)
+        output_dir = self.obtener_directorio_salida()
         
         nombre_salida = f"filtrado_{'_'.join(jugadores)}.txt"
         salida = os.path.join(output_dir, nombre_salida)
@@ -144,3 +204,162 @@ class LogFilterWindow(QDialog):
                 "Error al guardar",
                 f"No se pudo guardar el archivo:\n{str(e)}"
             )
+    
+    def obtener_directorio_salida(self):
+        """Retorna (y crea si no existe) la carpeta de logs filtrados."""
+        if getattr(sys, 'frozen', False):
+            app_dir = os.path.dirname(sys.executable)
+        else:
+            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        
+        output_dir = os.path.join(app_dir, "LOGS Filtrados")
+        os.makedirs(output_dir, exist_ok=True)
+        return output_dir
+    
+    def ejecutar_analisis(self, funcion, al_terminar):
+        """Ejecuta un análisis en segundo plano sobre el log seleccionado."""
+        if not self.archivo_log:
+            QMessageBox.critical(self, "Error", "Seleccioná un archivo de log")
+            return
+        
+        if self.thread_analisis and self.thread_analisis.isRunning():
+            QMessageBox.warning(self, "Advertencia", "Ya hay un análisis en curso")
+            return
+        
+        self.thread_analisis = AnalisisThread(funcion)
+        self.thread_analisis.finished.connect(al_terminar)
+        self.thread_analisis.error.connect(
+            lambda error: QMessageBox.critical(self, "Error en el análisis", error)
+        )
+        self.thread_analisis.start()
+    
+    def analizar_flood(self):
+        """Genera el ranking de flood y spam del log seleccionado."""
+        archivo = self.archivo_log
+        
+        def analizar():
+            detector = DetectorFlood()
+            detector.analizar_archivos([archivo])
+            nombre_salida = f"flood_{os.path.splitext(os.path.basename(archivo))[0]}.txt"
+            detector.guardar_reporte(os.path.join(self.obtener_directorio_salida(), nombre_salida))
+            return detector, nombre_salida
+        
+        def mostrar(resultado):
+            detector, nombre_salida = resultado
+            QMessageBox.information(
+                self,
+                "Análisis completado",
+                f"Mensajes de chat: {detector.lineas_chat}\n"
+                f"Infractores detectados: {len(detector.ranking())}\n\n"
+                f"Archivo generado:\n{nombre_salida}"
+            )
+        
+        self.ejecutar_analisis(analizar, mostrar)
+    
+    def descubrir_activos(self):
+        """Genera el top de jugadores más activos sin necesidad de lista."""
+        archivo = self.archivo_log
+        
+        def analizar():
+            filtro = FiltroLogs(archivo)
+            resultados = filtro.descubrir_activos(top_n=20)
+            nombre_salida = f"activos_{os.path.splitext(os.path.basename(archivo))[0]}.txt"
+            filtro.guardar_descubrimiento(os.path.join(self.obtener_directorio_salida(), nombre_salida), resultados)
+            return resultados, nombre_salida
+        
+        def mostrar(resultado):
+            resultados, nombre_salida = resultado
+            resumen = ""
+            for categoria, ranking in resultados.items():
+                top = ", ".join(f"{jugador} ({count})" for jugador, count, _ in ranking[:3])
+                resumen += f"{categoria}: {top or '-'}\n"
+            QMessageBox.information(
+                self,
+                "Análisis completado",
+                f"{resumen}\nArchivo generado:\n{nombre_salida}"
+            )
+        
+        self.ejecutar_analisis(analizar, mostrar)
+    
+    def escanear_toxicidad(self):
+        """Busca palabras prohibidas en el chat del log seleccionado."""
+        archivo = self.archivo_log
+        
+        def analizar():
+            escaner = EscanerToxicidad()
+            escaner.analizar_archivos([archivo])
+            nombre_salida = f"toxicidad_{os.path.splitext(os.path.basename(archivo))[0]}.txt"
+            escaner.guardar_reporte(os.path.join(self.obtener_directorio_salida(), nombre_salida))
+            return escaner, nombre_salida
+        
+        def mostrar(resultado):
+            escaner, nombre_salida = resultado
+            QMessageBox.information(
+                self,
+                "Análisis completado",
+                f"Mensajes de chat: {escaner.lineas_chat}\n"
+                f"Jugadores con coincidencias: {len(escaner.hits)}\n\n"
+                f"Archivo generado:\n{nombre_salida}"
+            )
+        
+        self.ejecutar_analisis(analizar, mostrar)
+    
+    def buscar_alts(self):
+        """Indexa los logins de la carpeta del log y busca cuentas que comparten IP."""
+        jugadores_raw = self.entry_jugadores.text().strip()
+        if not jugadores_raw:
+            QMessageBox.critical(self, "Error", "Ingresá al menos un jugador")
+            return
+        
+        jugadores = [j.strip() for j in jugadores_raw.split(",") if j.strip()]
+        archivo = self.archivo_log
+        
+        def analizar():
+            indice = IndiceIPs()
+            nuevos = indice.ingerir([os.path.dirname(archivo)])
+            nombre_salida = f"alts_{'_'.join(jugadores)}.txt"
+            indice.guardar_reporte(os.path.join(self.obtener_directorio_salida(), nombre_salida), jugadores)
+            return indice, nuevos, nombre_salida
+        
+        def mostrar(resultado):
+            indice, nuevos, nombre_salida = resultado
+            resumen = ""
+            for jugador in jugadores:
+                alts = indice.alts_de(jugador)
+                resumen += f"{jugador}: {', '.join(sorted(alts)) or 'sin alts'}"
+                encadenados = indice.alts_encadenados(jugador)
+                if encadenados:
+                    resumen += f" (+{len(encadenados)} encadenados, ver reporte)"
+                resumen += "\n"
+            QMessageBox.information(
+                self,
+                "Análisis completado",
+                f"Logins nuevos indexados: {nuevos}\n\n{resumen}\n"
+                f"Archivo generado:\n{nombre_salida}"
+            )
+        
+        self.ejecutar_analisis(analizar, mostrar)
+    
+    def analizar_sesiones(self):
+        """Reconstruye las sesiones de todos los logs de la carpeta del log seleccionado."""
+        archivo = self.archivo_log
+        
+        def analizar():
+            analizador = AnalizadorSesiones()
+            archivos = listar_logs(os.path.dirname(archivo))
+            output_dir = self.obtener_directorio_salida()
+            analizador.analizar_archivos(archivos, os.path.join(output_dir, "sesiones.csv"))
+            analizador.guardar_reporte(os.path.join(output_dir, "tiempo_online.txt"))
+            return analizador, len(archivos)
+        
+        def mostrar(resultado):
+            analizador, cantidad = resultado
+            QMessageBox.information(
+                self,
+                "Análisis completado",
+                f"Archivos procesados: {cantidad}\n"
+                f"Jugadores con sesiones: {len(analizador.resumen)}\n\n"
+                f"Archivos generados:\nsesiones.csv\ntiempo_online.txt"
+            )
+        
+        self.ejecutar_analisis(analizar, mostrar)
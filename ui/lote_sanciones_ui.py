@@ -0,0 +1,243 @@
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QPushButton,
+                               QListWidget, QTextEdit, QLineEdit, QComboBox, QGroupBox, QMessageBox,
+                               QFileDialog)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont, QGuiApplication
+from core.lote_sanciones import leer_filas, generar_lote, script_lote
+from core.registro_sanciones import obtener_registro
+from core.theme_manager import theme_manager
+from ui.envio_rcon_ui import EnvioRconDialog
+
+
+FILTROS_ARCHIVO = "Listas de jugadores (*.txt *.csv);;Todos los archivos (*)"
+
+
+class LoteSancionesDialog(QDialog):
+    """Genera, valida y envía sanciones para muchos jugadores a la vez."""
+
+    def __init__(self, reglas, por_defecto=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Sanciones en Lote - Minecraft Staff Tools")
+        self.setFixedSize(700, 760)
+        self.reglas = reglas
+        self.registro = obtener_registro()
+        self.validas = []
+        # Sanciones registradas desde este diálogo: no cuentan como anteriores al volver a generar
+        self.registradas = set()
+        self.crear_ui()
+        self.aplicar_por_defecto(por_defecto or {})
+
+    def crear_ui(self):
+        self.setStyleSheet(theme_manager.get_background_style())
+        estilo_texto = f"color: {theme_manager.get_text_color()}; background: transparent;"
+        estilo_campo = "background: white; color: black; border-radius: 5px; padding: 3px;"
+
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+        layout.setContentsMargins(20, 20, 20, 20)
+
+        ayuda = QLabel(
+            "Pega una lista de nicks (uno o varios por línea) o un CSV con las columnas "
+            "nick, tipo, motivo, tiempo, modalidad. Las columnas vacías toman los valores por defecto."
+        )
+        ayuda.setWordWrap(True)
+        ayuda.setStyleSheet(estilo_texto)
+        layout.addWidget(ayuda)
+
+        self.text_lista = QTextEdit()
+        self.text_lista.setFont(QFont("Consolas", 10))
+        self.text_lista.setPlaceholderText("AboGames\nSteve_99\nnick;tipo;motivo;tiempo;modalidad\nAlex;tempban;Xray;30d;SurvivalClasico")
+        self.text_lista.setStyleSheet("background: white; color: black; border-radius: 5px;")
+        layout.addWidget(self.text_lista)
+
+        grupo = QGroupBox("⚙️ Valores por Defecto")
+        grupo.setFont(QFont("Segoe UI", 10, QFont.Bold))
+        grupo.setStyleSheet(f"QGroupBox {{ color: {theme_manager.get_text_color()}; background: transparent; }}")
+        grilla = QGridLayout(grupo)
+
+        self.tipo_combo = QComboBox()
+        self.tipo_combo.addItems(list(self.reglas.sanciones))
+        self.tipo_combo.currentTextChanged.connect(self.on_tipo_change)
+        self.motivo_combo = QComboBox()
+        self.motivo_combo.setEditable(True)
+        self.entry_tiempo = QLineEdit()
+        self.entry_tiempo.setPlaceholderText("Según motivo (con escalado)")
+        self.modalidad_combo = QComboBox()
+        self.modalidad_combo.addItems(self.reglas.modalidades)
+        self.modalidad_combo.addItem("Global")
+
+        for fila, (etiqueta, campo) in enumerate((("Tipo:", self.tipo_combo), ("Motivo:", self.motivo_combo),
+                                                  ("Tiempo:", self.entry_tiempo),
+                                                  ("Modalidad:", self.modalidad_combo))):
+            lbl = QLabel(etiqueta)
+            lbl.setFont(QFont("Segoe UI", 9))
+            lbl.setStyleSheet(estilo_texto)
+            campo.setFont(QFont("Segoe UI", 9))
+            campo.setStyleSheet(estilo_campo)
+            grilla.addWidget(lbl, fila // 2, (fila % 2) * 2)
+            grilla.addWidget(campo, fila // 2, (fila % 2) * 2 + 1)
+        layout.addWidget(grupo)
+
+        acciones_layout = QHBoxLayout()
+
+        btn_abrir = QPushButton("📂 Abrir Archivo")
+        btn_abrir.setMinimumHeight(35)
+        btn_abrir.setCursor(Qt.PointingHandCursor)
+        btn_abrir.setStyleSheet(theme_manager.get_button_style())
+        btn_abrir.clicked.connect(self.abrir_archivo)
+        acciones_layout.addWidget(btn_abrir)
+
+        btn_generar = QPushButton("🔄 Generar Comandos")
+        btn_generar.setMinimumHeight(35)
+        btn_generar.setCursor(Qt.PointingHandCursor)
+        btn_generar.setStyleSheet(theme_manager.get_button_style())
+        btn_generar.clicked.connect(self.generar)
+        acciones_layout.addWidget(btn_generar)
+
+        layout.addLayout(acciones_layout)
+
+        self.lbl_resumen = QLabel("")
+        self.lbl_resumen.setStyleSheet(estilo_texto)
+        layout.addWidget(self.lbl_resumen)
+
+        self.lista = QListWidget()
+        self.lista.setFont(QFont("Segoe UI", 9))
+        self.lista.setStyleSheet("background: white; color: black; border-radius: 5px;")
+        layout.addWidget(self.lista)
+
+        self.text_script = QTextEdit()
+        self.text_script.setReadOnly(True)
+        self.text_script.setFont(QFont("Consolas", 10))
+        self.text_script.setStyleSheet("""
+            QTextEdit {
+                background-color: #2b2b2b;
+                color: #00ff00;
+                border: 1px solid #444;
+                border-radius: 5px;
+                padding: 5px;
+            }
+        """)
+        layout.addWidget(self.text_script)
+
+        botones_layout = QHBoxLayout()
+
+        btn_copiar = QPushButton("📋 Copiar Script")
+        btn_copiar.setMinimumHeight(40)
+        btn_copiar.setCursor(Qt.PointingHandCursor)
+        btn_copiar.setStyleSheet("""
+            QPushButton {
+                background-color: #2196F3;
+                color: white;
+                font-weight: bold;
+                font-size: 11pt;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background-color: #1976D2; }
+        """)
+        btn_copiar.clicked.connect(self.copiar_script)
+        botones_layout.addWidget(btn_copiar)
+
+        btn_rcon = QPushButton("📡 Enviar por RCON")
+        btn_rcon.setMinimumHeight(40)
+        btn_rcon.setCursor(Qt.PointingHandCursor)
+        btn_rcon.setStyleSheet("""
+            QPushButton {
+                background-color: #FF9800;
+                color: white;
+                font-weight: bold;
+                font-size: 11pt;
+                border-radius: 5px;
+            }
+            QPushButton:hover { background-color: #F57C00; }
+        """)
+        btn_rcon.clicked.connect(self.enviar_rcon)
+        botones_layout.addWidget(btn_rcon)
+
+        layout.addLayout(botones_layout)
+
+    def aplicar_por_defecto(self, por_defecto):
+        """Precarga tipo, motivo y modalidad (los del generador)."""
+        if por_defecto.get("tipo"):
+            self.tipo_combo.setCurrentText(por_defecto["tipo"])
+        self.on_tipo_change(self.tipo_combo.currentText())
+        if por_defecto.get("motivo"):
+            self.motivo_combo.setCurrentText(por_defecto["motivo"])
+        if por_defecto.get("modalidad"):
+            self.modalidad_combo.setCurrentText(por_defecto["modalidad"])
+
+    def on_tipo_change(self, tipo):
+        """Carga los motivos del tipo elegido."""
+        sancion = self.reglas.sancion(tipo)
+        self.motivo_combo.clear()
+        if sancion is not None:
+            self.motivo_combo.addItems(sancion.motivos)
+
+    def abrir_archivo(self):
+        """Carga la lista desde un archivo de texto o CSV."""
+        ruta, _ = QFileDialog.getOpenFileName(self, "Abrir lista de jugadores", "", FILTROS_ARCHIVO)
+        if not ruta:
+            return
+        try:
+            with open(ruta, 'r', encoding='utf-8-sig') as f:
+                self.text_lista.setPlainText(f.read())
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo leer el archivo:\n{e}")
+
+    def generar(self):
+        """Genera y valida todos los comandos de una vez."""
+        filas = leer_filas(self.text_lista.toPlainText())
+        if not filas:
+            QMessageBox.warning(self, "Advertencia", "No se encontraron jugadores en la lista")
+            return
+
+        por_defecto = {
+            "tipo": self.tipo_combo.currentText(),
+            "motivo": self.motivo_combo.currentText().strip(),
+            "tiempo": self.entry_tiempo.text().strip(),
+            "modalidad": self.modalidad_combo.currentText(),
+        }
+        entradas = generar_lote(filas, self.reglas, por_defecto, self.registro, self.registradas)
+        self.validas = [entrada for entrada in entradas if entrada.valida]
+
+        self.lista.clear()
+        for entrada in entradas:
+            if not entrada.valida:
+                self.lista.addItem(f"❌ Línea {entrada.linea} · {entrada.nick or '(sin nick)'}: {entrada.error}")
+            elif entrada.anteriores:
+                self.lista.addItem(f"⬆️ {entrada.comando} ({entrada.anteriores} sanción(es) anterior(es))")
+            else:
+                self.lista.addItem(f"✅ {entrada.comando}")
+        self.text_script.setPlainText(script_lote(entradas))
+        self.lbl_resumen.setText(f"✅ {len(self.validas)} comandos generados · ❌ {len(entradas) - len(self.validas)} con errores")
+
+    def copiar_script(self):
+        """Copia el bloque de comandos y registra las sanciones."""
+        if not self.validas:
+            QMessageBox.warning(self, "Advertencia", "Genera los comandos primero")
+            return
+        QGuiApplication.clipboard().setText(script_lote(self.validas))
+        self.registradas.update(self.registro.registrar_varios([entrada.datos() for entrada in self.validas], "lote"))
+        self.lbl_resumen.setText(f"📋 {len(self.validas)} comandos copiados y registrados")
+
+    def enviar_rcon(self):
+        """Abre la selección de servidores para enviar todos los comandos por RCON."""
+        if not self.validas:
+            QMessageBox.warning(self, "Advertencia", "Genera los comandos primero")
+            return
+        validas = list(self.validas)
+        dialogo = EnvioRconDialog([entrada.comando for entrada in validas], self)
+        dialogo.envio_terminado.connect(lambda resultados: self._registrar_envio(validas, resultados))
+        dialogo.exec()
+
+    def _registrar_envio(self, validas, resultados):
+        """Registra las sanciones que llegaron a algún servidor con el resultado de cada uno."""
+        if isinstance(resultados, Exception):
+            return
+        # Los resultados de cada servidor vienen en el mismo orden que los comandos
+        por_entrada = [{nombre: lista[i].ok for nombre, lista in resultados.items()} for i in range(len(validas))]
+        enviadas = [(entrada, envio) for entrada, envio in zip(validas, por_entrada) if any(envio.values())]
+        if not enviadas:
+            return
+        ids = self.registro.registrar_varios([entrada.datos() for entrada, _ in enviadas], "lote")
+        self.registradas.update(ids)
+        self.registro.registrar_envios([(sancion_id, envio) for sancion_id, (_, envio) in zip(ids, enviadas)])
@@ -8,6 +8,7 @@ from ui.monitor_servidores_ui import MonitorServidoresWindow
 from ui.generador_sanciones_ui import GeneradorSancionesWindow
 from ui.theme_dialog import ThemeDialog
 from core.theme_manager import theme_manager
+from core.servicio_monitoreo import obtener_servicio
 
 
 class MinecraftStaffToolsApp(QMainWindow):
@@ -24,6 +25,10 @@ class MinecraftStaffToolsApp(QMainWindow):
         self.monitor_window = None
         self.generador_window = None
         
+        # Monitoreo compartido: sigue verificando (a ritmo bajo) con el monitor cerrado
+        self.servicio_monitoreo = obtener_servicio()
+        self.servicio_monitoreo.iniciar()
+        
         self.crear_ui()
         
     def crear_ui(self):
@@ -85,6 +90,11 @@ class MinecraftStaffToolsApp(QMainWindow):
         footer.setStyleSheet(f"color: {theme_manager.get_text_alpha(0.8)}; background: transparent;")
         layout.addWidget(footer)
     
+    def closeEvent(self, event):
+        """Detiene el monitoreo en segundo plano al cerrar la aplicación."""
+        self.servicio_monitoreo.detener()
+        event.accept()
+    
     def aplicar_tema(self):
         """Aplica el tema actual desde el theme_manager."""
         central = self.centralWidget()
@@ -114,13 +124,18 @@ class MinecraftStaffToolsApp(QMainWindow):
         
     def abrir_monitor_servidores(self):
         """Abre la ventana de monitor de servidores o la trae al frente si ya está abierta."""
-        if self.monitor_window is None or not self.monitor_window.isVisible():
+        if self.monitor_window is None:
             self.monitor_window = MonitorServidoresWindow(self)
+            # La ventana se destruye al cerrarse (WA_DeleteOnClose): se olvida la referencia
+            self.monitor_window.finished.connect(self._monitor_cerrado)
             self.monitor_window.show()
         else:
             self.monitor_window.raise_()
             self.monitor_window.activateWindow()
         
+    def _monitor_cerrado(self):
+        self.monitor_window = None
+
     def abrir_generador_sanciones(self):
         """Abre la ventana de generador de sanciones o la trae al frente si ya está abierta."""
         if self.generador_window is None or not self.generador_window.isVisible():
@@ -0,0 +1,291 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtCore import (Qt, QAbstractListModel, QSortFilterProxyModel, QModelIndex,
+                            QRectF, QSize, QEvent, Signal)
+from PySide6.QtGui import QColor, QFont, QPainter, QPen
+from core.monitor_servidor import CODIGOS_ESTADO, EstadoSonda
+from ui.grafico_tendencia import LienzoTendencia
+
+
+ROL_FILA = Qt.UserRole + 1
+
+CRITERIOS_ORDEN = {
+    "Orden manual": "manual",
+    "Latencia": "latencia",
+    "Jugadores": "jugadores",
+    "Estado": "estado",
+}
+
+
+def describir_estado(estado):
+    """Retorna [(texto, color)] de estado, ping, jugadores y TPS para mostrar en la fila."""
+    if estado is None:
+        return [("⚪ Verificando...", "#555555"), ("📶 -- ms", "#555555"), ("👥 --/--", "#555555")]
+
+    if estado["online"]:
+        if estado.get("tipo") is EstadoSonda.QUERY_OFF:
+            texto_estado = ("🟡 Online (ping)", "orange")
+        else:
+            texto_estado = ("🟢 Online", "green")
+        textos = [
+            texto_estado,
+            (f"📶 {estado['latencia']} ms", "black"),
+            (f"👥 {estado['jugadores']}", "black"),
+        ]
+        rendimiento = estado.get("rendimiento") or {}
+        if rendimiento.get("tps") is not None:
+            tps = rendimiento["tps"]
+            color = "green" if tps >= 18 else "orange" if tps >= 15 else "red"
+            textos.append((f"⚡ {tps:.1f} TPS", color))
+        elif rendimiento.get("mspt") is not None:
+            mspt = rendimiento["mspt"]
+            color = "green" if mspt <= 40 else "orange" if mspt <= 50 else "red"
+            textos.append((f"⚡ {mspt:.1f} ms/tick", color))
+        return textos
+
+    texto = "🔴 Offline"
+    if estado["error"]:
+        texto = f"🔴 {estado['error']}"
+    return [(texto, "red"), ("📶 -- ms", "gray"), ("👥 --/--", "gray")]
+
+
+class FilaServidor:
+    """Datos de una fila del monitor."""
+
+    __slots__ = ("nombre", "ip", "estado", "tendencia", "resaltado")
+
+    def __init__(self, nombre, ip):
+        self.nombre = nombre
+        self.ip = ip
+        self.estado = None
+        self.tendencia = LienzoTendencia()
+        self.resaltado = False
+
+
+class ModeloServidores(QAbstractListModel):
+    """Lista de servidores monitoreados en el orden de la configuración."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filas = []
+        self.posiciones = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = self.filas[index.row()]
+        if role == Qt.DisplayRole:
+            return fila.nombre
+        if role == Qt.ToolTipRole:
+            return fila.ip
+        if role == ROL_FILA:
+            return fila
+        return None
+
+    def fila(self, nombre):
+        """Retorna la FilaServidor de un servidor o None."""
+        posicion = self.posiciones.get(nombre)
+        return self.filas[posicion] if posicion is not None else None
+
+    def _reindexar(self):
+        self.posiciones = {fila.nombre: posicion for posicion, fila in enumerate(self.filas)}
+
+    def sincronizar(self, servidores, historial=None):
+        """Aplica {nombre: ip} quitando, moviendo o insertando solo las filas que cambiaron."""
+        for posicion in range(len(self.filas) - 1, -1, -1):
+            fila = self.filas[posicion]
+            if servidores.get(fila.nombre) != fila.ip:
+                self.beginRemoveRows(QModelIndex(), posicion, posicion)
+                del self.filas[posicion]
+                self.endRemoveRows()
+        self._reindexar()
+
+        for destino, (nombre, ip) in enumerate(servidores.items()):
+            origen = self.posiciones.get(nombre)
+            if origen is None:
+                fila = FilaServidor(nombre, ip)
+                if historial and nombre in historial.servidores:
+                    fila.tendencia.cargar(historial.servidores[nombre].tendencia(40))
+                self.beginInsertRows(QModelIndex(), destino, destino)
+                self.filas.insert(destino, fila)
+                self.endInsertRows()
+            elif origen != destino:
+                # origen siempre es mayor que destino: las anteriores ya están en su lugar
+                self.beginMoveRows(QModelIndex(), origen, origen, QModelIndex(), destino)
+                self.filas.insert(destino, self.filas.pop(origen))
+                self.endMoveRows()
+            else:
+                continue
+            self._reindexar()
+
+    def actualizar_estado(self, nombre, estado, tendencia=True):
+        """Guarda el resultado de una verificación y notifica solo esa fila."""
+        posicion = self.posiciones.get(nombre)
+        if posicion is None:
+            return
+        fila = self.filas[posicion]
+        fila.estado = estado
+        if tendencia:
+            fila.tendencia.agregar(estado["latencia"], estado.get("conectados"))
+        indice = self.index(posicion)
+        self.dataChanged.emit(indice, indice, [ROL_FILA])
+
+    def resaltar(self, nombre, activo):
+        """Marca o desmarca una fila (feedback al copiar la IP)."""
+        posicion = self.posiciones.get(nombre)
+        if posicion is None:
+            return
+        self.filas[posicion].resaltado = activo
+        indice = self.index(posicion)
+        self.dataChanged.emit(indice, indice, [ROL_FILA])
+
+
+class FiltroServidores(QSortFilterProxyModel):
+    """Ordena por latencia, jugadores o estado y filtra por nombre o IP."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.criterio = "manual"
+        self.texto = ""
+        self.setDynamicSortFilter(True)
+
+    def ordenar_por(self, criterio):
+        """Cambia el criterio de orden."""
+        self.criterio = criterio
+        self.invalidate()
+        self.sort(0)
+
+    def filtrar(self, texto):
+        """Muestra solo los servidores cuyo nombre o IP contienen el texto."""
+        self.texto = texto.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, fila_origen, padre):
+        if not self.texto:
+            return True
+        fila = self.sourceModel().filas[fila_origen]
+        return self.texto in fila.nombre.lower() or self.texto in fila.ip.lower()
+
+    def clave(self, fila, posicion):
+        """Clave de orden de una fila (siempre desempata por el orden manual)."""
+        estado = fila.estado
+        if self.criterio == "latencia":
+            latencia = estado["latencia"] if estado else None
+            return (latencia is None, latencia or 0, posicion)
+        if self.criterio == "jugadores":
+            conectados = estado.get("conectados") if estado else None
+            return (conectados is None, -(conectados or 0), posicion)
+        if self.criterio == "estado":
+            codigo = CODIGOS_ESTADO[estado["tipo"]] if estado else len(CODIGOS_ESTADO)
+            return (codigo, posicion)
+        return (posicion,)
+
+    def lessThan(self, izquierda, derecha):
+        modelo = self.sourceModel()
+        return (
+            self.clave(modelo.filas[izquierda.row()], izquierda.row())
+            < self.clave(modelo.filas[derecha.row()], derecha.row())
+        )
+
+
+class DelegadoServidor(QStyledItemDelegate):
+    """Dibuja cada servidor como una tarjeta y maneja los clicks en ▲/▼ y en la IP."""
+
+    mover = Signal(str, int)
+    copiar = Signal(str)
+
+    ALTO = 84
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.mostrar_flechas = True
+        self.fuente_nombre = QFont("Segoe UI", 11, QFont.Bold)
+        self.fuente_flecha = QFont("Segoe UI", 10, QFont.Bold)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), self.ALTO)
+
+    def _tarjeta(self, rect):
+        return QRectF(rect).adjusted(1, 4, -1, -4)
+
+    def _flechas(self, rect):
+        """Retorna los rectángulos de ▲ y ▼."""
+        tarjeta = self._tarjeta(rect)
+        x = tarjeta.left() + 10
+        centro = tarjeta.center().y()
+        return QRectF(x, centro - 26, 25, 25), QRectF(x, centro + 1, 25, 25)
+
+    def paint(self, painter, option, index):
+        fila = index.data(ROL_FILA)
+        if fila is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        tarjeta = self._tarjeta(option.rect)
+        if fila.resaltado:
+            painter.setPen(QPen(QColor("#2196F3"), 2))
+            painter.setBrush(QColor("#E3F2FD"))
+        else:
+            borde = "#2196F3" if option.state & QStyle.State_MouseOver else "#dddddd"
+            painter.setPen(QPen(QColor(borde), 1))
+            painter.setBrush(QColor("white"))
+        painter.drawRoundedRect(tarjeta, 5, 5)
+
+        x = tarjeta.left() + 12
+        if self.mostrar_flechas:
+            painter.setFont(self.fuente_flecha)
+            painter.setPen(Qt.NoPen)
+            for rect, texto in zip(self._flechas(option.rect), ("▲", "▼")):
+                painter.setBrush(QColor("#2196F3"))
+                painter.drawRoundedRect(rect, 3, 3)
+                painter.setPen(QColor("white"))
+                painter.drawText(rect, Qt.AlignCenter, texto)
+                painter.setPen(Qt.NoPen)
+            x += 35
+
+        ancho_grafico = fila.tendencia.ancho
+        derecha = tarjeta.right() - ancho_grafico - 14
+
+        painter.setFont(self.fuente_nombre)
+        painter.setPen(QColor("black"))
+        painter.drawText(QRectF(x, tarjeta.top() + 8, derecha - x, 22), Qt.AlignVCenter, f"🖥️ {fila.nombre}")
+
+        painter.setFont(option.font)
+        painter.setPen(QColor("gray"))
+        painter.drawText(QRectF(x, tarjeta.top() + 30, derecha - x, 18), Qt.AlignVCenter, fila.ip)
+
+        columna = x
+        metricas = painter.fontMetrics()
+        for texto, color in describir_estado(fila.estado):
+            painter.setPen(QColor(color))
+            ancho = metricas.horizontalAdvance(texto) + 12
+            painter.drawText(QRectF(columna, tarjeta.top() + 50, ancho, 20), Qt.AlignVCenter, texto)
+            columna += ancho
+
+        fila.tendencia.dibujar(
+            painter, tarjeta.right() - ancho_grafico - 10,
+            tarjeta.center().y() - fila.tendencia.alto / 2
+        )
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.MouseButtonRelease or event.button() != Qt.LeftButton:
+            return False
+        fila = index.data(ROL_FILA)
+        if fila is None:
+            return False
+
+        punto = event.position()
+        if self.mostrar_flechas:
+            subir, bajar = self._flechas(option.rect)
+            if subir.contains(punto):
+                self.mover.emit(fila.nombre, -1)
+                return True
+            if bajar.contains(punto):
+                self.mover.emit(fila.nombre, 1)
+                return True
+        self.copiar.emit(fila.nombre)
+        return True
@@ -1,99 +1,56 @@
 from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QPushButton, QScrollArea, QWidget, QFrame,
-                               QMessageBox, QInputDialog, QListWidget)
-from PySide6.QtCore import Qt, QTimer, QThread, Signal, QCoreApplication
+                               QPushButton, QListView, QLineEdit, QComboBox,
+                               QMessageBox, QInputDialog, QListWidget, QFileDialog)
+from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QFont, QClipboard, QGuiApplication
-import sys
-import os
-import json
-from core.monitor_servidor import MonitorServidor
+from core.servicio_monitoreo import obtener_servicio
 from core.theme_manager import theme_manager
-
-
-class ServerCheckThread(QThread):
-    """Thread para verificar un servidor sin bloquear la UI."""
-    finished = Signal(dict, dict)
-    
-    def __init__(self, nombre, monitor, widgets):
-        super().__init__()
-        self.nombre = nombre
-        self.monitor = monitor
-        self.widgets = widgets
-        
-    def run(self):
-        estado = self.monitor.verificar()
-        self.finished.emit(estado, self.widgets)
+from ui.modelo_servidores import (ModeloServidores, FiltroServidores, DelegadoServidor,
+                                   CRITERIOS_ORDEN)
+from ui.importacion_servidores_ui import ImportarServidoresDialog
 
 
 class MonitorServidoresWindow(QDialog):
+    # Resultados del motor de monitoreo (emitida desde su hilo, recibida en el de la UI)
+    verificacion_terminada = Signal(str, dict)
+    busqueda_terminada = Signal(str, object)
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Monitor de Servidores - Minecraft Staff Tools")
         self.setFixedSize(700, 650)
+        # Cada apertura crea una ventana nueva: la cerrada se destruye en vez de quedar oculta
+        self.setAttribute(Qt.WA_DeleteOnClose)
         
-        # Archivo de configuración
-        if getattr(sys, 'frozen', False):
-            app_dir = os.path.dirname(sys.executable)
-        else:
-            app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        
-        self.config_file = os.path.join(app_dir, "core", "monitor_config.json")
-        self.servidores = self.cargar_config()
+        # El servicio sigue verificando en segundo plano aunque la ventana se cierre
+        self.servicio = obtener_servicio()
+        self.servidores = dict(self.servicio.servidores)
         
-        self.monitores = {}
         self.auto_refresh = True
-        self.threads = []
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.verificar_todos)
+        self.verificacion_terminada.connect(self.actualizar_ui_servidor)
+        self.suscripcion = self.verificacion_terminada.emit
+        self.busqueda_terminada.connect(self.mostrar_busqueda)
         
         self.crear_ui()
         self.actualizar_servidores()
-        self.timer.start(5000)
         
-    def cargar_config(self):
-        """Carga la configuración desde el archivo JSON."""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    from collections import OrderedDict
-                    config = json.load(f, object_pairs_hook=OrderedDict)
-                    servidores = config.get("servidores", self.servidores_por_defecto())
-                    return dict(servidores)
-        except:
-            pass
-        
-        return self.servidores_por_defecto()
-    
-    def servidores_por_defecto(self):
-        """Retorna la lista de servidores por defecto."""
-        return {
-            "Staff": "staff.minelatino.com",
-            "Horus": "play.horusmc.net",
-            "BG 3": "bg3.minelatino.com",
-            "BG 4": "bg4.minelatino.com",
-            "BG 5": "bg5.minelatino.com"
-        }
+        # Se muestran enseguida los últimos estados conocidos y luego llegan los nuevos
+        for nombre in self.servidores:
+            estado = self.servicio.estado(nombre)
+            if estado:
+                self.modelo.actualizar_estado(nombre, estado, tendencia=False)
+        self.servicio.suscribir(self.suscripcion)
+        self.servicio.iniciar()
 
     def guardar_config(self):
         """Guarda la configuración en el archivo JSON."""
-        try:
-            config = {"servidores": self.servidores}
-            os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error al guardar config: {e}")
+        self.servicio.guardar_config(self.servidores)
     
-    def closeEvent(self, event):
-        """Se ejecuta al cerrar la ventana."""
+    def done(self, resultado):
+        """Se ejecuta al cerrar la ventana por cualquier vía (X, Esc o reject); el monitoreo sigue en segundo plano."""
+        self.servicio.desuscribir(self.suscripcion)
         self.guardar_config()
-        self.timer.stop()
-        for thread in self.threads:
-            if thread.isRunning():
-                thread.quit()
-                thread.wait()
-        event.accept()
+        super().done(resultado)
     
     def crear_ui(self):
         self.setStyleSheet(theme_manager.get_background_style())
@@ -129,143 +86,107 @@ class MonitorServidoresWindow(QDialog):
         btn_eliminar.setStyleSheet(theme_manager.get_button_style())
         btn_eliminar.clicked.connect(self.eliminar_servidor)
         controles_layout.addWidget(btn_eliminar)
+        
+        btn_importar = QPushButton("📥 Importar")
+        btn_importar.setMinimumHeight(35)
+        btn_importar.setCursor(Qt.PointingHandCursor)
+        btn_importar.setToolTip("Importar o exportar listas de servidores (texto, CSV o JSON)")
+        btn_importar.setStyleSheet(theme_manager.get_button_style())
+        btn_importar.clicked.connect(self.importar_servidores)
+        controles_layout.addWidget(btn_importar)
 
-        lbl_refresh = QLabel("⏱️ Auto-refresh: 5s")
+        lbl_refresh = QLabel("⏱️ Auto-refresh: 5s (adaptativo)")
+        lbl_refresh.setToolTip(
+            "Los servidores caídos se verifican cada vez con menos frecuencia\n"
+            "y los que cambian de estado se confirman enseguida.\n"
+            "Se pueden fijar intervalos por servidor en 'intervalos' de monitor_config.json."
+        )
         lbl_refresh.setStyleSheet(f"color: {theme_manager.get_text_alpha(0.8)}; background: transparent;")
         controles_layout.addWidget(lbl_refresh)
         
         layout.addLayout(controles_layout)
 
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; }")
-        
-        self.scroll_widget = QWidget()
-        self.scroll_layout = QVBoxLayout(self.scroll_widget)
-        self.scroll_layout.setSpacing(10)
-        self.scroll_layout.setContentsMargins(0, 0, 0, 0)
-        
-        scroll.setWidget(self.scroll_widget)
-        layout.addWidget(scroll)
+        #Filtro y orden
+        vista_layout = QHBoxLayout()
+        
+        self.txt_filtro = QLineEdit()
+        self.txt_filtro.setPlaceholderText("🔍 Filtrar por nombre o IP...")
+        self.txt_filtro.setClearButtonEnabled(True)
+        self.txt_filtro.setMinimumHeight(30)
+        self.txt_filtro.setStyleSheet("background: white; color: black; border-radius: 5px; padding: 0 8px;")
+        self.txt_filtro.textChanged.connect(self.filtrar_servidores)
+        vista_layout.addWidget(self.txt_filtro, 1)
+        
+        lbl_orden = QLabel("Ordenar por:")
+        lbl_orden.setStyleSheet(f"color: {theme_manager.get_text_color()}; background: transparent;")
+        vista_layout.addWidget(lbl_orden)
+        
+        self.combo_orden = QComboBox()
+        self.combo_orden.addItems(CRITERIOS_ORDEN.keys())
+        self.combo_orden.setMinimumHeight(30)
+        self.combo_orden.setStyleSheet("background: white; color: black; border-radius: 5px; padding: 0 8px;")
+        self.combo_orden.currentTextChanged.connect(self.ordenar_servidores)
+        vista_layout.addWidget(self.combo_orden)
+        
+        btn_localizar = QPushButton("🔎 Localizar Jugador")
+        btn_localizar.setMinimumHeight(30)
+        btn_localizar.setCursor(Qt.PointingHandCursor)
+        btn_localizar.setStyleSheet(theme_manager.get_button_style())
+        btn_localizar.clicked.connect(self.localizar_jugador)
+        vista_layout.addWidget(btn_localizar)
+        
+        layout.addLayout(vista_layout)
+        
+        #Lista de servidores (solo se pintan las filas visibles)
+        self.modelo = ModeloServidores(self)
+        self.filtro = FiltroServidores(self)
+        self.filtro.setSourceModel(self.modelo)
+        self.filtro.sort(0)
+        
+        self.delegado = DelegadoServidor(self)
+        self.delegado.mover.connect(self.mover_servidor)
+        self.delegado.copiar.connect(self.copiar_ip)
+        
+        self.lista = QListView()
+        self.lista.setModel(self.filtro)
+        self.lista.setItemDelegate(self.delegado)
+        self.lista.setUniformItemSizes(True)
+        self.lista.setMouseTracking(True)
+        self.lista.setSelectionMode(QListView.NoSelection)
+        self.lista.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.lista.setCursor(Qt.PointingHandCursor)
+        self.lista.setStyleSheet("QListView { border: none; background: transparent; }")
+        layout.addWidget(self.lista)
+        
+        #Tip y reporte
+        pie_layout = QHBoxLayout()
         
-        #Tip
         tip = QLabel("💡 Tip: Haz click en cualquier servidor para copiar su IP")
         tip.setFont(QFont("Segoe UI", 8))
         tip.setStyleSheet(f"color: {theme_manager.get_text_color()}; background: transparent;")
         tip.setAlignment(Qt.AlignCenter)
-        layout.addWidget(tip)
-    
-    def crear_card_servidor(self, nombre, ip):
-        """Crea una tarjeta visual para un servidor."""
-        card = QFrame()
-        card.setFrameStyle(QFrame.Box)
-        card.setLineWidth(1)
-        card.setStyleSheet("""
-            QFrame {
-                background-color: white;
-                border: 1px solid #ddd;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
+        pie_layout.addWidget(tip, 1)
         
-        card_layout = QHBoxLayout(card)
-        card_layout.setSpacing(10)
-
-        #Botones de flechas (izquierda)
-        flechas_layout = QVBoxLayout()
-        flechas_layout.setSpacing(2)
-        
-        btn_subir = QPushButton("▲")
-        btn_subir.setFixedSize(25, 25)
-        btn_subir.setCursor(Qt.PointingHandCursor)
-        btn_subir.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-weight: bold;
-                border-radius: 3px;
-                font-size: 10pt;
-            }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
-        btn_subir.clicked.connect(lambda: self.mover_servidor_arriba(nombre))
-        flechas_layout.addWidget(btn_subir)
+        btn_uptime = QPushButton("📊 Reporte de Uptime")
+        btn_uptime.setMinimumHeight(28)
+        btn_uptime.setCursor(Qt.PointingHandCursor)
+        btn_uptime.setToolTip("Exporta a CSV el uptime, la latencia y el pico de jugadores por hora o por día")
+        btn_uptime.setStyleSheet(theme_manager.get_button_style())
+        btn_uptime.clicked.connect(self.exportar_uptime)
+        pie_layout.addWidget(btn_uptime)
         
-        btn_bajar = QPushButton("▼")
-        btn_bajar.setFixedSize(25, 25)
-        btn_bajar.setCursor(Qt.PointingHandCursor)
-        btn_bajar.setStyleSheet("""
-            QPushButton {
-                background-color: #2196F3;
-                color: white;
-                font-weight: bold;
-                border-radius: 3px;
-                font-size: 10pt;
-            }
-            QPushButton:hover { background-color: #1976D2; }
-        """)
-        btn_bajar.clicked.connect(lambda: self.mover_servidor_abajo(nombre))
-        flechas_layout.addWidget(btn_bajar)
-        
-        card_layout.addLayout(flechas_layout)
-        info_layout = QVBoxLayout()
-        info_layout.setSpacing(5)
-        
-        #Nombre del servidor
-        lbl_nombre = QLabel(f"🖥️ {nombre}")
-        lbl_nombre.setFont(QFont("Segoe UI", 11, QFont.Bold))
-        info_layout.addWidget(lbl_nombre)
-        
-        #IP (clickeable para copiar)
-        lbl_ip = QLabel(ip)
-        lbl_ip.setStyleSheet("color: gray;")
-        lbl_ip.setCursor(Qt.PointingHandCursor)
-        lbl_ip.mousePressEvent = lambda event: self.copiar_ip(ip, card)
-        info_layout.addWidget(lbl_ip)
-        
-        #Info frame
-        status_layout = QHBoxLayout()
-        
-        #Estado
-        lbl_estado = QLabel("⚪ Verificando...")
-        status_layout.addWidget(lbl_estado)
-        
-        #Ping
-        lbl_ping = QLabel("📶 -- ms")
-        status_layout.addWidget(lbl_ping)
-        
-        #Jugadores
-        lbl_jugadores = QLabel("👥 --/--")
-        status_layout.addWidget(lbl_jugadores)
-        
-        status_layout.addStretch()
-        info_layout.addLayout(status_layout)
-        
-        card_layout.addLayout(info_layout, 1)
-        
-        return {
-            "card": card,
-            "estado": lbl_estado,
-            "ping": lbl_ping,
-            "jugadores": lbl_jugadores
-        }
+        layout.addLayout(pie_layout)
     
-    def copiar_ip(self, ip, card):
+    def copiar_ip(self, nombre):
         """Copia la IP al portapapeles y muestra feedback."""
+        ip = self.servidores.get(nombre)
+        if ip is None:
+            return
         clipboard = QGuiApplication.clipboard()
         clipboard.setText(ip)
-        original_style = card.styleSheet()
-        card.setStyleSheet("""
-            QFrame {
-                background-color: #E3F2FD;
-                border: 2px solid #2196F3;
-                border-radius: 5px;
-                padding: 10px;
-            }
-        """)
-
-        QTimer.singleShot(200, lambda: card.setStyleSheet(original_style))
+        
+        self.modelo.resaltar(nombre, True)
+        QTimer.singleShot(200, lambda: self.modelo.resaltar(nombre, False))
         
         # Mostrar tooltip
         self.mostrar_tooltip(f"✓ Copiado: {ip}")
@@ -292,92 +213,97 @@ class MonitorServidoresWindow(QDialog):
         QTimer.singleShot(1000, tooltip.deleteLater)
     
     def actualizar_servidores(self):
-        """Actualiza la visualización de todos los servidores."""
-        timer_estaba_activo = self.timer.isActive()
-        if timer_estaba_activo:
-            self.timer.stop()
-        
-        for thread in self.threads:
-            if thread.isRunning():
-                thread.quit()
-                thread.wait()
-        self.threads = []
-        
-        while self.scroll_layout.count():
-            item = self.scroll_layout.takeAt(0)
-            if item.widget():
-                item.widget().deleteLater()
-        
-        QCoreApplication.processEvents()
-        
-        self.monitores = {}
-        for nombre, ip in self.servidores.items():
-            monitor = MonitorServidor(ip)
-            card_widgets = self.crear_card_servidor(nombre, ip)
-            
-            self.scroll_layout.addWidget(card_widgets["card"])
-            
-            self.monitores[nombre] = {
-                "monitor": monitor,
-                "widgets": card_widgets
-            }
-        
-        if timer_estaba_activo:
-            self.timer.start(5000)
+        """Sincroniza el modelo y el servicio con self.servidores cambiando solo lo necesario."""
+        self.modelo.sincronizar(self.servidores, self.servicio.historial)
         
-        self.verificar_todos()
+        # Los monitores existentes se conservan: el motor mantiene su planificación
+        # y los nuevos quedan vencidos para verificarse en el próximo ciclo
+        self.servicio.configurar(self.servidores)
+    
+    def filtrar_servidores(self, texto):
+        """Filtra la lista por nombre o IP."""
+        self.filtro.filtrar(texto)
+    
+    def ordenar_servidores(self, criterio):
+        """Ordena la lista. Las flechas solo se muestran en el orden manual."""
+        criterio = CRITERIOS_ORDEN.get(criterio, "manual")
+        self.delegado.mostrar_flechas = criterio == "manual"
+        self.filtro.ordenar_por(criterio)
+        self.lista.viewport().update()
     
     def verificar_todos(self):
-        """Verifica el estado de todos los servidores en paralelo."""
-        self.threads = [t for t in self.threads if t.isRunning()]
-        
-        for nombre, data in self.monitores.items():
-            thread = ServerCheckThread(nombre, data["monitor"], data["widgets"])
-            thread.finished.connect(self.actualizar_ui_servidor)
-            thread.start()
-            self.threads.append(thread)
+        """Verifica ya mismo todos los servidores sin esperar a su intervalo."""
+        self.servicio.motor.verificar_todos()
     
-    def actualizar_ui_servidor(self, estado, widgets):
-        """Actualiza la UI de un servidor con su estado."""
-        if estado["online"]:
-            widgets["estado"].setText("🟢 Online")
-            widgets["estado"].setStyleSheet("color: green;")
-            
-            # Mostrar latencia
-            if estado['latencia'] == "?":
-                widgets["ping"].setText("📶 ~ ms")
-                widgets["ping"].setStyleSheet("color: orange;")
-            else:
-                widgets["ping"].setText(f"📶 {estado['latencia']} ms")
-                widgets["ping"].setStyleSheet("color: black;")
-            
-            # Mostrar jugadores
-            widgets["jugadores"].setText(f"👥 {estado['jugadores']}")
-            widgets["jugadores"].setStyleSheet("color: black;")
-            
-            # Si tiene nota de Query OFF
-            if estado.get("error") == "Query OFF":
-                widgets["estado"].setText("🟡 Online (ping)")
-                widgets["estado"].setStyleSheet("color: orange;")
-        else:
-            widgets["estado"].setText("🔴 Offline")
-            widgets["estado"].setStyleSheet("color: red;")
-            widgets["ping"].setText("📶 -- ms")
-            widgets["ping"].setStyleSheet("color: gray;")
-            widgets["jugadores"].setText("👥 --/--")
-            widgets["jugadores"].setStyleSheet("color: gray;")
-            
-            if estado["error"]:
-                error_text = estado["error"]
-                if "Sin respuesta" in error_text:
-                    error_text = "Sin respuesta"
-                elif "Puerto cerrado" in error_text:
-                    error_text = "Puerto cerrado"
-                
-                widgets["estado"].setText(f"🔴 {error_text}")
+    def actualizar_ui_servidor(self, nombre, estado):
+        """Actualiza la fila de un servidor con su estado."""
+        if nombre in self.servidores:
+            self.modelo.actualizar_estado(nombre, estado)
+    
+    def localizar_jugador(self):
+        """Busca en qué servidores está conectado un jugador."""
+        nick, ok = QInputDialog.getText(self, "Localizar Jugador", "Nick del jugador:")
+        nick = nick.strip()
+        if not ok or not nick:
+            return
+        
+        futuro = self.servicio.localizar_jugador(nick)
+        futuro.add_done_callback(
+            lambda f: self.busqueda_terminada.emit(nick, f.exception() or f.result())
+        )
+    
+    def mostrar_busqueda(self, nick, resultado):
+        """Muestra el resultado de la búsqueda de un jugador."""
+        if isinstance(resultado, Exception):
+            QMessageBox.warning(self, "Error", f"No se pudo buscar a {nick}: {resultado}")
+            return
+        
+        localizador = self.servicio.localizador
+        if resultado:
+            lineas = [f"🟢 {servidor} ({localizador.fuentes.get(servidor)})" for servidor in resultado]
+            QMessageBox.information(self, "Localizar Jugador", f"{nick} está en:\n\n" + "\n".join(lineas))
+            return
+        
+        # La muestra del estado trae solo algunos jugadores: se aclara qué servidores no se cubrieron completos
+        parciales = [servidor for servidor, fuente in localizador.fuentes.items() if fuente == "muestra"]
+        sin_respuesta = [servidor for servidor, fuente in localizador.fuentes.items() if fuente == "error"]
+        mensaje = f"No se encontró a {nick} en ningún servidor."
+        similares = localizador.buscar_parcial(nick, 5)
+        if similares:
+            mensaje += "\n\nParecidos: " + ", ".join(f"{n} ({s})" for n, s in similares)
+        if parciales:
+            mensaje += (
+                "\n\nSin lista completa (Query deshabilitado, solo muestra del estado): "
+                + ", ".join(parciales)
+            )
+        if sin_respuesta:
+            mensaje += "\n\nSin respuesta: " + ", ".join(sin_respuesta)
+        QMessageBox.information(self, "Localizar Jugador", mensaje)
+    
+    def exportar_uptime(self):
+        """Exporta el reporte de uptime por hora o por día a un CSV."""
+        opciones = {"Por día": "dia", "Por hora": "hora"}
+        opcion, ok = QInputDialog.getItem(self, "Reporte de Uptime", "Agrupar:", list(opciones), 0, False)
+        if not ok:
+            return
+        periodo = opciones[opcion]
+        
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "Guardar reporte de uptime", f"uptime_por_{periodo}.csv", "CSV (*.csv)"
+        )
+        if not ruta:
+            return
+        try:
+            reporte = self.servicio.reporte_uptime(periodo).result(timeout=10)
+            with open(ruta, 'w', encoding='utf-8', newline='') as f:
+                f.write(reporte)
+            QMessageBox.information(self, "Éxito", f"Reporte guardado en:\n{ruta}")
+        except Exception as e:
+            QMessageBox.warning(self, "Error", f"No se pudo generar el reporte:\n{e}")
     
     def refrescar_manual(self):
-        """Refresca manualmente todos los servidores."""
+        """Refresca manualmente todos los servidores (resolviendo de nuevo sus DNS)."""
+        self.servicio.motor.forzar_resolucion()
         self.verificar_todos()
     
     def agregar_servidor(self):
@@ -409,6 +335,24 @@ class MonitorServidoresWindow(QDialog):
         self.actualizar_servidores()
         QMessageBox.information(self, "Éxito", f"Servidor '{nombre}' agregado")
     
+    def importar_servidores(self):
+        """Importa varios servidores validados de una vez (una sola escritura de la configuración)."""
+        dialogo = ImportarServidoresDialog(self.servidores, self)
+        if dialogo.exec() != QDialog.Accepted:
+            return
+        
+        entradas = dialogo.seleccionadas()
+        if not entradas:
+            return
+        for entrada in entradas:
+            self.servidores[entrada.nombre] = entrada.direccion
+        self.guardar_config()
+        self.actualizar_servidores()
+        # El estado de la validación se muestra hasta que llegue la primera verificación
+        for entrada in entradas:
+            self.modelo.actualizar_estado(entrada.nombre, entrada.estado, tendencia=False)
+        QMessageBox.information(self, "Éxito", f"{len(entradas)} servidores importados")
+    
     def eliminar_servidor(self):
         """Elimina un servidor del monitor."""
         if not self.servidores:
@@ -486,6 +430,13 @@ class MonitorServidoresWindow(QDialog):
         
         dialog.exec()
     
+    def mover_servidor(self, nombre, direccion):
+        """Mueve un servidor hacia arriba (-1) o hacia abajo (1)."""
+        if direccion < 0:
+            self.mover_servidor_arriba(nombre)
+        else:
+            self.mover_servidor_abajo(nombre)
+    
     def mover_servidor_arriba(self, nombre):
         """Mueve un servidor una posición hacia arriba."""
         keys = list(self.servidores.keys())